@@ -1,287 +1,392 @@
+import codecs
+import hashlib
+import pickle
 import re
-from collections import Counter
-from utils.text_utils import multi_phrase_count
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from utils.cache import LRUCache
+from utils.markdown_scan import MarkdownScanner, scan_markdown
+from utils.text_utils import PhraseMatcher, normalize_phrase
 from utils.logger import get_logger
-from typing import Union
 from models import SEORequirements
 
 # logger setup
 logger = get_logger(__name__)
 
-def analyze_content(markdown_content: str, requirements: Union[SEORequirements, dict]):
+# Bump whenever analyze_content output changes for the same input, so
+# memoized analyses from an older analyzer are never served
+ANALYZER_VERSION = "3"
+
+# What analysis ignores when counting words: heading lines, markdown
+# emphasis, HTML tags, URLs and punctuation.  Words are the whitespace-
+# separated runs left by ``CLEAN_RE.sub(' ', text)``.
+CLEAN_RE = re.compile(r'^#+.*$|[*_`~]|[<][^>]+[>]|https?://\S+|[\n\r.,;:!?()\[\]{}"\'-]', re.MULTILINE)
+# The same words in one scan without building the cleaned copy: skip any
+# run of CLEAN_RE matches and whitespace, then take the word up to the next
+# place CLEAN_RE would match ("h" starting a URL, "<" opening a tag).
+# Group 1 is None only for the final empty match at the end of the text.
+_WORD_RE = re.compile(
+    r'(?:^#+.*$|<[^>]+>|https?://\S+|[\s*_`~.,;:!?()\[\]{}"\'-])*'
+    r'(?:((?:[^\s*_`~<h.,;:!?()\[\]{}"\'-]+|h(?!ttps?://\S)|<(?![^>]+>))+)|\Z)',
+    re.MULTILINE,
+)
+_HEADING_KEYS = ["H2", "H3", "H4", "H5", "H6"]
+_RAW_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+@dataclass(frozen=True)
+class AnalysisPlan:
+    """Requirement-side half of `analyze_content`, compiled once per report.
+
+    Everything that depends only on the requirements (not on the text) lives
+    here: the merged entity list, normalised phrase table with its
+    `PhraseMatcher`, LSI targets, heading targets and meta fields.  Phrase
+    entries are ``(display_name, matcher_index)`` pairs; an index of ``-1``
+    marks a phrase that can never match (e.g. empty).
     """
-    Analyze SEO content to check if it meets all requirements.
-    
-    Args:
-        markdown_content (str): The markdown content to analyze
-        requirements (dict): The SEO requirements dictionary
-        
-    Returns:
-        dict: Analysis results including keyword counts, heading structure, etc.
+
+    fingerprint: str
+    primary_keyword: str
+    primary_keyword_norm: str
+    word_count_target: Any
+    required_images: Any
+    meta_title: str
+    meta_description: str
+    variations: Tuple[Tuple[str, int], ...]
+    lsi_keywords: Tuple[Tuple[str, int, Any], ...]
+    entities: Tuple[Tuple[str, int], ...]
+    heading_requirements: Tuple[Tuple[str, Any], ...]
+    matcher: PhraseMatcher
+
+
+# Plans are keyed by requirements fingerprint; a handful covers every report
+# a session works with
+plan_cache = LRUCache(maxsize=32)
+
+# Memoized analyses, pickled so every caller gets its own copy; capped by
+# entry count and total payload size per process
+analysis_cache = LRUCache(maxsize=256, max_bytes=64 * 1024 * 1024)
+
+
+def _plan_inputs(requirements: Union[SEORequirements, dict]) -> Dict[str, Any]:
+    """Collect exactly the requirement values `analyze_content` reads.
+
+    `SEORequirements` attributes are read directly instead of through
+    ``to_dict()``, which deep-copies every field.
     """
-    
-    # Clean the text for analysis (remove markdown syntax, HTML, etc.)
-    CLEAN_RE = re.compile(r'^#+.*$|[*_`~]|[<][^>]+[>]|https?://\S+|[\n\r.,;:!?()\[\]{}"\'-]', re.MULTILINE)
-    text_content = CLEAN_RE.sub(' ', markdown_content.lower())
-    # Normalize whitespace
-    text_content = re.sub(r'\s+', ' ', text_content).strip()
-    # Create a word list for exact matching
-    tokens = text_content.split()
-    # Create a normalized string with spaces for substring searching
-    joined_text = ' ' + ' '.join(tokens) + ' '
-    # Create raw text with punctuation removed for broader matching
-    raw_text = re.sub(r'[^a-z0-9\s]', ' ', markdown_content.lower())
-    raw_text = re.sub(r'\s+', ' ', raw_text).strip()
-    word_counts = Counter(tokens)
-
-    # Count images in content
-    image_count = len(re.findall(r'!\[.*?\]\(.*?\)', markdown_content))
-    
-    # Get total required images from basic tunings
+    heading_requirements = {"H1": 1, "H2": 0, "H3": 0, "H4": 0, "H5": 0, "H6": 0}
+
+    if isinstance(requirements, SEORequirements):
+        # to_dict() has no meta or heading-target keys, so those keep their defaults
+        return {
+            "primary_keyword": requirements.primary_keyword,
+            "word_count": requirements.word_count,
+            "variations": requirements.variations,
+            "lsi_keywords": requirements.lsi_keywords,
+            "entities": requirements.entities,
+            "custom_entities": requirements.custom_entities,
+            "required_images": requirements.basic_tunings.get('Number of Images', 0),
+            "meta_title": "",
+            "meta_description": "",
+            "heading_requirements": heading_requirements,
+        }
+
+    req_dict = requirements
+
+    # Try different possible paths to find the image count requirement
     required_images = 0
-    if isinstance(requirements, SEORequirements) and hasattr(requirements, 'basic_tunings'):
-        required_images = requirements.basic_tunings.get('Number of Images', 0)
-    elif isinstance(requirements, dict):
-        # Try different possible paths to find the image count requirement
-        if 'basic_tunings' in requirements and isinstance(requirements['basic_tunings'], dict):
-            required_images = requirements['basic_tunings'].get('Number of Images', 0)
-        elif 'Number of Images' in requirements:
-            required_images = requirements.get('Number of Images', 0)
-    
-    # Initialize analysis result structure
-    req_dict = requirements.to_dict() if isinstance(requirements, SEORequirements) else requirements
-
-    # Try to get meta title and description, either from meta_and_headings in requirements or from requirements directly
-    meta_title = ""
-    meta_description = ""
-    
-    # First check if meta_and_headings exists in the requirements dictionary
+    if 'basic_tunings' in req_dict and isinstance(req_dict['basic_tunings'], dict):
+        required_images = req_dict['basic_tunings'].get('Number of Images', 0)
+    elif 'Number of Images' in req_dict:
+        required_images = req_dict.get('Number of Images', 0)
+
+    # Meta title and description, either from meta_and_headings or from the requirements directly
     if 'meta_and_headings' in req_dict and isinstance(req_dict['meta_and_headings'], dict):
         meta_title = req_dict['meta_and_headings'].get('meta_title', '')
         meta_description = req_dict['meta_and_headings'].get('meta_description', '')
-    # Then check if they're directly in the requirements dictionary
     else:
         meta_title = req_dict.get('meta_title', '')
         meta_description = req_dict.get('meta_description', '')
-    
+
+    # Heading targets: direct keys, then the requirements sub-dictionary, then heading_structure
+    for h_type in _HEADING_KEYS:
+        key = f"Number of {h_type} tags"
+        if key in req_dict:
+            heading_requirements[h_type] = req_dict[key]
+    if 'requirements' in req_dict and isinstance(req_dict['requirements'], dict):
+        for h_type in _HEADING_KEYS:
+            key = f"Number of {h_type} tags"
+            if key in req_dict['requirements']:
+                heading_requirements[h_type] = req_dict['requirements'][key]
+    if 'heading_structure' in req_dict and isinstance(req_dict['heading_structure'], dict):
+        for h_type in _HEADING_KEYS:
+            if h_type in req_dict['heading_structure']:
+                heading_requirements[h_type] = req_dict['heading_structure'][h_type]
+
+    return {
+        "primary_keyword": req_dict.get("primary_keyword", ""),
+        "word_count": req_dict.get("word_count", 1500),
+        "variations": req_dict.get("variations", []),
+        "lsi_keywords": req_dict.get("lsi_keywords", {}),
+        "entities": req_dict.get("entities", []),
+        "custom_entities": req_dict.get("custom_entities", []),
+        "required_images": required_images,
+        "meta_title": meta_title,
+        "meta_description": meta_description,
+        "heading_requirements": heading_requirements,
+    }
+
+
+def _fingerprint_inputs(inputs: Dict[str, Any]) -> str:
+    # repr keeps value types apart (1 vs 1.0 vs "1" change LSI target handling)
+    return hashlib.sha256(repr(inputs).encode("utf-8")).hexdigest()
+
+
+def requirements_fingerprint(requirements: Union[SEORequirements, dict]) -> str:
+    """
+    Return a stable hash of the requirement values that affect content analysis.
+
+    Args:
+        requirements: SEORequirements or requirements dictionary
+
+    Returns:
+        str: Hex SHA-256 digest; equal for requirements that analyze identically
+    """
+    return _fingerprint_inputs(_plan_inputs(requirements))
+
+
+def _compile_plan(fingerprint: str, inputs: Dict[str, Any]) -> AnalysisPlan:
+    """Build an `AnalysisPlan` from `_plan_inputs` output."""
+    variations = list(inputs["variations"])
+    lsi_keywords = inputs["lsi_keywords"]
+    entities = inputs["entities"]
+    custom_entities = inputs["custom_entities"]
+
+    # Merge entities and custom entities: custom entities first (they take
+    # priority), then regular entities that aren't already in the list
+    all_entities = list(custom_entities)
+    seen = set(all_entities)
+    for entity in entities:
+        if entity not in seen:
+            seen.add(entity)
+            all_entities.append(entity)
+
+    primary_keyword = inputs["primary_keyword"]
+    primary_keyword_norm = normalize_phrase(primary_keyword or "")
+    matcher = PhraseMatcher([primary_keyword_norm, *variations, *lsi_keywords, *all_entities])
+    index = matcher.index
+
+    def slot(phrase: str) -> int:
+        return index.get(normalize_phrase(phrase), -1)
+
+    # Handle different formats of LSI keyword requirements
+    lsi_entries = []
+    if isinstance(lsi_keywords, dict):
+        for keyword, target in lsi_keywords.items():
+            target_count = 1  # Default
+            if isinstance(target, dict) and 'count' in target:
+                target_count = target['count']
+            elif isinstance(target, int):
+                target_count = target
+            lsi_entries.append((keyword, slot(keyword), target_count))
+    else:
+        # List format: every keyword should appear at least once
+        lsi_entries = [(keyword, slot(keyword), 1) for keyword in lsi_keywords]
+
+    plan = AnalysisPlan(
+        fingerprint=fingerprint,
+        primary_keyword=primary_keyword,
+        primary_keyword_norm=primary_keyword_norm,
+        word_count_target=inputs["word_count"],
+        required_images=inputs["required_images"],
+        meta_title=inputs["meta_title"],
+        meta_description=inputs["meta_description"],
+        variations=tuple((var, slot(var)) for var in variations),
+        lsi_keywords=tuple(lsi_entries),
+        entities=tuple((entity, slot(entity)) for entity in all_entities),
+        heading_requirements=tuple(inputs["heading_requirements"].items()),
+        matcher=matcher,
+    )
+    logger.debug(
+        f"Compiled analysis plan {fingerprint[:12]}: {len(matcher.phrases)} phrases "
+        f"({len(plan.variations)} variations, {len(plan.lsi_keywords)} LSI, {len(plan.entities)} entities)"
+    )
+    return plan
+
+
+def compile_analysis_plan(requirements: Union[SEORequirements, dict]) -> AnalysisPlan:
+    """
+    Return the analysis plan for these requirements, compiling it on first use.
+
+    Plans are cached in `plan_cache` by `requirements_fingerprint`, so every
+    analysis against the same report after the first pays only for scanning
+    the text.
+
+    Args:
+        requirements: SEORequirements or requirements dictionary
+
+    Returns:
+        AnalysisPlan: Compiled plan shared by all callers with equal requirements
+    """
+    inputs = _plan_inputs(requirements)
+    fingerprint = _fingerprint_inputs(inputs)
+    plan = plan_cache.get(fingerprint)
+    if plan is None:
+        plan = _compile_plan(fingerprint, inputs)
+        plan_cache.set(fingerprint, plan)
+    return plan
+
+
+def _density(count: int, word_count: int) -> float:
+    return round((count / word_count) * 100, 2) if word_count > 0 else 0
+
+
+def assemble_analysis(
+    plan: AnalysisPlan,
+    word_count: int,
+    phrase_counts: Sequence[int],
+    primary_token_count: int,
+    headings: Dict[str, int],
+    image_count: int,
+    attributed_counts: Optional[Sequence[int]] = None,
+) -> Dict[str, Any]:
+    """
+    Turn raw text measurements into the analysis dictionary.
+
+    Args:
+        plan: Compiled requirements
+        word_count: Number of tokens in the cleaned text
+        phrase_counts: Occurrences per `plan.matcher` phrase index
+        primary_token_count: Exact token matches of a single-word primary keyword
+        headings: Markdown heading counts keyed "H1".."H6"
+        image_count: Number of markdown images
+        attributed_counts: Leftmost-longest counts per phrase index; when
+            given, ``attributed_count``/``attributed_density`` entries and
+            ``*_attributed_*`` totals are added next to the raw figures
+
+    Returns:
+        dict: Analysis results including keyword counts, heading structure, etc.
+    """
+    def count_of(slot: int) -> int:
+        return phrase_counts[slot] if slot >= 0 else 0
+
     # Create the analysis structure
     analysis = {
-        "primary_keyword": req_dict.get("primary_keyword", ""),
+        "primary_keyword": plan.primary_keyword,
         "primary_keyword_count": 0,
-        "word_count": len(tokens),
-        "word_count_target": req_dict.get("word_count", 1500),
-        "word_count_met": len(tokens) >= req_dict.get("word_count", 1500),
+        "word_count": word_count,
+        "word_count_target": plan.word_count_target,
+        "word_count_met": word_count >= plan.word_count_target,
         "variations": {},
         "heading_structure": {"H1": 0, "H2": 0, "H3": 0, "H4": 0, "H5": 0, "H6": 0},
         "lsi_keywords": {},
         "entities": {},
-        "meta_title": meta_title,
-        "meta_description": meta_description,
+        "meta_title": plan.meta_title,
+        "meta_description": plan.meta_description,
         "image_count": image_count,
-        "required_images": required_images,
-        "images_met": image_count >= required_images
+        "required_images": plan.required_images,
+        "images_met": image_count >= plan.required_images
     }
 
     # Check primary keyword usage
-    primary_keyword = req_dict.get("primary_keyword", "").lower().strip()
-    if primary_keyword and primary_keyword not in ["", None]:
-        # Use multiple counting approaches and take the higher count for accuracy
-        # 1. Direct string match in normalized text
-        count1 = raw_text.count(' ' + primary_keyword + ' ')
-        # 2. Word boundary regex for more precise matching
-        primary_keyword_pattern = r'\b' + re.escape(primary_keyword) + r'\b'
-        count2 = len(re.findall(primary_keyword_pattern, raw_text))
-        # 3. Check for exact matches in token list (most accurate for single words)
-        count3 = 0
+    primary_keyword = plan.primary_keyword_norm
+    if primary_keyword:
+        count = count_of(plan.matcher.index.get(primary_keyword, -1))
+        # Exact token matches after markdown cleaning can still catch single words
+        # the punctuation-stripped text splits differently
         if ' ' not in primary_keyword:
-            count3 = word_counts.get(primary_keyword, 0)
-        
-        # Take the highest count from the different methods
-        analysis["primary_keyword_count"] = max(count1, count2, count3)
-        
-        # Calculate primary keyword density
-        if analysis["word_count"] > 0:
-            analysis["primary_keyword_density"] = round((analysis["primary_keyword_count"] / analysis["word_count"]) * 100, 2)
-        else:
-            analysis["primary_keyword_density"] = 0
-
-    # Check variations usage
-    variations = req_dict.get("variations", [])
-    
-    # Get all entities from both regular and custom sources
-    entities = req_dict.get("entities", [])
-    custom_entities = req_dict.get("custom_entities", [])
-    
-    # Merge entities and custom entities, ensuring no duplicates
-    all_entities = []
-    # Add custom entities first (they should take priority)
-    all_entities.extend(custom_entities)
-    # Add regular entities that aren't already in the list
-    for entity in entities:
-        if entity not in all_entities:
-            all_entities.append(entity)
-
-    # Improved phrase counting for variations and entities
-    def count_phrase(text, phrase):
-        """Count occurrences of a phrase using multiple methods for accuracy"""
-        phrase = phrase.lower().strip()
-        # 1. Direct string match with spaces
-        count1 = text.count(' ' + phrase + ' ')
-        # 2. Word boundary regex match
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        count2 = len(re.findall(pattern, raw_text))
-        # Return the higher count
-        return max(count1, count2)
-    
-    # Count all variations and entities
-    phrase_counts = {phrase.lower().strip(): count_phrase(raw_text, phrase) 
-                     for phrase in variations + all_entities}
+            count = max(count, primary_token_count)
+        analysis["primary_keyword_count"] = count
+        analysis["primary_keyword_density"] = _density(count, word_count)
 
     # Fill variation counts with density calculation
     total_variation_count = 0
-    for var in variations:
-        count = phrase_counts.get(var.lower().strip(), 0)
-        density = (count / analysis["word_count"]) * 100 if analysis["word_count"] > 0 else 0
+    for var, slot in plan.variations:
+        count = count_of(slot)
         analysis["variations"][var] = {
             "count": count,
-            "density": round(density, 2),
+            "density": _density(count, word_count),
             "met": count > 0
         }
         total_variation_count += count
-    
-    # Add total variations density
-    if variations:
+    if plan.variations:
         analysis["total_variation_count"] = total_variation_count
-        analysis["total_variation_density"] = round((total_variation_count / analysis["word_count"]) * 100, 2) if analysis["word_count"] > 0 else 0
+        analysis["total_variation_density"] = _density(total_variation_count, word_count)
 
     # Check LSI keywords usage with density calculation
-    lsi_keywords = req_dict.get("lsi_keywords", {})
     total_lsi_count = 0
-    if isinstance(lsi_keywords, dict):
-        for keyword, target in lsi_keywords.items():
-            keyword_lower = keyword.lower().strip()
-            keyword_count = phrase_counts.get(keyword_lower, 0)
-            
-            # Handle different formats of LSI keyword requirements
-            target_count = 1  # Default
-            if isinstance(target, dict) and 'count' in target:
-                target_count = target['count']
-            elif isinstance(target, int):
-                target_count = target
-            
-            # Calculate density
-            density = (keyword_count / analysis["word_count"]) * 100 if analysis["word_count"] > 0 else 0
-                
-            analysis["lsi_keywords"][keyword] = {
-                "count": keyword_count,
-                "target": target_count,
-                "met": keyword_count >= target_count,
-                "density": round(density, 2)
-            }
-            total_lsi_count += keyword_count
-    else:
-        # Handle list format
-        for keyword in lsi_keywords:
-            keyword_lower = keyword.lower().strip()
-            keyword_count = phrase_counts.get(keyword_lower, 0)
-            density = (keyword_count / analysis["word_count"]) * 100 if analysis["word_count"] > 0 else 0
-            
-            analysis["lsi_keywords"][keyword] = {
-                "count": keyword_count,
-                "target": 1,  # Default to 1 for list format
-                "met": keyword_count >= 1,
-                "density": round(density, 2)
-            }
-            total_lsi_count += keyword_count
-    
-    # Add total LSI keywords density
-    if lsi_keywords:
+    for keyword, slot, target_count in plan.lsi_keywords:
+        keyword_count = count_of(slot)
+        analysis["lsi_keywords"][keyword] = {
+            "count": keyword_count,
+            "target": target_count,
+            "met": keyword_count >= target_count,
+            "density": _density(keyword_count, word_count)
+        }
+        total_lsi_count += keyword_count
+    if plan.lsi_keywords:
         analysis["total_lsi_count"] = total_lsi_count
-        analysis["total_lsi_density"] = round((total_lsi_count / analysis["word_count"]) * 100, 2) if analysis["word_count"] > 0 else 0
+        analysis["total_lsi_density"] = _density(total_lsi_count, word_count)
 
     # Check entities usage with density calculation
     total_entity_count = 0
-    for entity in all_entities:
-        entity_lower = entity.lower().strip()
-        entity_count = phrase_counts.get(entity_lower, 0)
-        density = (entity_count / analysis["word_count"]) * 100 if analysis["word_count"] > 0 else 0
-        
+    for entity, slot in plan.entities:
+        entity_count = count_of(slot)
         analysis["entities"][entity] = {
             "count": entity_count,
             "met": entity_count > 0,
-            "density": round(density, 2)
+            "density": _density(entity_count, word_count)
         }
         total_entity_count += entity_count
-    
-    # Add total entities density
-    if all_entities:
+    if plan.entities:
         analysis["total_entity_count"] = total_entity_count
-        analysis["total_entity_density"] = round((total_entity_count / analysis["word_count"]) * 100, 2) if analysis["word_count"] > 0 else 0
-
-    # Extract heading tags
-    headings = {
-        "H1": len(re.findall(r'^# ', markdown_content, re.MULTILINE)),
-        "H2": len(re.findall(r'^## ', markdown_content, re.MULTILINE)),
-        "H3": len(re.findall(r'^### ', markdown_content, re.MULTILINE)),
-        "H4": len(re.findall(r'^#### ', markdown_content, re.MULTILINE)),
-        "H5": len(re.findall(r'^##### ', markdown_content, re.MULTILINE)),
-        "H6": len(re.findall(r'^###### ', markdown_content, re.MULTILINE))
-    }
-    
-    # Update heading structure
-    analysis["heading_structure"] = headings
-    
-    # Check if heading requirements are met
-    heading_requirements = {
-        "H1": 1,  # We generally want 1 H1 tag
-        "H2": 0,
-        "H3": 0,
-        "H4": 0,
-        "H5": 0,
-        "H6": 0
-    }
-    
-    # Get heading structure requirements from requirements
-    # Look for multiple formats of heading structure requirements
-    
-    # First check direct requirement keys
-    for h_type in ["H2", "H3", "H4", "H5", "H6"]:
-        key = f"Number of {h_type} tags"
-        if key in req_dict:
-            heading_requirements[h_type] = req_dict[key]
-            
-    # Then check in requirements sub-dictionary if it exists
-    if 'requirements' in req_dict and isinstance(req_dict['requirements'], dict):
-        for h_type in ["H2", "H3", "H4", "H5", "H6"]:
-            key = f"Number of {h_type} tags"
-            if key in req_dict['requirements']:
-                heading_requirements[h_type] = req_dict['requirements'][key]
-                
-    # Finally check in heading_structure if it exists
-    if 'heading_structure' in req_dict and isinstance(req_dict['heading_structure'], dict):
-        for h_type in ["H2", "H3", "H4", "H5", "H6"]:
-            if h_type in req_dict['heading_structure']:
-                heading_requirements[h_type] = req_dict['heading_structure'][h_type]
-    
+        analysis["total_entity_density"] = _density(total_entity_count, word_count)
+
+    # Attributed counts credit each token span to a single phrase (leftmost-longest)
+    if attributed_counts is not None:
+        def attributed_of(slot: int) -> int:
+            return attributed_counts[slot] if slot >= 0 else 0
+
+        if primary_keyword:
+            count = attributed_of(plan.matcher.index.get(primary_keyword, -1))
+            analysis["primary_keyword_attributed_count"] = count
+            analysis["primary_keyword_attributed_density"] = _density(count, word_count)
+        for group, key, entries in (("variation", "variations", plan.variations),
+                                    ("lsi", "lsi_keywords", plan.lsi_keywords),
+                                    ("entity", "entities", plan.entities)):
+            total = 0
+            for entry in entries:
+                count = attributed_of(entry[1])
+                analysis[key][entry[0]]["attributed_count"] = count
+                analysis[key][entry[0]]["attributed_density"] = _density(count, word_count)
+                total += count
+            if entries:
+                analysis[f"total_{group}_attributed_count"] = total
+                analysis[f"total_{group}_attributed_density"] = _density(total, word_count)
+
+    # Update heading structure and check if heading requirements are met
+    analysis["heading_structure"] = dict(headings)
+    heading_requirements = dict(plan.heading_requirements)
     analysis["heading_requirements"] = heading_requirements
-    
+
     # Calculate score based on requirements met
     score_components = []
-    
+
     # Word count score (20%)
     word_count_score = 20 if analysis["word_count_met"] else round(20 * (analysis["word_count"] / analysis["word_count_target"]))
     score_components.append(("Word Count", word_count_score, 20))
-    
+
     # Primary keyword score (20%)
     primary_keyword_score = 20 if analysis["primary_keyword_count"] > 0 else 0
     score_components.append(("Primary Keyword", primary_keyword_score, 20))
-    
+
     # Heading structure score (20%)
     # Calculate percentage of heading requirements met
     headings_met = sum(1 for h_type in heading_requirements if analysis["heading_structure"].get(h_type, 0) >= heading_requirements.get(h_type, 0))
     heading_score = round(20 * (headings_met / len(heading_requirements)))
     score_components.append(("Heading Structure", heading_score, 20))
-    
+
     # LSI keywords score (20%)
     if analysis["lsi_keywords"]:
         lsi_met = sum(1 for info in analysis["lsi_keywords"].values() if info["met"])
@@ -289,7 +394,7 @@ def analyze_content(markdown_content: str, requirements: Union[SEORequirements,
     else:
         lsi_score = 20  # No LSI keywords required
     score_components.append(("LSI Keywords", lsi_score, 20))
-    
+
     # Entities score (20%)
     if analysis["entities"]:
         entities_met = sum(1 for info in analysis["entities"].values() if info["met"])
@@ -297,10 +402,383 @@ def analyze_content(markdown_content: str, requirements: Union[SEORequirements,
     else:
         entity_score = 20  # No entities required
     score_components.append(("Entities", entity_score, 20))
-    
+
     # Calculate final score
     analysis["score"] = word_count_score + primary_keyword_score + heading_score + lsi_score + entity_score
     analysis["score_components"] = score_components
-    
+    return analysis
+
+
+class ContentScan(NamedTuple):
+    """Text-side measurements of one document (the arguments of `assemble_analysis`)."""
+
+    word_count: int
+    phrase_counts: List[int]
+    primary_token_count: int
+    headings: Dict[str, int]
+    image_count: int
+    attributed_counts: Optional[List[int]] = None
+
+
+def iter_words(lowered: str) -> Iterator[str]:
+    """Yield the words of lower-cased markdown, as ``CLEAN_RE.sub(' ', lowered).split()`` would list them."""
+    for match in _WORD_RE.finditer(lowered):
+        word = match.group(1)
+        if word is not None:
+            yield word
+
+
+def normalize_content(markdown_content: str) -> Tuple[Iterator[str], str]:
+    """
+    Normalize markdown for analysis.
+
+    The text is lower-cased once; everything else is read from that copy.
+
+    Args:
+        markdown_content: The markdown content to normalize
+
+    Returns:
+        tuple: Lazy stream of words (markup, URLs and heading lines
+            removed) and the search text the phrase matcher scans (all
+            ``[a-z0-9]+`` tokens joined by single spaces)
+    """
+    lowered = markdown_content.lower()
+    return iter_words(lowered), ' '.join(_RAW_TOKEN_RE.findall(lowered))
+
+
+def _count_words(words: Iterable[str], primary_keyword: str) -> Tuple[int, int]:
+    """Number of words and how many of them are exactly *primary_keyword*."""
+    word_count = primary_count = 0
+    for word in words:
+        word_count += 1
+        if word == primary_keyword:
+            primary_count += 1
+    return word_count, primary_count
+
+
+def scan_content(markdown_content: str, plan: AnalysisPlan, attribution: bool = False) -> ContentScan:
+    """
+    Measure a markdown document against a compiled plan.
+
+    Args:
+        markdown_content: The markdown content to scan
+        plan: Plan from `compile_analysis_plan`
+        attribution: Also collect leftmost-longest attributed phrase counts
+
+    Returns:
+        ContentScan: Word, phrase, heading and image counts
+    """
+    words, raw_text = normalize_content(markdown_content)
+    word_count, primary_token_count = _count_words(words, plan.primary_keyword_norm)
+
+    # Count the primary keyword, variations, LSI keywords and entities in one
+    # Aho-Corasick pass over raw_text. Matches are whole-word and counted like
+    # re.findall(r'\b<phrase>\b', raw_text) (non-overlapping per phrase).
+    if attribution:
+        phrase_counts, attributed_counts = plan.matcher.count_attributed(raw_text)
+    else:
+        phrase_counts, attributed_counts = plan.matcher.count(raw_text), None
+
+    # Heading tags and images from one structural pass
+    structure = scan_markdown(markdown_content)
+
+    return ContentScan(
+        word_count, phrase_counts, primary_token_count, structure.heading_counts(), len(structure.images),
+        attributed_counts,
+    )
+
+
+def analyze_content(markdown_content: str, requirements: Union[SEORequirements, dict], attribution: bool = False):
+    """
+    Analyze SEO content to check if it meets all requirements.
+
+    Args:
+        markdown_content (str): The markdown content to analyze
+        requirements (dict): The SEO requirements dictionary
+        attribution (bool): Also report attributed counts, where each token
+            span is credited to one phrase only (leftmost-longest), so
+            "roof" inside "roof replacement" is not counted twice.  Raw
+            counts, met flags and the score are unchanged.
+
+    Returns:
+        dict: Analysis results including keyword counts, heading structure, etc.
+    """
+    plan = compile_analysis_plan(requirements)
+    analysis = assemble_analysis(plan, *scan_content(markdown_content, plan, attribution))
     logger.info(f"Content analysis complete. Score: {analysis['score']}%")
     return analysis
+
+
+def analyze_content_cached(
+    markdown_content: str,
+    requirements: Union[SEORequirements, dict],
+    cache: LRUCache = None,
+    attribution: bool = False,
+):
+    """
+    Memoized front end for `analyze_content`.
+
+    Results are keyed by the SHA-256 of the markdown, the requirements
+    fingerprint and ANALYZER_VERSION, so Streamlit reruns and exports of an
+    unchanged article reuse one analysis. Hit rates are available from
+    ``analysis_cache.stats()``.
+
+    Args:
+        markdown_content (str): The markdown content to analyze
+        requirements: SEORequirements or requirements dictionary
+        cache: LRUCache to use (defaults to the module-level `analysis_cache`)
+        attribution: Include attributed counts (see `analyze_content`)
+
+    Returns:
+        dict: Analysis results (a fresh copy on every call)
+    """
+    cache = analysis_cache if cache is None else cache
+    content_hash = hashlib.sha256(markdown_content.encode("utf-8")).hexdigest()
+    key = f"v{ANALYZER_VERSION}-{content_hash}-{requirements_fingerprint(requirements)}"
+    if attribution:
+        key += "-attributed"
+
+    payload = cache.get(key)
+    if payload is not None:
+        logger.debug(f"Analysis cache hit ({cache.stats()['hit_rate']:.0%} hit rate)")
+        return pickle.loads(payload)
+
+    analysis = analyze_content(markdown_content, requirements, attribution)
+    cache.set(key, pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL))
+    return analysis
+
+
+class IncrementalAnalyzer:
+    """
+    Analyze content while it streams in, one text delta at a time.
+
+    Deltas are buffered until a line ends; each completed line is cleaned,
+    tokenized and matched exactly once, so feeding a document costs
+    amortized O(delta) and only the unfinished last line is rescanned by
+    `result`.  Phrases that straddle a line or delta boundary are found by
+    re-matching the last ``max_tokens - 1`` tokens together with the new
+    ones.  `result` equals ``analyze_content(text_so_far, requirements)``,
+    except for an HTML tag left unclosed across more than
+    `max_held_chars` characters, which is then treated as text.
+
+    State is bounded: counters, the overlap window and the unfinished
+    line, so memory does not grow with the length of the stream (see
+    `analyze_stream`).
+
+    Example::
+
+        live = IncrementalAnalyzer(requirements)
+        for delta in stream:
+            if live.feed(delta):
+                show(live.result()["score"], live.off_track())
+        final = live.finish()
+    """
+
+    # Lines after an unclosed "<" wait for its ">" (a tag may span lines)
+    # until this much text is held back
+    max_held_chars = 8192
+
+    def __init__(self, requirements: Union[SEORequirements, dict], plan: AnalysisPlan = None):
+        self.plan = plan or compile_analysis_plan(requirements)
+        n = len(self.plan.matcher.phrases)
+        self._pending = ""
+        self._word_count = 0
+        self._primary_token_count = 0
+        self._phrase_counts = [0] * n
+        self._last_end = [0] * n
+        self._overlap: List[str] = []
+        self._raw_len = 0
+        # Only heading and image counts are needed, so keep no per-line structure
+        self._structure = MarkdownScanner(keep_structure=False)
+        self.chars_fed = 0
+
+    def _fork(self) -> "IncrementalAnalyzer":
+        clone = object.__new__(IncrementalAnalyzer)
+        clone.__dict__.update(self.__dict__)
+        clone._phrase_counts = list(self._phrase_counts)
+        clone._last_end = list(self._last_end)
+        clone._overlap = list(self._overlap)
+        clone._structure = self._structure.copy()
+        return clone
+
+    def _commit(self, region: str) -> None:
+        """Scan *region*, which starts at a line start and ends on a line boundary."""
+        lowered = region.lower()
+        word_count, primary_count = _count_words(iter_words(lowered), self.plan.primary_keyword_norm)
+        self._word_count += word_count
+        self._primary_token_count += primary_count
+        self._structure.feed(region)
+
+        raw_tokens = _RAW_TOKEN_RE.findall(lowered)
+        if not raw_tokens:
+            return
+        new_text = ' '.join(raw_tokens)
+        matcher = self.plan.matcher
+        if matcher.max_tokens:
+            # Window = carried tokens + new tokens, in raw_text coordinates
+            overlap_text = ' '.join(self._overlap)
+            if overlap_text:
+                window = overlap_text + ' ' + new_text
+                origin = self._raw_len - len(overlap_text)
+            else:
+                window = new_text
+                origin = self._raw_len + 1 if self._raw_len else 0
+            counts, last_end = self._phrase_counts, self._last_end
+            seen = len(overlap_text)
+            for start, end, idx in matcher.iter_matches(window):
+                # Matches entirely inside the overlap were counted last time
+                if end > seen and origin + start >= last_end[idx]:
+                    counts[idx] += 1
+                    last_end[idx] = origin + end
+            keep = matcher.max_tokens - 1
+            self._overlap = (self._overlap + raw_tokens)[-keep:] if keep else []
+        self._raw_len += len(new_text) + (1 if self._raw_len else 0)
+
+    @staticmethod
+    def _open_tag_start(text: str, cut: int) -> int:
+        """Offset of the earliest "<" before *cut* whose next ">" is at or after *cut* (or missing), else -1."""
+        lt = text.find('<', 0, cut)
+        gt = -1
+        while lt != -1:
+            if gt <= lt:
+                gt = text.find('>', lt + 1)
+                if gt == -1 or gt >= cut:
+                    return lt
+            lt = text.find('<', lt + 1, cut)
+        return -1
+
+    def feed(self, delta: str) -> bool:
+        """
+        Add a streamed text delta.
+
+        Args:
+            delta: Next piece of the generated markdown
+
+        Returns:
+            bool: True when at least one complete line was analyzed
+        """
+        if not delta:
+            return False
+        self.chars_fed += len(delta)
+        pending = self._pending + delta
+        cut = pending.rfind('\n') + 1
+        if not cut:
+            self._pending = pending
+            return False
+        # Hold back from the line of the first "<" whose ">" is not before the
+        # cut: a tag may span lines, and none may be split
+        if len(pending) <= self.max_held_chars:
+            # Moving the cut back can land it inside an earlier tag; repeat until it does not
+            lt = self._open_tag_start(pending, cut)
+            while lt != -1 and cut:
+                cut = pending.rfind('\n', 0, lt) + 1
+                lt = self._open_tag_start(pending, cut)
+        if not cut:
+            self._pending = pending
+            return False
+        self._commit(pending[:cut])
+        self._pending = pending[cut:]
+        return True
+
+    def result(self) -> Dict[str, Any]:
+        """Return the analysis of everything fed so far, as if the stream ended now."""
+        state = self
+        if self._pending:
+            state = self._fork()
+            state._commit(self._pending)
+        return assemble_analysis(
+            self.plan, state._word_count, state._phrase_counts, state._primary_token_count,
+            state._structure.heading_counts, state._structure.image_count,
+        )
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush the unfinished last line and return the final analysis."""
+        if self._pending:
+            self._commit(self._pending)
+            self._pending = ""
+        analysis = self.result()
+        logger.info(f"Incremental analysis complete. Score: {analysis['score']}%")
+        return analysis
+
+    def off_track(self, analysis: Dict[str, Any] = None, grace_words: int = 300) -> List[str]:
+        """
+        Explain why a draft is falling behind its requirements.
+
+        Coverage of LSI keywords and entities is compared with how far the
+        draft is through its target word count, so a generation drifting off
+        topic can be flagged long before it finishes.
+
+        Args:
+            analysis: Result of `result` (computed when omitted)
+            grace_words: Words to wait for before judging
+
+        Returns:
+            list: Human-readable reasons; empty when the draft is on track
+        """
+        analysis = analysis or self.result()
+        word_count = analysis["word_count"]
+        if word_count < grace_words:
+            return []
+        target = analysis["word_count_target"] or word_count
+        progress = min(1.0, word_count / target)
+
+        reasons = []
+        if analysis["primary_keyword"] and analysis["primary_keyword_count"] == 0:
+            reasons.append(f"Primary keyword not used after {word_count} words")
+        for label, key in (("LSI keyword", "lsi_keywords"), ("Entity", "entities")):
+            items = analysis[key]
+            if items:
+                coverage = sum(1 for info in items.values() if info["met"]) / len(items)
+                # Expect at least half the proportional coverage at this point
+                if coverage < progress / 2:
+                    reasons.append(f"{label} coverage {coverage:.0%} at {progress:.0%} of target length")
+        if word_count > 1.5 * target:
+            reasons.append(f"{word_count} words, well over the {target} word target")
+        return reasons
+
+
+def _read_chunks(source: Union[Iterable[str], IO], chunk_size: int) -> Iterator[str]:
+    """Text chunks from a file handle (text or binary, read *chunk_size* at a time) or an iterable."""
+    if not hasattr(source, "read"):
+        yield from source
+        return
+    decoder = None
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            decoder = decoder or codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk)
+        yield chunk
+    if decoder is not None:
+        yield decoder.decode(b"", final=True)
+
+
+def analyze_stream(
+    source: Union[Iterable[str], IO],
+    requirements: Union[SEORequirements, dict],
+    chunk_size: int = 1 << 16,
+) -> Dict[str, Any]:
+    """
+    Analyze a document too large to hold in memory as one string.
+
+    Chunks go through `IncrementalAnalyzer`, so phrases split across chunks
+    are still counted (via its bounded token overlap) and the result equals
+    ``analyze_content(''.join(chunks), requirements)`` (up to its caveat
+    about long unclosed HTML tags).  Memory is bounded
+    by the longest line rather than the document size.
+
+    Args:
+        source: Iterable of text chunks, or a file handle opened in text or
+            binary (UTF-8) mode
+        requirements: SEORequirements or requirements dictionary
+        chunk_size: Characters (or bytes) read per call from a file handle
+
+    Returns:
+        dict: Analysis results, as from `analyze_content`
+    """
+    live = IncrementalAnalyzer(requirements)
+    for chunk in _read_chunks(source, chunk_size):
+        live.feed(chunk)
+    return live.finish()
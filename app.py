@@ -3,15 +3,17 @@ import pandas as pd
 import re
 import json
 import warnings
-from seo_parser import parse_cora_report
+from seo_parser import parse_cora_report_cached
 from services import (
     generate_meta_and_headings,
     markdown_to_html,
     generate_content_from_headings,
-    analyze_content
+    analyze_content,
+    IncrementalAnalyzer
 )
 from content_generator import extract_markdown_content
 from utils.logger import get_logger
+from utils.markdown_scan import outline_item, scan_markdown
 from ui_components import (
     initialize_session_state,
     display_token_usage,
@@ -30,33 +32,19 @@ def extract_headings_from_content(content):
         # Extract everything after the HEADING STRUCTURE marker
         headings_section = content[heading_index + len("HEADING STRUCTURE:\n"):]
         
-        # Split by individual lines and filter empty lines
-        all_lines = headings_section.split('\n')
-        heading_list = []
-        
-        for line in all_lines:
-            line = line.strip()
-            # Check if it's a heading (starts with # or H1-H6:)
-            if line and (line.startswith('#') or re.match(r'^H[1-6]:', line)):
-                heading_list.append(line)
+        # Markdown headings and H1:-style labels, in outline order
+        heading_list = [h.raw for h in scan_markdown(headings_section, label_headings=True, outline=True).headings]
         
         if st.session_state.get('debug_mode', False):
             print(f"Extracted {len(heading_list)} headings from HEADING STRUCTURE section: {heading_list}")
         
         return heading_list
     
-    # Fallback patterns if HEADING STRUCTURE section isn't found
-    heading_lines = re.findall(r'^(#{1,6}\s+.+?)$', content, re.MULTILINE)
-    if heading_lines:
-        if st.session_state.get('debug_mode', False):
-            print(f"Extracted {len(heading_lines)} markdown headings: {heading_lines}")
-        return heading_lines
-    
-    # Last resort for H1, H2, etc. format
-    heading_lines = re.findall(r'^(H[1-6]:\s+.+?)$', content, re.MULTILINE)
+    # Fallback: markdown headings anywhere, else H1, H2, etc. format
+    heading_lines = scan_markdown(content, label_headings=True, outline=True).heading_lines()
     if heading_lines:
         if st.session_state.get('debug_mode', False):
-            print(f"Extracted {len(heading_lines)} H1-H6 format headings: {heading_lines}")
+            print(f"Extracted {len(heading_lines)} headings: {heading_lines}")
         return heading_lines
     
     # If we get here, no headings were found
@@ -103,26 +91,8 @@ def extract_and_save_headings(response):
                 has_headings = True
                 
                 # Parse headings for the editor
-                parsed = []
-                for h in heading_list:
-                    h = h.strip()
-                    if not h:
-                        continue
-                    # Use regex to match any heading level (H1-H6)
-                    if re.match(r'^#{1,6}\s+', h):
-                        # Extract the heading level (number of # characters)
-                        level = len(re.match(r'^(#+)', h).group(1))
-                        # Extract the heading text (everything after the #s)
-                        text = re.sub(r'^#+\s*[:.\-]?\s*', "", h).strip()
-                    else:
-                        m = re.match(r'^H(\d)\s*[:.\-]?\s*(.*)', h)
-                        if m:
-                            level = int(m.group(1))
-                            text = m.group(2).strip()
-                        else:
-                            level = 2
-                            text = h.strip()
-                    parsed.append({"level": level, "text": text})
+                # Any heading level (H1-H6) in markdown or "H2:" form; other lines become H2s
+                parsed = [outline_item(h) for h in heading_list if h.strip()]
                 
                 if not parsed:
                     parsed.append({"level": 1, "text": "Main Heading"})
@@ -142,25 +112,7 @@ def extract_and_save_headings(response):
                 lines.extend(entry.splitlines())
         
         # Now parse each line for headings
-        for h in lines:
-            h = h.strip()
-            if not h:
-                continue
-            # Use regex to match any heading level (H1-H6)
-            if re.match(r'^#{1,6}\s+', h):
-                # Extract the heading level (number of # characters)
-                level = len(re.match(r'^(#+)', h).group(1))
-                # Extract the heading text (everything after the #s)
-                text = re.sub(r'^#+\s*[:.\-]?\s*', "", h).strip()
-            else:
-                m = re.match(r'^H(\d)\s*[:.\-]?\s*(.*)', h)
-                if m:
-                    level = int(m.group(1))
-                    text = m.group(2).strip()
-                else:
-                    level = 2
-                    text = h.strip()
-            parsed.append({"level": level, "text": text})
+        parsed.extend(outline_item(h) for h in lines if h.strip())
         
         if not parsed:
             parsed.append({"level": 1, "text": "Main Heading"})
@@ -354,7 +306,7 @@ def process_upload():
             return
         
         # Get all data as a single dictionary
-        parsed_obj = parse_cora_report(file)
+        parsed_obj = parse_cora_report_cached(file)
         # Store the SEORequirements object
         st.session_state.req_obj = parsed_obj
         # For backward compatibility
@@ -633,6 +585,8 @@ def generate_content_flow():
         # Add regenerate button
         if st.button("Regenerate Content"):
             st.session_state['auto_generate_content'] = True
+            # Ask for a new article rather than the cached response
+            st.session_state['force_regenerate'] = True
             st.rerun()
         
     # Only show Heading Structure Configuration in Step 2, not in Step 2.5
@@ -811,10 +765,12 @@ elif st.session_state.get("step", 1) == 2:
                         st.session_state.accumulated_thinking += thinking_content
                         thinking_placeholder.markdown(f"<div class='thinking-container'>{st.session_state.accumulated_thinking}</div>", unsafe_allow_html=True)
                 
-                # 3) MAKE THE SINGLE API CALL
+                # 3) MAKE THE SINGLE API CALL; clicking again once headings exist asks for
+                # a new outline, so it must not be answered from the response cache
+                regenerate = bool((st.session_state.get('meta_and_headings') or {}).get('headings'))
                 response = generate_meta_and_headings(
                     st.session_state.requirements,
-                    st.session_state.settings,
+                    {**st.session_state.settings, 'bypass_response_cache': regenerate},
                     st.session_state.business_data,
                     stream=True,
                     stream_callback=update_stream
@@ -1136,16 +1092,8 @@ elif st.session_state.get("step", 1) == 2.5:
                     st.session_state.meta_and_headings["headings"] = heading_lines
                     
                     # Also update editable_headings
-                    parsed = []
-                    for h in heading_lines:
-                        if re.match(r'^#{1,6}\s+', h):
-                            level = len(re.match(r'^(#+)', h).group(1))
-                            text = h.lstrip('#').strip()
-                            parsed.append({"level": level, "text": text})
-                        else:
-                            # fallback: treat as H2 if not markdown
-                            parsed.append({"level": 2, "text": h})
-                    st.session_state.editable_headings = parsed
+                    # Non-heading lines fall back to H2
+                    st.session_state.editable_headings = [outline_item(h) for h in heading_lines]
                     st.success(f"Refreshed {len(heading_lines)} headings from API response.")
                 else:
                     st.warning("No headings found in HEADING STRUCTURE section.")
@@ -1154,15 +1102,7 @@ elif st.session_state.get("step", 1) == 2.5:
                 heading_lines = extract_headings_from_content(content)
                 if heading_lines:
                     st.session_state.meta_and_headings["headings"] = heading_lines
-                    parsed = []
-                    for h in heading_lines:
-                        if re.match(r'^#{1,6}\s+', h):
-                            level = len(re.match(r'^(#+)', h).group(1))
-                            text = h.lstrip('#').strip()
-                            parsed.append({"level": level, "text": text})
-                        else:
-                            parsed.append({"level": 2, "text": h})
-                    st.session_state.editable_headings = parsed
+                    st.session_state.editable_headings = [outline_item(h) for h in heading_lines]
                     st.success(f"Refreshed {len(heading_lines)} headings from API response (fallback mode).")
                 else:
                     st.warning("No headings found in API response.")
@@ -1248,22 +1188,7 @@ elif st.session_state.get("step", 1) == 2.5:
         for h in headings:
             if isinstance(h, str):
                 lines.extend(h.splitlines())
-        for h in lines:
-            h = h.strip()
-            if not h:
-                continue
-            if re.match(r'^#{1,6}\s+', h):
-                level = len(re.match(r'^(#+)', h).group(1))
-                text = re.sub(r'^#+\s*[:.\-]?\s*', "", h).strip()
-            else:
-                m = re.match(r'^H(\d)\s*[:.\-]?\s*(.*)', h)
-                if m:
-                    level = int(m.group(1))
-                    text = m.group(2).strip()
-                else:
-                    level = 2
-                    text = h.strip()
-            parsed.append({"level": level, "text": text})
+        parsed.extend(outline_item(h) for h in lines if h.strip())
         # Debug: Print parsed headings
         print(f"Parsed editable_headings: {parsed}")
         # If no headings were parsed, create a default one
@@ -1481,8 +1406,8 @@ elif st.session_state.get("step", 1) == 3:
         or st.session_state.get('force_regenerate', False) 
         or st.session_state.get('auto_generate_content', False)
     ):
-        # Reset flags immediately
-        st.session_state.pop('force_regenerate', None)
+        # Reset flags immediately; an explicit regenerate must not be answered from the response cache
+        regenerate = bool(st.session_state.pop('force_regenerate', None))
         st.session_state['auto_generate_content'] = False
         # Get streaming content display components
         content_placeholder, status_placeholder, thinking_placeholder = stream_content_display()
@@ -1498,6 +1423,7 @@ elif st.session_state.get("step", 1) == 3:
                     'generate_tables': st.session_state.get('use_tables', False),
                     'generate_lists': st.session_state.get('use_lists', False),
                     'generate_images': st.session_state.get('create_images', False),
+                    'bypass_response_cache': regenerate,
                 }
                 
                 # Update session state settings
@@ -1524,6 +1450,9 @@ elif st.session_state.get("step", 1) == 3:
                         if 'settings' in st.session_state:
                             st.session_state.settings['anthropic_api_key'] = st.session_state.get('anthropic_api_key', '')
                         
+                        # Live SEO feedback: each completed line is analyzed once as it streams in
+                        live_analysis = IncrementalAnalyzer(st.session_state.requirements)
+
                         # Define the inner callback function that ONLY accumulates content - NO EXTRACTION DURING STREAMING
                         def update_stream(content=None, thinking_content=None):
                             if content is not None:
@@ -1537,6 +1466,20 @@ elif st.session_state.get("step", 1) == 3:
                                 </div>
                                 """
                                 content_placeholder.markdown(html, unsafe_allow_html=True)
+
+                                if live_analysis.feed(content):
+                                    live = live_analysis.result()
+                                    lsi_met = sum(1 for info in live["lsi_keywords"].values() if info["met"])
+                                    entities_met = sum(1 for info in live["entities"].values() if info["met"])
+                                    summary = (
+                                        f"Generating… live score {live['score']}% · {live['word_count']}/{live['word_count_target']} words · "
+                                        f"LSI {lsi_met}/{len(live['lsi_keywords'])} · entities {entities_met}/{len(live['entities'])}"
+                                    )
+                                    off_track = live_analysis.off_track(live)
+                                    if off_track:
+                                        status_placeholder.warning(summary + " — " + "; ".join(off_track))
+                                    else:
+                                        status_placeholder.info(summary)
                             
                             if thinking_content is not None:
                                 # Just accumulate thinking content
@@ -1586,8 +1529,7 @@ elif st.session_state.get("step", 1) == 3:
                         
                         if heading_match:
                             heading_text = heading_match.group(1).strip()
-                            heading_lines = [line.strip() for line in heading_text.split('\n') 
-                                            if line.strip() and re.match(r'^#{1,6}\s+', line.strip())]
+                            heading_lines = [h.raw for h in scan_markdown(heading_text, outline=True).headings]
                             print(f"EXTRACTED {len(heading_lines)} markdown headings from HEADING STRUCTURE section")
                             for h in heading_lines:
                                 print(f"  - {h}")
@@ -1777,10 +1719,11 @@ def generate_and_display_content():
                         st.session_state.accumulated_thinking += thinking_content
                         thinking_placeholder.markdown(f"<div class='thinking-container'>{st.session_state.accumulated_thinking}</div>", unsafe_allow_html=True)
                 
-                # Make the API call with the streaming callback
+                # Make the API call with the streaming callback (a repeat call wants a new outline, not the cached one)
+                regenerate = bool((st.session_state.get('meta_and_headings') or {}).get('headings'))
                 response = generate_meta_and_headings(
                     st.session_state.requirements, 
-                    st.session_state.settings, 
+                    {**st.session_state.settings, 'bypass_response_cache': regenerate}, 
                     st.session_state.business_data,
                     stream=True, 
                     stream_callback=update_stream
@@ -1826,28 +1769,19 @@ def generate_and_display_content():
                         heading_text = heading_match.group(1).strip()
                         print(f"\nFound HEADING STRUCTURE section: \n{heading_text}")
                         # Extract ALL markdown headings (with any number of # characters)
-                        heading_lines = [line.strip() for line in heading_text.split('\n') 
-                                        if line.strip() and re.match(r'^#{1,6}\s+', line.strip())]
+                        heading_lines = [h.raw for h in scan_markdown(heading_text, outline=True).headings]
                         print(f"Extracted {len(heading_lines)} markdown headings from HEADING STRUCTURE section")
                         # Print each heading for debugging
                         for h in heading_lines:
                             print(f"  - {h}")
                         found_headings = heading_lines
                     
-                    # Method 2: Try markdown headings if needed
-                    if not found_headings:
-                        print("\nNo valid HEADING STRUCTURE section found, trying markdown headings...")
-                        heading_lines = re.findall(r'^(#{1,6}\s+.+?)$', accumulated_content[0], re.MULTILINE)
-                        if heading_lines:
-                            print(f"Found {len(heading_lines)} markdown headings")
-                            found_headings = heading_lines
-                    
-                    # Method 3: Try H1, H2 format if needed
+                    # Method 2: markdown headings anywhere, else H1, H2 format
                     if not found_headings:
-                        print("\nNo markdown headings found, trying H1, H2 format...")
-                        heading_lines = re.findall(r'^(H[1-6]:\s+.+?)$', accumulated_content[0], re.MULTILINE)
+                        print("\nNo valid HEADING STRUCTURE section found, trying markdown and Hn format headings...")
+                        heading_lines = scan_markdown(accumulated_content[0], label_headings=True, outline=True).heading_lines()
                         if heading_lines:
-                            print(f"Found {len(heading_lines)} Hn format headings")
+                            print(f"Found {len(heading_lines)} headings")
                             found_headings = heading_lines
                     
                     # Store the headings AFTER streaming
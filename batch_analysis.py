@@ -0,0 +1,249 @@
+"""Analyze many documents against one set of requirements with NumPy.
+
+Each document is scanned once (tokenization and one phrase-matcher pass,
+exactly as `analysis.analyze_content` does); the counts land in a
+documents × phrases matrix and everything after that — densities, met
+flags and the five score components — is computed as array operations.
+
+Usage:
+    batch = analyze_batch(markdown_documents, requirements, workers=4)
+    batch.scores                  # (documents,) total scores
+    batch.lsi_met.mean(axis=0)    # how often each LSI keyword is covered
+    batch.analysis(0)             # analyze_content-compatible dict
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from analysis import AnalysisPlan, ContentScan, assemble_analysis, compile_analysis_plan, scan_content
+from models import SEORequirements
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HEADING_TYPES = ("H1", "H2", "H3", "H4", "H5", "H6")
+SCORE_COMPONENTS = ("Word Count", "Primary Keyword", "Heading Structure", "LSI Keywords", "Entities")
+
+
+def _unique_entries(entries: Sequence[tuple]) -> List[tuple]:
+    """Entries as the analysis dict keys them: one per display name, last wins."""
+    return list({entry[0]: entry for entry in entries}.values())
+
+
+def _round_score(values: np.ndarray) -> np.ndarray:
+    # np.rint rounds half to even, like the built-in round() used by analyze_content
+    return np.rint(values).astype(np.int64)
+
+
+def _density(counts: np.ndarray, word_counts: np.ndarray) -> np.ndarray:
+    """Percentage of *counts* per word, 0 for empty documents (unrounded)."""
+    words = word_counts.reshape(-1, *([1] * (counts.ndim - 1)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(words > 0, counts / np.maximum(words, 1) * 100, 0.0)
+
+
+@dataclass
+class BatchAnalysis:
+    """Count matrix and vectorized scores for a batch of documents.
+
+    ``counts`` has one column per `plan.matcher` phrase index.  Per-group
+    views (``variation_counts``, ``lsi_counts``, ``entity_counts``) follow
+    the order of `plan.variations`, `plan.lsi_keywords` and `plan.entities`.
+    """
+
+    plan: AnalysisPlan
+    scans: List[ContentScan]
+    counts: np.ndarray
+    word_counts: np.ndarray
+    primary_token_counts: np.ndarray
+    heading_counts: np.ndarray
+    image_counts: np.ndarray
+
+    def __post_init__(self):
+        # Trailing zero column: slot -1 (a phrase that can never match) reads 0
+        self._padded = np.concatenate([self.counts, np.zeros((len(self), 1), dtype=self.counts.dtype)], axis=1)
+
+    def __len__(self) -> int:
+        return len(self.scans)
+
+    def _columns(self, slots: Iterable[int]) -> np.ndarray:
+        # An explicit width: an empty batch cannot infer it from -1
+        slots = np.fromiter(slots, dtype=np.int64)
+        return self._padded[:, slots].reshape(len(self), len(slots))
+
+    # -- per-group counts -------------------------------------------------
+
+    @property
+    def primary_keyword_counts(self) -> np.ndarray:
+        keyword = self.plan.primary_keyword_norm
+        if not keyword:
+            return np.zeros(len(self), dtype=np.int64)
+        counts = self._columns([self.plan.matcher.index.get(keyword, -1)])[:, 0]
+        if ' ' not in keyword:
+            counts = np.maximum(counts, self.primary_token_counts)
+        return counts
+
+    @property
+    def variation_counts(self) -> np.ndarray:
+        return self._columns(slot for _, slot in self.plan.variations)
+
+    @property
+    def lsi_counts(self) -> np.ndarray:
+        return self._columns(slot for _, slot, _ in self.plan.lsi_keywords)
+
+    @property
+    def lsi_targets(self) -> np.ndarray:
+        return np.array([target for _, _, target in self.plan.lsi_keywords], dtype=np.float64)
+
+    @property
+    def entity_counts(self) -> np.ndarray:
+        return self._columns(slot for _, slot in self.plan.entities)
+
+    # -- densities and met flags ------------------------------------------
+
+    def density(self, counts: np.ndarray) -> np.ndarray:
+        """Per-document percentage density of a count column or matrix."""
+        return _density(counts, self.word_counts)
+
+    @property
+    def lsi_met(self) -> np.ndarray:
+        return self.lsi_counts >= self.lsi_targets
+
+    @property
+    def entity_met(self) -> np.ndarray:
+        return self.entity_counts > 0
+
+    @property
+    def variation_met(self) -> np.ndarray:
+        return self.variation_counts > 0
+
+    @property
+    def word_count_met(self) -> np.ndarray:
+        return self.word_counts >= self.plan.word_count_target
+
+    @property
+    def images_met(self) -> np.ndarray:
+        return self.image_counts >= self.plan.required_images
+
+    # -- score ------------------------------------------------------------
+
+    @property
+    def score_components(self) -> np.ndarray:
+        """(documents, 5) component scores in `SCORE_COMPONENTS` order."""
+        plan = self.plan
+        target = plan.word_count_target
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = self.word_counts / target if target else np.zeros(len(self))
+        word_score = np.where(self.word_count_met, 20, _round_score(20 * ratio))
+
+        primary_score = np.where(self.primary_keyword_counts > 0, 20, 0)
+
+        requirements = dict(plan.heading_requirements)
+        heading_targets = np.array([requirements.get(h, 0) for h in HEADING_TYPES])
+        headings_met = (self.heading_counts >= heading_targets).sum(axis=1)
+        heading_score = _round_score(20 * (headings_met / len(requirements)))
+
+        def coverage_score(entries, met_of) -> np.ndarray:
+            # Scores count distinct dict keys; duplicates share slot and target
+            unique = _unique_entries(entries)
+            if not unique:
+                return np.full(len(self), 20)
+            met = met_of(unique).sum(axis=1)
+            return _round_score(20 * (met / len(unique)))
+
+        lsi_score = coverage_score(
+            plan.lsi_keywords,
+            lambda unique: self._columns(e[1] for e in unique) >= np.array([e[2] for e in unique], dtype=np.float64),
+        )
+        entity_score = coverage_score(plan.entities, lambda unique: self._columns(e[1] for e in unique) > 0)
+
+        return np.stack([word_score, primary_score, heading_score, lsi_score, entity_score], axis=1).astype(np.int64)
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.score_components.sum(axis=1)
+
+    # -- conversions ------------------------------------------------------
+
+    def analysis(self, i: int) -> Dict[str, Any]:
+        """Return document *i* as the dict `analyze_content` would produce."""
+        return assemble_analysis(self.plan, *self.scans[i])
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self.analysis(i) for i in range(len(self))]
+
+    def summary_frame(self, labels: Optional[Sequence[str]] = None):
+        """One row per document: score, components, word count and coverage."""
+        import pandas as pd
+
+        components = self.score_components
+        frame = pd.DataFrame({
+            "score": components.sum(axis=1),
+            **{name: components[:, k] for k, name in enumerate(SCORE_COMPONENTS)},
+            "word_count": self.word_counts,
+            "primary_keyword_count": self.primary_keyword_counts,
+            "lsi_coverage": self.lsi_met.mean(axis=1) if self.plan.lsi_keywords else np.nan,
+            "entity_coverage": self.entity_met.mean(axis=1) if self.plan.entities else np.nan,
+            "image_count": self.image_counts,
+        }, index=list(labels) if labels is not None else None)
+        return frame
+
+
+def _scan_chunk(requirements: Union[SEORequirements, dict], documents: List[str]) -> List[ContentScan]:
+    """Worker entry point: scan *documents* with a plan compiled in this process."""
+    plan = compile_analysis_plan(requirements)
+    return [scan_content(document, plan) for document in documents]
+
+
+def analyze_batch(
+    documents: Iterable[str],
+    requirements: Union[SEORequirements, dict],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> BatchAnalysis:
+    """
+    Analyze many markdown documents against one set of requirements.
+
+    Args:
+        documents: Markdown documents
+        requirements: SEORequirements or requirements dictionary shared by all documents
+        workers: Scan in this many processes (``None`` or 1 scans in-process;
+            0 uses one per CPU)
+        chunk_size: Documents handed to a worker at a time
+
+    Returns:
+        BatchAnalysis: Count matrix plus vectorized densities, met flags and scores
+    """
+    plan = compile_analysis_plan(requirements)
+    documents = list(documents)
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers and workers > 1 and len(documents) > chunk_size:
+        chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scans = [scan for chunk in pool.map(_scan_chunk, [requirements] * len(chunks), chunks) for scan in chunk]
+    else:
+        scans = [scan_content(document, plan) for document in documents]
+
+    phrases = len(plan.matcher.phrases)
+    counts = np.zeros((len(scans), phrases), dtype=np.int64)
+    for row, scan in enumerate(scans):
+        counts[row] = scan.phrase_counts
+
+    batch = BatchAnalysis(
+        plan=plan,
+        scans=scans,
+        counts=counts,
+        word_counts=np.fromiter((s.word_count for s in scans), dtype=np.int64, count=len(scans)),
+        primary_token_counts=np.fromiter((s.primary_token_count for s in scans), dtype=np.int64, count=len(scans)),
+        heading_counts=np.array([[s.headings[h] for h in HEADING_TYPES] for s in scans], dtype=np.int64).reshape(-1, 6),
+        image_counts=np.fromiter((s.image_count for s in scans), dtype=np.int64, count=len(scans)),
+    )
+    logger.info(f"Batch analysis complete: {len(scans)} documents x {phrases} phrases")
+    return batch
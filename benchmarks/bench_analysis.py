@@ -0,0 +1,198 @@
+"""Benchmark and cross-check phrase counting in `analysis.analyze_content`.
+
+Usage:
+    python -m benchmarks.bench_analysis [--words 2000 20000] [--docs 20]
+
+Phrase counts from every `PhraseMatcher` backend are checked against the
+per-phrase regex reference (``len(re.findall(r"\\b<phrase>\\b", text))``,
+the counting rule analyze_content has always used) on a corpus of
+synthetic articles, and `IncrementalAnalyzer` fed in small deltas is
+checked against analyze_content.  Then the backends, the reference and
+both analyzers are timed, text normalization is compared with the old
+copy-per-step pipeline (best time and tracemalloc peak), and
+`batch_analysis.analyze_batch` scores are compared with a loop over
+analyze_content.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import re
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Optional
+
+from analysis import CLEAN_RE, IncrementalAnalyzer, analyze_content, analyze_stream, normalize_content, plan_cache
+from batch_analysis import analyze_batch
+from benchmarks.synthetic_content import make_article, make_requirements
+from utils.text_utils import PhraseMatcher, ahocorasick
+
+
+def normalize_text(markdown_content: str) -> str:
+    """Lower-case alphanumeric tokens joined by single spaces (analyze_content's raw_text)."""
+    return " ".join(re.findall(r"[a-z0-9]+", markdown_content.lower()))
+
+
+def reference_counts(text: str, phrases: Iterable[str]) -> Dict[str, int]:
+    """One regex per phrase, as analyze_content counted before the automaton."""
+    counts = {}
+    for phrase in phrases:
+        phrase = phrase.lower().strip()
+        if phrase:
+            counts[phrase] = len(re.findall(r"\b" + re.escape(phrase) + r"\b", text))
+    return counts
+
+
+def legacy_normalize(markdown_content: str):
+    """Words and search text the way analyze_content built them before `normalize_content`.
+
+    Four full-size intermediate strings plus the word list.
+    """
+    lowered = markdown_content.lower()
+    text_content = re.sub(r"\s+", " ", CLEAN_RE.sub(" ", lowered)).strip()
+    words = text_content.split()
+    raw_text = re.sub(r"\s+", " ", re.sub(r"[^a-z0-9\s]", " ", lowered)).strip()
+    return words, raw_text
+
+
+def _normalize(markdown_content: str):
+    words, raw_text = normalize_content(markdown_content)
+    return sum(1 for _ in words), raw_text
+
+
+def _peak_kib(fn) -> float:
+    """tracemalloc peak of one call, in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Delta sequences with tags that span lines; cutting inside one changes the word count
+TAG_SPLIT_STREAMS = [
+    ['Intro text.\n<img\n  src="roof.jpg"> See <a\n', '  href="/x">our page</a> today.\n'],
+    ['<div\nclass="a">One two\n', 'three <span\n', 'x="1"\n>four</span> <b\n', '>five</b>\n'],
+    ['Roof <a href="/y"\ntitle="t">repair</a> and <em\n', 'class="k">roofing</em> guide\n'],
+]
+
+
+def _stream(markdown: str, requirements, delta: int = 20) -> dict:
+    """Feed *markdown* to an `IncrementalAnalyzer` in *delta*-character pieces."""
+    live = IncrementalAnalyzer(requirements)
+    for i in range(0, len(markdown), delta):
+        live.feed(markdown[i:i + delta])
+    return live.finish()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", nargs="+", type=int, default=[2000, 20000], help="article sizes to time")
+    parser.add_argument("--docs", type=int, default=20, help="articles in the regression corpus")
+    parser.add_argument("--batch", type=int, default=500, help="articles in the batch-analysis run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    backends = ["python"] + (["pyahocorasick"] if ahocorasick is not None else [])
+
+    # Regression corpus: every backend must reproduce the regex reference exactly
+    mismatches = 0
+    for seed in range(args.docs):
+        requirements = make_requirements(seed=seed)
+        text = normalize_text(make_article(requirements, words=500 + 300 * seed, seed=seed))
+        phrases = [requirements.primary_keyword, *requirements.variations, *requirements.lsi_keywords,
+                   *requirements.entities, *requirements.custom_entities]
+        expected = reference_counts(text, phrases)
+        for backend in backends:
+            if PhraseMatcher(phrases, backend=backend).count_dict(text) != expected:
+                mismatches += 1
+                print(f"  mismatch: backend={backend} seed={seed}")
+    print(f"Regression corpus: {args.docs} articles x {len(backends)} backends, {mismatches} mismatches")
+
+    # Streaming analysis must end where the one-shot analysis does
+    mismatches = 0
+    for seed in range(args.docs):
+        requirements = make_requirements(seed=seed)
+        markdown = make_article(requirements, words=500 + 300 * seed, seed=seed)
+        if _stream(markdown, requirements, delta=7 + seed) != analyze_content(markdown, requirements):
+            mismatches += 1
+            print(f"  mismatch: incremental seed={seed}")
+    requirements = make_requirements(seed=0)
+    for index, deltas in enumerate(TAG_SPLIT_STREAMS):
+        live = IncrementalAnalyzer(requirements)
+        for delta in deltas:
+            live.feed(delta)
+        if live.finish() != analyze_content("".join(deltas), requirements):
+            mismatches += 1
+            print(f"  mismatch: multi-line tag stream {index}")
+    print(f"Incremental analysis: {args.docs} articles + {len(TAG_SPLIT_STREAMS)} tag streams, {mismatches} mismatches")
+
+    # analyze_stream over the same tag streams, as chunks and as a file read a few characters at a time
+    mismatches = 0
+    for index, deltas in enumerate(TAG_SPLIT_STREAMS):
+        expected = analyze_content("".join(deltas), requirements)
+        for chunk_size in (3, 7, 16):
+            if analyze_stream(io.StringIO("".join(deltas)), requirements, chunk_size=chunk_size) != expected:
+                mismatches += 1
+                print(f"  mismatch: analyze_stream tag stream {index} chunk_size={chunk_size}")
+        if analyze_stream(iter(deltas), requirements) != expected:
+            mismatches += 1
+            print(f"  mismatch: analyze_stream tag stream {index}")
+    print(f"Streamed analysis: {len(TAG_SPLIT_STREAMS)} tag streams x 4 chunkings, {mismatches} mismatches")
+
+    for words in args.words:
+        requirements = make_requirements()
+        markdown = make_article(requirements, words=words, seed=1)
+        text = normalize_text(markdown)
+        phrases = [requirements.primary_keyword, *requirements.variations, *requirements.lsi_keywords,
+                   *requirements.entities, *requirements.custom_entities]
+        print(f"{words} words, {len(phrases)} phrases")
+        print(f"  regex reference  {_best(lambda: reference_counts(text, phrases), args.repeat) * 1000:8.2f} ms")
+        for backend in backends:
+            matcher = PhraseMatcher(phrases, backend=backend)
+            print(f"  {backend:<16} {_best(lambda: matcher.count(text), args.repeat) * 1000:8.2f} ms")
+        print(f"  analyze_content  {_best(lambda: analyze_content(markdown, requirements), args.repeat) * 1000:8.2f} ms")
+
+        def cold():
+            plan_cache.clear()
+            analyze_content(markdown, requirements)
+
+        print(f"    (plan rebuilt) {_best(cold, args.repeat) * 1000:8.2f} ms")
+        print(f"  incremental/20ch {_best(lambda: _stream(markdown, requirements), args.repeat) * 1000:8.2f} ms")
+
+        legacy_words, legacy_text = legacy_normalize(markdown)
+        identical = _normalize(markdown) == (len(legacy_words), legacy_text)
+        for label, fn in (("normalize before", lambda: legacy_normalize(markdown)),
+                          ("normalize after", lambda: _normalize(markdown))):
+            print(f"  {label:<16} {_best(fn, args.repeat) * 1000:8.2f} ms  peak {_peak_kib(fn):8.1f} KiB")
+        print(f"    (identical words and search text: {identical})")
+
+
+    # Batch analysis: one shared plan, vectorized scoring
+    requirements = make_requirements()
+    documents = [make_article(requirements, words=1500, seed=seed) for seed in range(args.batch)]
+    start = time.perf_counter()
+    batch = analyze_batch(documents, requirements)
+    scores = batch.scores
+    batch_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = [analyze_content(document, requirements)["score"] for document in documents]
+    loop_seconds = time.perf_counter() - start
+    print(f"Batch of {args.batch} x 1500 words: analyze_batch {batch_seconds:.2f} s, "
+          f"analyze_content loop {loop_seconds:.2f} s, scores identical={scores.tolist() == expected}")
+
+
+if __name__ == "__main__":
+    main()
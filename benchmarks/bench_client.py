@@ -0,0 +1,95 @@
+"""Benchmark per-call Anthropic clients against the pooled `ClientRegistry`.
+
+Usage:
+    python -m benchmarks.bench_client [--calls 50] [--handshake-ms 30] [--threads 4]
+
+Both strategies send the same Messages API requests to a local
+`MockAnthropicServer`.  "per-call" builds ``anthropic.Anthropic`` for every
+request, as `call_claude_api` used to; "pooled" leases the client from a
+`ClientRegistry`.  Reported per call: mean and median latency, and how
+many TCP connections (handshakes) the server saw.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import anthropic
+
+from benchmarks.mock_anthropic import MockAnthropicServer
+from utils.client_pool import ClientRegistry
+
+API_KEY = "sk-ant-benchmark"
+REQUEST = {
+    "model": "claude-3-7-sonnet-latest",
+    "max_tokens": 64,
+    "messages": [{"role": "user", "content": "Write one sentence about roof repair."}],
+}
+
+
+def _per_call(base_url: str) -> Callable[[], None]:
+    def call() -> None:
+        client = anthropic.Anthropic(api_key=API_KEY, base_url=base_url, max_retries=0)
+        try:
+            client.messages.create(**REQUEST)
+        finally:
+            client.close()
+    return call
+
+
+def _pooled(registry: ClientRegistry) -> Callable[[], None]:
+    def call() -> None:
+        with registry.lease(API_KEY) as client:
+            client.messages.create(**REQUEST)
+    return call
+
+
+def _timed(call: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def run(label: str, call: Callable[[], None], server: MockAnthropicServer, calls: int, threads: int) -> float:
+    call()  # warm-up (imports, first connection)
+    server.reset_counts()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies: List[float] = list(pool.map(lambda _: _timed(call), range(calls)))
+    else:
+        latencies = [_timed(call) for _ in range(calls)]
+    mean = statistics.mean(latencies)
+    print(
+        f"  {label:<9} mean {mean * 1000:7.2f} ms  median {statistics.median(latencies) * 1000:7.2f} ms  "
+        f"connections {server.connections:>4} / {server.requests} requests"
+    )
+    return mean
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="simulated TCP+TLS setup per connection")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated server time per request")
+    parser.add_argument("--threads", type=int, default=1, help="concurrent callers (Streamlit sessions)")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore", DeprecationWarning)  # model deprecation notices
+
+    with MockAnthropicServer(handshake_ms=args.handshake_ms, latency_ms=args.latency_ms) as server:
+        print(f"{args.calls} calls, {args.threads} thread(s), handshake {args.handshake_ms:g} ms, "
+              f"server latency {args.latency_ms:g} ms")
+        per_call = run("per-call", _per_call(server.base_url), server, args.calls, args.threads)
+        registry = ClientRegistry(base_url=server.base_url, max_retries=0)
+        pooled = run("pooled", _pooled(registry), server, args.calls, args.threads)
+        registry.close_all()
+        print(f"  saved    {(per_call - pooled) * 1000:7.2f} ms per call ({per_call / pooled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Benchmark `parse_cora_report` engines on synthetic and real CORA workbooks.
+
+Usage:
+    python -m benchmarks.bench_parser --fixtures small medium huge
+    python -m benchmarks.bench_parser report1.xlsx report2.xlsx --repeat 5
+
+Every (workbook, mode) pair runs in a fresh worker process, so the peak
+RSS of one run cannot leak into the next.  For each pair the best wall
+time, the tracemalloc peak and the process peak RSS are recorded, and the
+parsed result is compared with the full openpyxl load so a speedup never
+hides a behavioural difference.  Results are printed and written as JSON
+(``--output``) for regression tracking.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from benchmarks.synthetic_cora import SCALES, write_synthetic_report
+
+MODES: Dict[str, Dict[str, Any]] = {
+    "full": {"read_only": False},
+    "read_only": {"read_only": True},
+    "xml": {"engine": "xml"},
+}
+
+DEFAULT_FIXTURE_DIR = os.path.join("benchmarks", "fixtures")
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "parser.json")
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_mode(path: str, options: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Worker entry point: time, trace and fingerprint one parse mode."""
+    # Keep parser logs out of the report
+    logging.disable(logging.WARNING)
+    from seo_parser import parse_cora_report
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_cora_report(path, **options)
+        best = min(best, time.perf_counter() - start)
+    peak_rss = _peak_rss_bytes()
+
+    tracemalloc.start()
+    result = parse_cora_report(path, **options)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    digest = hashlib.sha256(pickle.dumps(result.to_dict())).hexdigest()
+    return {"seconds": best, "tracemalloc_peak_bytes": traced_peak, "peak_rss_bytes": peak_rss, "digest": digest}
+
+
+def measure(path: str, options: Dict[str, Any], repeat: int = 3) -> Dict[str, Any]:
+    """Run one mode in an isolated process and return its measurements."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_mode, path, options, repeat).result()
+
+
+def ensure_fixtures(names: List[str], directory: str) -> Dict[str, str]:
+    """Generate any missing synthetic fixtures and return name → path."""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name in names:
+        path = os.path.join(directory, f"synthetic_{name}.xlsx")
+        if not os.path.exists(path):
+            print(f"Generating {name} fixture -> {path}")
+            write_synthetic_report(path, SCALES[name])
+        paths[name] = path
+    return paths
+
+
+def run_suite(workbooks: Dict[str, str], repeat: int) -> List[Dict[str, Any]]:
+    rows = []
+    for label, path in workbooks.items():
+        runs = {mode: measure(path, options, repeat) for mode, options in MODES.items()}
+        baseline = runs["full"]
+        print(f"{label} ({os.path.getsize(path) / 1e6:.1f} MB)")
+        for mode, run in runs.items():
+            identical = run["digest"] == baseline["digest"]
+            speedup = baseline["seconds"] / run["seconds"] if run["seconds"] else float("inf")
+            rss = f"{run['peak_rss_bytes'] / 1e6:8.1f} MB" if run["peak_rss_bytes"] else "     n/a   "
+            print(
+                f"  {mode:<10} {run['seconds'] * 1000:9.1f} ms  x{speedup:5.2f}  "
+                f"traced {run['tracemalloc_peak_bytes'] / 1e6:8.1f} MB  rss {rss}  identical={identical}"
+            )
+            rows.append({
+                "workbook": label,
+                "path": path,
+                "bytes": os.path.getsize(path),
+                "mode": mode,
+                "options": MODES[mode],
+                "seconds": round(run["seconds"], 6),
+                "tracemalloc_peak_bytes": run["tracemalloc_peak_bytes"],
+                "peak_rss_bytes": run["peak_rss_bytes"],
+                "identical_to_full": identical,
+            })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CORA parser engines.")
+    parser.add_argument("workbooks", nargs="*", help="real CORA .xlsx files to include")
+    parser.add_argument("--fixtures", nargs="*", choices=sorted(SCALES), default=None,
+                        help="synthetic fixture sizes (default: all when no workbooks are given)")
+    parser.add_argument("--fixtures-dir", default=DEFAULT_FIXTURE_DIR, help="where synthetic fixtures are cached")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per mode")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results path")
+    args = parser.parse_args(argv)
+
+    fixtures = args.fixtures if args.fixtures is not None else ([] if args.workbooks else ["small", "medium", "huge"])
+    workbooks = ensure_fixtures(fixtures, args.fixtures_dir)
+    workbooks.update({path: path for path in args.workbooks})
+
+    rows = run_suite(workbooks, args.repeat)
+
+    report = {
+        "benchmark": "parse_cora_report",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": rows,
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Wrote {len(rows)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Local stand-in for the Anthropic Messages API, for client benchmarks.
+
+`MockAnthropicServer` answers ``POST /v1/messages`` with a fixed assistant
+message over HTTP/1.1 keep-alive, as JSON or, for ``"stream": true``
+requests, as server-sent events (with a thinking block when the request
+enables extended thinking).  System blocks up to the last ``cache_control``
+breakpoint are treated like the API's prompt cache: the first request with
+a given prefix reports it as ``cache_creation_input_tokens``, later ones as
+``cache_read_input_tokens``.  Each new TCP connection waits
+*handshake_ms* before it is served, modelling the TCP + TLS round trips a
+fresh connection to the real API costs; *latency_ms* is added to every
+request.  Connections and requests are counted so benchmarks can show how
+many handshakes a client actually paid for.
+
+Usage:
+    with MockAnthropicServer(handshake_ms=30) as server:
+        client = anthropic.Anthropic(api_key="test", base_url=server.base_url)
+"""
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def _split_cached_prefix(request: Dict[str, Any]) -> Tuple[str, str]:
+    """(cached prefix, rest) of the system prompt, split at the last cache breakpoint."""
+    system = request.get("system", "")
+    if isinstance(system, str):
+        return "", system
+    marked = [i for i, block in enumerate(system) if block.get("cache_control")]
+    cut = marked[-1] + 1 if marked else 0
+    return json.dumps(system[:cut]) if cut else "", json.dumps(system[cut:])
+
+
+def message_body(request: Dict[str, Any], text: str, prompt_cache: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Non-streaming Messages API response for *request*.
+
+    *prompt_cache* holds the cached prefixes seen so far and is updated.
+    """
+    prefix, rest = _split_cached_prefix(request)
+    prompt_chars = len(json.dumps(request.get("messages", []))) + len(rest)
+    usage = {"input_tokens": prompt_chars // 4, "output_tokens": max(1, len(text) // 4)}
+    if prefix:
+        hit = prompt_cache is not None and prefix in prompt_cache
+        usage["cache_creation_input_tokens"] = 0 if hit else len(prefix) // 4
+        usage["cache_read_input_tokens"] = len(prefix) // 4 if hit else 0
+        if prompt_cache is not None:
+            prompt_cache.add(prefix)
+    return {
+        "id": "msg_mock",
+        "type": "message",
+        "role": "assistant",
+        "model": request.get("model", "mock"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": usage,
+    }
+
+
+def _chunks(text: str, size: int = 16) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def stream_events(request: Dict[str, Any], text: str, prompt_cache: Optional[Set[str]] = None) -> bytes:
+    """Server-sent events of a streamed response to *request*, text split into small deltas."""
+    message = message_body(request, text, prompt_cache)
+    usage = message.pop("usage")
+    message.update(content=[], stop_reason=None, usage=dict(usage, output_tokens=1))
+    events: List[Dict[str, Any]] = [{"type": "message_start", "message": message}]
+    blocks = []
+    if (request.get("thinking") or {}).get("type") == "enabled":
+        blocks.append(("thinking", f"Planning: {text[:48]}"))
+    blocks.append(("text", text))
+    for index, (kind, content) in enumerate(blocks):
+        events.append({"type": "content_block_start", "index": index,
+                       "content_block": {"type": kind, kind: "", **({"signature": ""} if kind == "thinking" else {})}})
+        for piece in _chunks(content):
+            events.append({"type": "content_block_delta", "index": index,
+                           "delta": {"type": f"{kind}_delta", kind: piece}})
+        if kind == "thinking":
+            events.append({"type": "content_block_delta", "index": index,
+                           "delta": {"type": "signature_delta", "signature": "mock"}})
+        events.append({"type": "content_block_stop", "index": index})
+    events.append({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                   "usage": {"output_tokens": usage["output_tokens"]}})
+    events.append({"type": "message_stop"})
+    return "".join(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in events).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body go out as separate writes; without NODELAY, Nagle
+        # plus delayed ACKs would add ~40 ms to every keep-alive response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.mock.connections += 1
+        time.sleep(self.server.mock.handshake_ms / 1000)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - keep the output quiet
+        pass
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        mock = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        mock.requests += 1
+        time.sleep(mock.latency_ms / 1000)
+        if request.get("stream"):
+            payload, content_type = stream_events(request, mock.text, mock.prompt_cache), "text/event-stream"
+        else:
+            body = message_body(request, mock.text, mock.prompt_cache)
+            payload, content_type = json.dumps(body).encode("utf-8"), "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockAnthropicServer"
+
+
+class MockAnthropicServer:
+    """Threaded mock API server on an ephemeral localhost port."""
+
+    def __init__(self, handshake_ms: float = 30.0, latency_ms: float = 0.0, text: str = "Mock response."):
+        self.handshake_ms = handshake_ms
+        self.latency_ms = latency_ms
+        self.text = text
+        self.connections = 0
+        self.requests = 0
+        self.prompt_cache: Set[str] = set()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.mock = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockAnthropicServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self) -> None:
+        self.connections = 0
+        self.requests = 0
+
+    def __enter__(self) -> "MockAnthropicServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,88 @@
+"""Generate synthetic markdown articles and matching requirements.
+
+Articles look like generated SEO content: an H1, H2/H3 sections with
+short paragraphs, lists, tables, images, links and inline HTML, sprinkled
+with the primary keyword, variations, LSI keywords and entities (including
+overlapping phrases such as "roof" / "roof repair").  Used by the analysis
+benchmarks and regression checks.
+"""
+from __future__ import annotations
+
+import random
+from typing import List
+
+from models import SEORequirements
+
+PRIMARY_KEYWORD = "roof repair"
+VARIATIONS = ["roof repair garden grove", "roofing repair", "repair roof", "roof fix"]
+_BASE_WORDS = (
+    "the a of and to in for with on our your we you is are can will local team service homeowners "
+    "shingle leak flashing gutter metal tile warranty estimate inspection storm damage insurance "
+    "attic ventilation underlayment commercial residential licensed emergency cost price install "
+    "quality fast reliable trusted experienced affordable season weather rain wind sun years"
+).split()
+_ENTITY_WORDS = ["Garden Grove", "Orange County", "California", "GAF", "Owens Corning", "OSHA", "BBB"]
+
+
+def make_requirements(lsi_count: int = 120, entity_count: int = 40, seed: int = 0) -> SEORequirements:
+    """Return requirements with overlapping LSI/entity phrases."""
+    r = random.Random(seed)
+    lsi = {"roof": 5, "roof replacement": 2, "roof replacement garden grove": 1, "repair": 4}
+    while len(lsi) < lsi_count:
+        words = r.sample(_BASE_WORDS[15:], r.randint(1, 3))
+        lsi[" ".join(words)] = r.randint(1, 6)
+    entities = list(_ENTITY_WORDS)
+    while len(entities) < entity_count:
+        entities.append(" ".join(w.capitalize() for w in r.sample(_BASE_WORDS[15:], r.randint(1, 2))))
+    return SEORequirements(
+        primary_keyword=PRIMARY_KEYWORD,
+        variations=list(VARIATIONS),
+        lsi_keywords=lsi,
+        entities=entities[:entity_count // 2],
+        custom_entities=entities[entity_count // 2:],
+        word_count=1500,
+        images=3,
+        basic_tunings={"Number of Images": 3, "Word Count": 1500},
+    )
+
+
+def _sentence(r: random.Random, phrases: List[str]) -> str:
+    words = [r.choice(_BASE_WORDS) for _ in range(r.randint(6, 18))]
+    for _ in range(r.randint(0, 2)):
+        words.insert(r.randrange(len(words) + 1), r.choice(phrases))
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + r.choice([".", ".", "!", "?"])
+
+
+def make_article(requirements: SEORequirements, words: int = 2000, seed: int = 0) -> str:
+    """Return a markdown article of roughly *words* words."""
+    r = random.Random(seed)
+    phrases = [requirements.primary_keyword, *requirements.variations, *requirements.lsi_keywords,
+               *requirements.entities, *requirements.custom_entities]
+    lines = [f"# {requirements.primary_keyword.title()} Services", ""]
+    count = 0
+    section = 0
+    while count < words:
+        section += 1
+        level = "##" if section % 3 else "###"
+        lines += [f"{level} {r.choice(phrases).title()} and {r.choice(_BASE_WORDS)} tips", ""]
+        kind = r.random()
+        if kind < 0.15:
+            for _ in range(r.randint(3, 6)):
+                lines.append(f"- {_sentence(r, phrases)}")
+        elif kind < 0.25:
+            lines += ["| Service | Cost | Notes |", "|---|---|---|"]
+            for _ in range(r.randint(2, 5)):
+                lines.append(f"| {r.choice(phrases)} | ${r.randint(100, 9000)} | {r.choice(_BASE_WORDS)} |")
+        elif kind < 0.35:
+            lines.append(f"![{r.choice(phrases)}](images/{r.choice(_BASE_WORDS)}-{section}.jpg)")
+        else:
+            paragraph = " ".join(_sentence(r, phrases) for _ in range(r.randint(1, 4)))
+            if r.random() < 0.2:
+                paragraph += f" See <a href=\"https://example.com/{section}\">our {r.choice(phrases)} page</a>."
+            if r.random() < 0.1:
+                paragraph += f" Visit https://example.com/{r.choice(_BASE_WORDS)}-{section} for *details*."
+            lines.append(paragraph)
+        lines.append("")
+        count = sum(len(line.split()) for line in lines)
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+"""Generate synthetic CORA workbooks for parser benchmarking.
+
+The layout mirrors a real CORA export closely enough to exercise every
+code path in `seo_parser.parse_cora_report`:
+
+* ``Roadmap`` – variations in A2 and several "Phase N" blocks of
+  requirement rows with the usual amount phrasings
+* ``Basic Tunings`` – primary keyword in B1 and a table of tuning codes
+  (the codes the parser reads plus many it ignores)
+* ``LSI Keywords`` – header block, then keyword rows from row 7 with the
+  average in B and the target in G
+* ``Entities`` / ``Custom Entities`` – one entity per row
+* filler tabs that the parser never reads, as found in production exports
+
+Usage:
+    python -m benchmarks.synthetic_cora out.xlsx --scale medium
+"""
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from typing import Dict
+
+import openpyxl
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Row counts for one synthetic report size."""
+
+    phases: int
+    rows_per_phase: int
+    tuning_rows: int
+    lsi_rows: int
+    entity_rows: int
+    filler_sheets: int
+    filler_rows: int
+
+
+SCALES: Dict[str, Scale] = {
+    "small": Scale(phases=4, rows_per_phase=8, tuning_rows=60, lsi_rows=300, entity_rows=80,
+                   filler_sheets=2, filler_rows=200),
+    "medium": Scale(phases=8, rows_per_phase=15, tuning_rows=250, lsi_rows=5_000, entity_rows=1_500,
+                    filler_sheets=4, filler_rows=5_000),
+    "huge": Scale(phases=10, rows_per_phase=25, tuning_rows=600, lsi_rows=60_000, entity_rows=15_000,
+                  filler_sheets=6, filler_rows=40_000),
+}
+
+TUNING_CODES = {
+    "CP492": ("Word Count", lambda r: r.randint(800, 4000)),
+    "CPXR003": ("Number of heading tags", lambda r: r.randint(5, 40)),
+    "CPXR004": ("Number of H1 tags", lambda r: 1),
+    "CPXR005": ("Number of H2 tags", lambda r: r.randint(2, 12)),
+    "CPXR006": ("Number of H3 tags", lambda r: r.randint(0, 20)),
+    "CPXR007": ("Number of H4 tags", lambda r: r.randint(0, 6)),
+    "CPXR008": ("Number of H5 tags", lambda r: r.randint(0, 3)),
+    "CPXR009": ("Number of H6 tags", lambda r: r.randint(0, 2)),
+    "CP426": ("Number of Images", lambda r: r.randint(0, 15)),
+    "CP480": ("Title Length", lambda r: r.randint(40, 70)),
+    "CP380": ("Description Length", lambda r: r.randint(120, 170)),
+}
+
+_WORDS = (
+    "roof repair replacement shingle contractor garden grove leak flashing gutter metal tile "
+    "warranty estimate inspection storm damage insurance claim attic ventilation underlayment "
+    "commercial residential local licensed emergency cost price install new old county city"
+).split()
+
+
+def _phrase(r: random.Random, low: int = 1, high: int = 4) -> str:
+    return " ".join(r.choice(_WORDS) for _ in range(r.randint(low, high)))
+
+
+def _amount(r: random.Random) -> str:
+    n = r.randint(1, 30)
+    return r.choice([f"Add {n} more", f"Target: {n}", f"Currently {r.randint(0, 9)} of {n}", str(n), "n/a"])
+
+
+def write_synthetic_report(path: str, scale: Scale, seed: int = 0, primary_keyword: str = "roof repair") -> str:
+    """Write a synthetic CORA workbook of the given *scale* to *path*."""
+    r = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+
+    roadmap = wb.create_sheet("Roadmap")
+    roadmap.append(["Keyword variations"])
+    roadmap.append([", ".join(f'"{_phrase(r, 2, 3)}"' for _ in range(6))])
+    roadmap.append([])
+    for phase in range(1, scale.phases + 1):
+        roadmap.append([f"Phase {phase}: {_phrase(r, 2, 3).title()}"])
+        for _ in range(scale.rows_per_phase):
+            roadmap.append([f"{_phrase(r, 2, 5).capitalize()} count", _amount(r)])
+    roadmap.append(["Generated by synthetic_cora"])
+
+    tunings = wb.create_sheet("Basic Tunings")
+    tunings.append(["Keyword", primary_keyword])
+    tunings.append(["Factor", "Code", "Current", "Competitors", "Goal"])
+    for code, (label, value) in TUNING_CODES.items():
+        tunings.append([label, code, r.randint(0, 10), r.randint(0, 50), value(r)])
+    for i in range(scale.tuning_rows):
+        tunings.append([f"Factor {_phrase(r, 1, 3)}", f"CPX{i:04d}", r.random(), r.random() * 10, r.randint(0, 100)])
+
+    lsi = wb.create_sheet("LSI Keywords")
+    for header in ("LSI Keywords", f"Keyword: {primary_keyword}", "", "", ""):
+        lsi.append([header])
+    lsi.append(["Keyword", "Avg", "Max", "Min", "Page 1", "Current", "Goal"])
+    for i in range(scale.lsi_rows):
+        avg = round(r.uniform(0.05, 6.0), 3)
+        lsi.append([f"{_phrase(r, 1, 3)} {i}", avg, avg * 2, 0, r.randint(0, 10), r.randint(0, 5),
+                    round(r.uniform(0, 8), 2) if r.random() > 0.1 else None])
+
+    entities = wb.create_sheet("Entities")
+    entities.append(["Entities"])
+    entities.append([f"Keyword: {primary_keyword}"])
+    entities.append(["Entity", "Type", "Relevance"])
+    for i in range(scale.entity_rows):
+        entities.append([f"{_phrase(r, 1, 3).title()} {i}", r.choice(["Place", "Thing", "Organization"]),
+                         round(r.random(), 3)])
+
+    custom = wb.create_sheet("Custom Entities")
+    custom.append(["Custom Entity"])
+    for i in range(max(1, scale.entity_rows // 20)):
+        custom.append([f"{_phrase(r, 1, 2).title()} Custom {i}"])
+
+    for n in range(scale.filler_sheets):
+        filler = wb.create_sheet(f"Competitor Data {n + 1}")
+        filler.append(["URL", "Title", "Words", "Score", "Notes"])
+        for i in range(scale.filler_rows):
+            filler.append([f"https://example{n}.com/page/{i}", _phrase(r, 3, 8).title(), r.randint(100, 5000),
+                           r.random(), _phrase(r, 5, 12)])
+
+    wb.save(path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic CORA report.")
+    parser.add_argument("path", help="output .xlsx path")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_synthetic_report(args.path, SCALES[args.scale], seed=args.seed)
+    print(f"Wrote {args.scale} synthetic report to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Headless bulk article generation from parsed CORA reports.
+
+Takes the JSONL written by `bulk_parse` and runs every report through
+headings → content → analysis on one asyncio event loop::
+
+    python bulk_parse.py reports/ -o parsed.jsonl
+    python bulk_generate.py parsed.jsonl -o articles.jsonl --concurrency 8 \\
+        --rpm 50 --itpm 40000 --otpm 80000
+
+At most *concurrency* jobs are in flight, and every API call first takes
+its share of the requests / input tokens / output tokens per-minute quota
+from a shared `RateLimiter`, so wall time is bounded by the API quota
+rather than by running reports one after another.
+
+One JSON line is written per report as soon as it finishes (completion
+order; ``index`` is the position in the input).  Each line is either
+``{"index": ..., "name": ..., "ok": true, "meta_title": ..., "markdown":
+..., "score": ..., "token_usage": {...}, "timings": {...}}`` or ``{...,
+"ok": false, "error": "..."}``; one failed job never aborts the batch.
+``timings`` holds seconds spent queued for a slot and in each step.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from analysis import analyze_content
+from content_generator import generate_content_from_headings_async, generate_meta_and_headings_async
+from utils.client_pool import async_client_registry
+from utils.logger import get_logger
+from utils.rate_limit import RateLimiter
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class BulkGenerateSummary:
+    """Outcome of a `bulk_generate` run."""
+
+    jobs: int
+    failed: int
+    seconds: float
+    concurrency: int
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    rate_limit_wait: float
+    output_path: str
+
+    @property
+    def jobs_per_hour(self) -> float:
+        return self.jobs / self.seconds * 3600 if self.seconds > 0 else 0.0
+
+
+def load_jobs(path: str) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+    """Read `bulk_parse` JSONL; return ``(name, requirements)`` jobs and the number of failed parses skipped."""
+    jobs: List[Tuple[str, Dict[str, Any]]] = []
+    skipped = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not record.get("ok", True):
+                skipped += 1
+                continue
+            requirements = record.get("requirements", record)
+            jobs.append((record.get("file") or requirements.get("primary_keyword", ""), requirements))
+    return jobs, skipped
+
+
+def _add_usage(total: Dict[str, int], usage: Optional[Dict[str, int]]) -> None:
+    for key, value in (usage or {}).items():
+        total[key] = total.get(key, 0) + value
+
+
+async def generate_one(
+    index: int,
+    name: str,
+    requirements: Dict[str, Any],
+    settings: Dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    rate_limiter: Optional[RateLimiter] = None,
+    business_data: str = "",
+) -> Dict[str, Any]:
+    """Headings, content and analysis for one report; failures are returned as an ``ok: false`` record."""
+    queued = time.perf_counter()
+    async with semaphore:
+        start = time.perf_counter()
+        timings = {"queued": start - queued}
+        record: Dict[str, Any] = {"index": index, "name": name}
+        try:
+            meta_and_headings = await generate_meta_and_headings_async(
+                requirements, settings, business_data, rate_limiter=rate_limiter
+            )
+            step = time.perf_counter()
+            timings["headings"] = step - start
+
+            article = await generate_content_from_headings_async(
+                requirements, meta_and_headings, settings, business_data, rate_limiter=rate_limiter
+            )
+            timings["content"] = time.perf_counter() - step
+            step = time.perf_counter()
+
+            # Analysis is CPU work; keep the loop free for the streams still running
+            analysis = await asyncio.to_thread(analyze_content, article["markdown"], requirements)
+            timings["analysis"] = time.perf_counter() - step
+
+            token_usage: Dict[str, int] = {}
+            _add_usage(token_usage, meta_and_headings.get("token_usage"))
+            _add_usage(token_usage, {k: v for k, v in article["token_usage"].items() if k != "total_tokens"})
+            record.update(
+                ok=True,
+                primary_keyword=requirements.get("primary_keyword", ""),
+                meta_title=meta_and_headings["meta_title"],
+                meta_description=meta_and_headings["meta_description"],
+                headings=meta_and_headings["headings"],
+                markdown=article["markdown"],
+                filename=article["filename"],
+                score=analysis["score"],
+                token_usage=token_usage,
+            )
+        except Exception as e:
+            logger.warning("Generation failed for %s: %s", name, e)
+            record.update(ok=False, error=str(e))
+        timings["total"] = time.perf_counter() - start
+        record["timings"] = {step_name: round(seconds, 3) for step_name, seconds in timings.items()}
+        return record
+
+
+async def generate_batch(
+    jobs: Iterable[Tuple[str, Dict[str, Any]]],
+    settings: Dict[str, Any],
+    concurrency: int = 4,
+    rate_limiter: Optional[RateLimiter] = None,
+    business_data: str = "",
+    on_result=None,
+) -> List[Dict[str, Any]]:
+    """
+    Run every ``(name, requirements)`` job concurrently on the running event loop.
+
+    Args:
+        jobs: Job names (usually report paths) and requirements dictionaries
+        settings: Generation settings, as in the app (API key, tables/lists/images flags)
+        concurrency: Jobs in flight at once
+        rate_limiter: Shared quota for every API call of the batch
+        business_data: Business info passed to every prompt
+        on_result: Called with each record as soon as its job finishes
+
+    Returns:
+        list: Records in input order
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = [
+        asyncio.create_task(generate_one(index, name, requirements, settings, semaphore, rate_limiter, business_data))
+        for index, (name, requirements) in enumerate(jobs)
+    ]
+    records: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    try:
+        for finished in asyncio.as_completed(tasks):
+            record = await finished
+            records[record["index"]] = record
+            if on_result is not None:
+                on_result(record)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await async_client_registry.close_all()
+    return records
+
+
+def bulk_generate(
+    jobs: Iterable[Tuple[str, Dict[str, Any]]],
+    output_path: str,
+    settings: Dict[str, Any],
+    concurrency: int = 4,
+    requests_per_minute: Optional[float] = 50,
+    input_tokens_per_minute: Optional[float] = None,
+    output_tokens_per_minute: Optional[float] = None,
+    business_data: str = "",
+) -> BulkGenerateSummary:
+    """Generate every job on a fresh event loop and stream JSONL records to *output_path*.
+
+    Per-minute limits of ``None`` are not enforced.
+    """
+    jobs = list(jobs)
+    limiter = RateLimiter(requests_per_minute, input_tokens_per_minute, output_tokens_per_minute)
+    failed = 0
+    usage: Dict[str, int] = {}
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        def write(record: Dict[str, Any]) -> None:
+            nonlocal failed
+            if record["ok"]:
+                _add_usage(usage, record["token_usage"])
+            else:
+                failed += 1
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+
+        asyncio.run(generate_batch(jobs, settings, concurrency, limiter, business_data, on_result=write))
+    seconds = time.perf_counter() - start
+
+    summary = BulkGenerateSummary(
+        jobs=len(jobs), failed=failed, seconds=seconds, concurrency=concurrency,
+        input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0),
+        cache_read_tokens=usage.get("cache_read_input_tokens", 0),
+        cache_write_tokens=usage.get("cache_creation_input_tokens", 0),
+        rate_limit_wait=limiter.waited, output_path=output_path,
+    )
+    logger.info(
+        "Generated %d articles (%d failed) in %.1fs with concurrency %d: %.1f jobs/hour",
+        summary.jobs, summary.failed, summary.seconds, summary.concurrency, summary.jobs_per_hour,
+    )
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate articles for parsed CORA reports.")
+    parser.add_argument("source", help="JSONL written by bulk_parse.py")
+    parser.add_argument("-o", "--output", default="generated_articles.jsonl", help="JSONL output path")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="jobs in flight at once")
+    parser.add_argument("--rpm", type=float, default=50, help="requests per minute (0 = unlimited)")
+    parser.add_argument("--itpm", type=float, default=0, help="input tokens per minute (0 = unlimited)")
+    parser.add_argument("--otpm", type=float, default=0, help="output tokens per minute (0 = unlimited)")
+    parser.add_argument("--api-key", default=os.environ.get("ANTHROPIC_API_KEY", ""),
+                        help="Anthropic API key (default: $ANTHROPIC_API_KEY)")
+    parser.add_argument("--tables", action="store_true", help="ask for comparison tables")
+    parser.add_argument("--lists", action="store_true", help="ask for bullet and numbered lists")
+    parser.add_argument("--images", action="store_true", help="ask for image placeholders under each H2")
+    parser.add_argument("--business-data", default="", help="business info added to every prompt")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="call the API even for requests in the response cache (fresh results are still stored)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("An Anthropic API key is required (--api-key or ANTHROPIC_API_KEY)")
+    jobs, skipped = load_jobs(args.source)
+    if not jobs:
+        parser.error(f"No parsed reports found in {args.source!r}")
+    settings = {
+        "model": "claude",
+        "anthropic_api_key": args.api_key,
+        "generate_tables": args.tables,
+        "generate_lists": args.lists,
+        "generate_images": args.images,
+        "bypass_response_cache": args.no_cache,
+    }
+    summary = bulk_generate(
+        jobs, args.output, settings, concurrency=args.concurrency,
+        requests_per_minute=args.rpm or None,
+        input_tokens_per_minute=args.itpm or None,
+        output_tokens_per_minute=args.otpm or None,
+        business_data=args.business_data,
+    )
+    print(
+        f"{summary.jobs} jobs, {summary.failed} failed, {skipped} unparsed reports skipped, {summary.seconds:.1f}s "
+        f"({summary.jobs_per_hour:.0f} jobs/hour, concurrency {summary.concurrency}), "
+        f"{summary.input_tokens} input / {summary.output_tokens} output tokens "
+        f"(prompt cache: {summary.cache_read_tokens} read, {summary.cache_write_tokens} written), "
+        f"{summary.rate_limit_wait:.1f}s waiting for quota (summed over calls) -> {summary.output_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Headless bulk parsing of CORA reports.
+
+Parses every report found in a directory or glob across a process pool
+and streams one JSON line per report, in input order::
+
+    python bulk_parse.py reports/ -o parsed.jsonl --workers 8
+    python bulk_parse.py "reports/**/*.xlsx" -o parsed.jsonl
+
+Each line is either ``{"file": ..., "ok": true, "requirements": {...}}``
+(the `SEORequirements.to_dict()` record) or ``{"file": ..., "ok": false,
+"error": "..."}`` when that report failed to parse; one bad workbook never
+aborts the batch.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from seo_parser import ENGINES, parse_cora_report, parse_cora_report_cached
+from utils.errors import ParseError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_EXTENSIONS = (".xlsx",)
+
+
+@dataclass
+class BulkParseSummary:
+    """Outcome of a `bulk_parse` run."""
+
+    files: int
+    failed: int
+    seconds: float
+    workers: int
+    output_path: str
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+
+def discover_reports(source: str) -> List[str]:
+    """Return the sorted report paths under a directory, or matching a glob."""
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(source)
+            for name in names
+            if name.lower().endswith(REPORT_EXTENSIONS)
+        ]
+    else:
+        paths = [p for p in glob.glob(source, recursive=True) if os.path.isfile(p)]
+    # Skip Excel lock files ("~$report.xlsx") left behind by open workbooks
+    return sorted(p for p in paths if not os.path.basename(p).startswith("~$"))
+
+
+def _parse_one(job) -> Dict[str, Any]:
+    """Parse a single report in a worker process, capturing parse failures."""
+    path, cached, options = job
+    parse = parse_cora_report_cached if cached else parse_cora_report
+    try:
+        requirements = parse(path, **options)
+    except ParseError as e:
+        return {"file": path, "ok": False, "error": str(e)}
+    return {"file": path, "ok": True, "requirements": requirements.to_dict()}
+
+
+def bulk_parse(
+    paths: Iterable[str],
+    output_path: str,
+    workers: Optional[int] = None,
+    cached: bool = False,
+    **options: Any,
+) -> BulkParseSummary:
+    """Parse *paths* over a process pool and stream JSONL records to *output_path*.
+
+    Results are written in input order as soon as each one (and all earlier
+    ones) is ready.  *options* are passed to `parse_cora_report`; with
+    ``cached=True`` the content-hash parse cache is consulted first.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    jobs = [(path, cached, options) for path in paths]
+    # Batch small jobs so per-task IPC does not dominate on large queues
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    failed = 0
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        if workers == 1:
+            results = map(_parse_one, jobs)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_parse_one, jobs, chunksize=chunksize)
+        try:
+            for record in results:
+                if not record["ok"]:
+                    failed += 1
+                    logger.warning("Failed to parse %s: %s", record["file"], record["error"])
+                out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    seconds = time.perf_counter() - start
+
+    summary = BulkParseSummary(
+        files=len(paths), failed=failed, seconds=seconds, workers=workers, output_path=output_path
+    )
+    logger.info(
+        "Parsed %d reports (%d failed) in %.2fs with %d workers: %.1f files/sec",
+        summary.files, summary.failed, summary.seconds, summary.workers, summary.files_per_sec,
+    )
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk-parse CORA reports to JSONL.")
+    parser.add_argument("source", help="directory (searched recursively) or glob of .xlsx reports")
+    parser.add_argument("-o", "--output", default="parsed_reports.jsonl", help="JSONL output path")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cached", action="store_true", help="reuse/populate the content-hash parse cache")
+    parser.add_argument("--engine", choices=ENGINES, default="openpyxl", help="workbook reader engine")
+    args = parser.parse_args(argv)
+
+    paths = discover_reports(args.source)
+    if not paths:
+        parser.error(f"No reports found for {args.source!r}")
+    summary = bulk_parse(paths, args.output, workers=args.workers, cached=args.cached, engine=args.engine)
+    print(
+        f"{summary.files} files, {summary.failed} failed, {summary.seconds:.2f}s, "
+        f"{summary.files_per_sec:.1f} files/sec ({summary.workers} workers) -> {summary.output_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
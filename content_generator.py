@@ -1,7 +1,12 @@
-import anthropic
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
 from models import SEORequirements
 from utils.logger import get_logger
+from utils.markdown_scan import scan_markdown
+from utils.client_pool import async_client_registry, client_registry
 from utils.errors import GenerationError, ValidationError, expect
+from utils.rate_limit import RateLimiter, estimate_tokens
+from utils.response_cache import response_cache
 import re
  
 # logger setup
@@ -10,16 +15,175 @@ logger = get_logger(__name__)
 # Constants for model selection
 CLAUDE_MODEL = "claude-3-7-sonnet-latest"
 
-def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=False, stream=False, stream_callback=None):
+HEADING_SYSTEM_PROMPT = """
+You are a professional SEO content strategist and copywriter. Your job is to create optimized content strategies that rank well in search engines. Your task is to generate a user friendly heading outline utilizing the headings as specified and required by the user.
+You have a strong understanding of SEO best practices, entity based SEO and semantic SEO. You write content that ranks well in search engine results. You are also an expert in content writing and can write content that is engaging and informative. You understand the needs of the client and their desired and strict requirements. You will not deviate from the requirements. You are capable of following the requirements strictly. You are creative and capable of delivering content that stays topically and semantically relevent to the specific page. You use specific token limits for titles and descriptions.
+"""
+
+HEADING_INSTRUCTIONS = """
+<step 1>
+Using the information and requirements provided tackle the SEO-optimized content. First, establish the key elements required:
+- Title Tag:
+- Meta Description:
+- Headings Tags:
+Please follow these guidelines for content structure:
+1. Title: Include at least one instance of the main keyword and Exclusively use the title token limit from <length and heading targets> to generate the title, which should be around the title length given there.
+2. Meta Description: Exclusively use the description token limit from <length and heading targets> to generate the meta description, which should be around the description length given there.
+3. Avoid Redundancy
+3A. Definition: Prevent the repetition of identical factual information, phrasing, or ideas across different sections unless necessary for context or emphasis.
+3B. Guidelines:
+3B1. Each section should introduce new information or a fresh perspective.
+3B2. Avoid reusing the same sentences or key points under different headings.
+3B3. If overlap occurs, merge sections or reframe the content to add distinct value.
+3C. Example:
+3C1. Redundant: Two sections both state, '[Topic] is beneficial.'
+3C2. Fixed: One section defines '[Topic]', while another explains another aspect of '[Topic]'.
+4. Include an FAQ if the topic involves common user questions or multiple subtopics. FAQ Section should be an H2. The Questions must each be an H3.
+5. Merge variations into single headings when possible (as long as it makes sense for readability, SEO and adheres with the heading requirements).
+6. IMPORTANT: Ensure and Confirm each step in the Step 1 list is met.
+</step 1>
+
+<step 2>
+1. Create a heading structure with the heading counts per level (H1 to H6) given in <length and heading targets>. No Less. Do your best to fit all the requirements within those heading counts. You can fit multiple entities or requirements in a single heading without stuffing it, each heading should be user-friendly. 
+   - Do not create additional H1s, H2s, H3s, H4s, H5s or H6s beyond those counts unless absolutely necessary - IMPORTANT
+
+2. The headings should:
+   - Contain the primary keyword and/or variations where appropriate
+   - Include some LSI keywords where relevant
+   - Form a logical content flow
+   - Be engaging and click-worthy while still being informative
+   - Be formatted in Markdown (# for H1, ## for H2, etc.)
+2. Confirm all the requirements are being met in the headings.
+3. Confirm all the requirements are being met in the title.
+4. Confirm all the requirements are being met in the description.
+5.IMPORTANT: Ensure and Confirm each step in the Step 2 list is met.
+</step 2>
+
+Format your response exactly like this:
+META TITLE: [Your meta title here]
+META DESCRIPTION: [Your meta description here]
+HEADING STRUCTURE:
+[You must always return a Complete markdown user journey friendly heading structure with # for H1, ## for H2, etc. Provided in order of the exact page layout eg.
+# Heading 1
+## Heading 2
+### Heading 3
+### Heading 3
+## Heading 2
+etc.]"""
+
+CONTENT_SYSTEM_PROMPT = """You are an expert SEO content writer with deep knowledge about creating high-quality, engaging, and optimized content. You have a strong understanding of SEO best practices, entity based SEO and semantic SEO. You write content that ranks well in search engine results. You are also an expert in content writing and can write content that is engaging and informative. You understand the needs of the client and their desired token limit for word count requirements. If you are given a token limit, you will not use more than the token limit for that word count, you may use additional token lmits for thinking, but not the output word count. You will not deviate from the requirements. You will not add or remove any content from the headings structure. You are capable of following the requirements strictly. You are capable of detecting when content is locally based and will generate content to help in Local Search Rankings by seemlessly making accurate local references."""
+
+CONTENT_GUIDELINES = r"""Content Writing Guidelines:
+- 1. Draft the initial content: Use the token limit from the Key Requirements to generate the Content, which should be around the target word count given there.
+- 1A. Perform word count using: text.split(/\s+/).filter(Boolean).length
+- 1B. If word count is less than the token limit, return the content with the word count adjusted to meet the target word count.
+- 1C. Verify final count and confirm Draft and Word Count.
+- 2. H4, H5, H6 do not need a lot of content. H3s need minimal content, but enough to get the point across.
+- 3. Write in a clear, authoritative style suitable for an expert audience
+- 3. Make the content deeply informative and comprehensive
+- 4. Always write in active voice and maintain a conversational but professional tone
+- 5. Include only factually accurate information
+- 6. Ensure the content flows naturally between sections
+- 7. Include the primary keyword in the first 100 words of the content
+- 8. Variations, LSI keywords, and entities are used at least once when possible.
+- 9. Format the content using markdown
+- 10. DO NOT include any introductory notes, explanations, or meta-commentary about your process
+- 11. DO NOT use placeholder text or suggest that the client should add information
+- 12. DO NOT use the phrases "in conclusion" or "in summary" for the final section
+- 13. Use the token limit from the Key Requirements to generate the Content, which should be around the target word count.
+- 14. Whole words only (no hyphens/subwords)
+- 15. There should never be big blocks of text. We do not want big content blocks. everything should be concise and to the point, reducing fluff.
+- 16. Paragraphs should not be more than 3 sentences unless absolutely necessary
+- 17. Do not use any EM Dashes "—" in the content.
+"""
+
+# Prompt caching: everything up to the last block marked with cache_control is
+# cached by the API for a few minutes, so the fixed instructions are billed at
+# the cache-read rate on every call after the first
+PROMPT_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _system_blocks(*texts: str) -> List[Dict[str, Any]]:
+    """System prompt as text blocks, with the cache breakpoint after the last one."""
+    blocks: List[Dict[str, Any]] = [{"type": "text", "text": text} for text in texts]
+    blocks[-1]["cache_control"] = PROMPT_CACHE_CONTROL
+    return blocks
+
+
+def _prompt_text(prompt: Union[str, List[Dict[str, Any]]]) -> str:
+    """Plain text of a prompt given as a string or as text blocks."""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n".join(block.get("text", "") for block in prompt)
+
+
+# Cache writes and reads are reported apart from the uncached input_tokens
+_USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+def _token_budgets(is_content_generation: bool) -> Tuple[int, int]:
+    """(max_tokens, thinking budget) for a heading or content generation call."""
+    return (50000, 49999) if is_content_generation else (2000, 1999)
+
+
+def _message_params(system_prompt: Union[str, List[Dict[str, Any]]], user_prompt: str, max_tokens: int,
+                    thinking_budget: int) -> Dict[str, Any]:
+    """Messages API arguments shared by the sync and async calls (extended thinking enabled)."""
+    return {
+        "max_tokens": max_tokens,
+        "system": system_prompt,
+        "messages": [{"role": "user", "content": user_prompt}],
+        "model": CLAUDE_MODEL,
+        "thinking": {
+            "type": "enabled",
+            "budget_tokens": thinking_budget
+        },
+    }
+
+
+def _usage_dict(usage: Any) -> Dict[str, int]:
+    """Token counts reported by the API, as a plain dict (fields the response omits are left out)."""
+    if usage is None:
+        return {}
+    return {name: value for name in _USAGE_FIELDS if (value := getattr(usage, name, None)) is not None}
+
+def _cache_hit_response(cached, stream_callback=None):
+    """A response cache hit as a call_claude_api result, replayed through *stream_callback* at once.
+
+    Nothing was billed, so ``usage`` is empty; the original call's usage is kept as ``cached_usage``.
+    """
+    if stream_callback and callable(stream_callback):
+        if cached["thinking"]:
+            stream_callback(thinking_content=cached["thinking"], content="")
+        if cached["content"]:
+            stream_callback(content=cached["content"], thinking_content="")
+    return {
+        "content": cached["content"],
+        "thinking": cached["thinking"],
+        "usage": {},
+        "cache_hit": True,
+        "cached_usage": cached["usage"],
+    }
+
+def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=False, stream=False, stream_callback=None,
+                    bypass_cache=False):
     expect(bool(api_key), "API key is required", ValidationError)
 
+    # Default token and budget settings (can be parameterised later via settings)
+    max_tokens, thinking_budget = _token_budgets(is_content_generation)
+
+    # Identical requests are answered from the response cache unless bypassed (a fresh result is still stored)
+    cache_key = response_cache.make_key(CLAUDE_MODEL, system_prompt, user_prompt, max_tokens, thinking_budget)
+    if not bypass_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Claude response cache hit | content_len={len(cached['content'])}")
+            return _cache_hit_response(cached, stream_callback if stream else None)
+
+    client = None
     try:
-        client = anthropic.Anthropic(api_key=api_key)
-        model = CLAUDE_MODEL
-        
-        # Default token and budget settings (can be parameterised later via settings)
-        max_tokens = 50000 if is_content_generation else 2000
-        thinking_budget = 49999 if is_content_generation else 1999
+        # Pooled client: reuses warm connections across calls and sessions
+        client = client_registry.acquire(api_key)
 
         # Detailed debug information instead of stdout prints
         logger.debug(
@@ -37,18 +201,13 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
             try:
                 # Enable extended thinking for streaming responses
                 stream_response = client.messages.stream(
-                    max_tokens=max_tokens,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": user_prompt}],
-                    model=model,
-                    thinking={
-                        "type": "enabled",
-                        "budget_tokens": thinking_budget
-                    }
+                    **_message_params(system_prompt, user_prompt, max_tokens, thinking_budget)
                 )
                 
                 complete_content = ""
                 full_thinking = ""
+                usage = {}
+                stop_reason = None
                 
                 # Handle the callback if provided
                 if stream_callback and callable(stream_callback):
@@ -56,6 +215,8 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
                     def process_streamed_response(stream_obj):
                         nonlocal complete_content
                         nonlocal full_thinking
+                        nonlocal usage
+                        nonlocal stop_reason
                         
                         # Use the context manager pattern with 'with' statement
                         with stream_obj as stream:
@@ -74,17 +235,21 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
                                         # Update the content display
                                         stream_callback(content=content_delta, thinking_content="")
                                 elif event.type == "message_delta" and event.delta.stop_reason:
-                                    # Log the stop reason for debugging
-                                    logger.debug(f"Stream stopped: {event.delta.stop_reason}")
+                                    # Only complete (end_turn) responses are cached
+                                    stop_reason = event.delta.stop_reason
+                                    logger.debug(f"Stream stopped: {stop_reason}")
+                            usage = _usage_dict(stream.get_final_message().usage)
                         
                         # Return collected content and thinking
                         return {
                             "content": complete_content,
-                            "thinking": full_thinking
+                            "thinking": full_thinking,
+                            "usage": usage
                         }
                     
                     # Process the streamed response
                     result = process_streamed_response(stream_response)
+                    response_cache.put(cache_key, result, stop_reason)
                     return result
                 else:
                     # If no callback is provided, still process the stream but don't update UI
@@ -95,11 +260,17 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
                                     full_thinking += event.delta.thinking
                                 elif event.delta.type == "text_delta":
                                     complete_content += event.delta.text
+                        final_message = stream.get_final_message()
+                        usage = _usage_dict(final_message.usage)
+                        stop_reason = final_message.stop_reason
                     
-                    return {
+                    result = {
                         "content": complete_content,
-                        "thinking": full_thinking
+                        "thinking": full_thinking,
+                        "usage": usage
                     }
+                    response_cache.put(cache_key, result, stop_reason)
+                    return result
                     
             except Exception as e:
                 logger.error(f"Error in streaming response: {str(e)}")
@@ -108,14 +279,7 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
             # For non-streaming requests, still enable extended thinking mode
             try:
                 response = client.messages.create(
-                    max_tokens=max_tokens,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": user_prompt}],
-                    model=model,
-                    thinking={
-                        "type": "enabled",
-                        "budget_tokens": thinking_budget
-                    }
+                    **_message_params(system_prompt, user_prompt, max_tokens, thinking_budget)
                 )
                 
                 # Extract thinking content and regular text content
@@ -130,10 +294,13 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
                 
                 logger.debug(f"Claude API response received | content_len={len(text_content)} | thinking_len={len(thinking_content)}")
                 
-                return {
+                result = {
                     "content": text_content,
-                    "thinking": thinking_content
+                    "thinking": thinking_content,
+                    "usage": _usage_dict(response.usage)
                 }
+                response_cache.put(cache_key, result, response.stop_reason)
+                return result
             except Exception as e:
                 logger.error(f"Error calling Claude API: {str(e)}")
                 raise GenerationError(f"Failed to call Claude API: {str(e)}")
@@ -141,8 +308,12 @@ def call_claude_api(system_prompt, user_prompt, api_key, is_content_generation=F
     except Exception as e:
         logger.error(f"Error in Claude API call preparation: {str(e)}")
         raise GenerationError(f"Failed to prepare Claude API call: {str(e)}")
+    finally:
+        if client is not None:
+            client_registry.release(api_key)
 
-def generate_meta_and_headings(requirements, settings=None, business_data='', stream=False, stream_callback=None):
+def _heading_api_key(settings):
+    """Anthropic API key from the generation settings (required when the model is Claude)."""
     if settings is None:
         settings = {}
     
@@ -151,7 +322,10 @@ def generate_meta_and_headings(requirements, settings=None, business_data='', st
     
     if model == 'claude':
         expect(bool(anthropic_api_key), "Claude API key must be provided to use Claude", ValidationError)
-    
+    return anthropic_api_key
+
+def _prepare_heading_prompts(requirements, business_data='', save_prompt=True):
+    """System and user prompts for meta and heading generation (saved to heading_prompt.txt when *save_prompt*)."""
     primary_keyword = requirements.get('primary_keyword', '')
     variations = requirements.get('variations', [])
     lsi_dict = requirements.get('lsi_keywords', {})
@@ -195,11 +369,8 @@ def generate_meta_and_headings(requirements, settings=None, business_data='', st
     else:
         lsi_formatted = "- No LSI keywords available\n"
     
-    # Prepare the system and user prompts
-    system_prompt = """
-You are a professional SEO content strategist and copywriter. Your job is to create optimized content strategies that rank well in search engines. Your task is to generate a user friendly heading outline utilizing the headings as specified and required by the user.
-You have a strong understanding of SEO best practices, entity based SEO and semantic SEO. You write content that ranks well in search engine results. You are also an expert in content writing and can write content that is engaging and informative. You understand the needs of the client and their desired and strict requirements. You will not deviate from the requirements. You are capable of following the requirements strictly. You are creative and capable of delivering content that stays topically and semantically relevent to the specific page. You use specific token limits for titles and descriptions.
-"""
+    # Static instructions go in the cached system prefix; only the job details below vary per call
+    system_prompt = _system_blocks(HEADING_SYSTEM_PROMPT, HEADING_INSTRUCTIONS)
    # Inject roadmap fields as a string
     additional_requirements = ""
     for key, val in requirements['roadmap_requirements'].items():
@@ -228,64 +399,30 @@ Please create a meta title, meta description, and heading structure for a piece
 </Important Requirements>
 </requirements>
 
-<step 1>
-Using the information and requirements provided tackle the SEO-optimized content. First, establish the key elements required:
-- Title Tag:
-- Meta Description:
-- Headings Tags:
-Please follow these guidelines for content structure:
-1. Title: Include at least one instance of the main keyword and Exclusively use {title_token_limit} tokens to generate the title, which should be around {meta_title_length} words.
-2. Meta Description: Exclusively use {desc_token_limit} tokens to generate the meta description, which should be around {meta_desc_length} words.
-3. Avoid Redundancy
-3A. Definition: Prevent the repetition of identical factual information, phrasing, or ideas across different sections unless necessary for context or emphasis.
-3B. Guidelines:
-3B1. Each section should introduce new information or a fresh perspective.
-3B2. Avoid reusing the same sentences or key points under different headings.
-3B3. If overlap occurs, merge sections or reframe the content to add distinct value.
-3C. Example:
-3C1. Redundant: Two sections both state, '[Topic] is beneficial.'
-3C2. Fixed: One section defines '[Topic]', while another explains another aspect of '[Topic]'.
-4. Include an FAQ if the topic involves common user questions or multiple subtopics. FAQ Section should be an H2. The Questions must each be an H3.
-5. Merge variations into single headings when possible (as long as it makes sense for readability, SEO and adheres with the heading requirements).
-6. IMPORTANT: Ensure and Confirm each step in the Step 1 list is met.
-</step 1>
-
-<step 2>
-1. Create a heading structure with the following requirements. No Less. Do your best to fit all the requirements within the heading counts provided below. You can fit multiple entities or requirements in a single heading without stuffing it, each heading should be user-friendly. 
-   - H1: {heading_structure.get("h1", 0)} headings - Do not create additional H1s unless absolutely necessary - IMPORTANT
-   - H2: {heading_structure.get("h2", 0)} headings - Do not create additional H2s unless absolutely necessary - IMPORTANT
-   - H3: {heading_structure.get("h3", 0)} headings - Do not create additional H3s unless absolutely necessary - IMPORTANT
-   - H4: {heading_structure.get("h4", 0)} headings - Do not create additional H4s unless absolutely necessary - IMPORTANT
-   - H5: {heading_structure.get("h5", 0)} headings - Do not create additional H5s unless absolutely necessary - IMPORTANT
-   - H6: {heading_structure.get("h6", 0)} headings - Do not create additional H6s unless absolutely necessary - IMPORTANT
-
-2. The headings should:
-   - Contain the primary keyword and/or variations where appropriate
-   - Include some LSI keywords where relevant
-   - Form a logical content flow
-   - Be engaging and click-worthy while still being informative
-   - Be formatted in Markdown (# for H1, ## for H2, etc.)
-2. Confirm all the requirements are being met in the headings.
-3. Confirm all the requirements are being met in the title.
-4. Confirm all the requirements are being met in the description.
-5.IMPORTANT: Ensure and Confirm each step in the Step 2 list is met.
-</step 2>
+<length and heading targets>
+- Title: {title_token_limit} tokens, around {meta_title_length} words
+- Meta Description: {desc_token_limit} tokens, around {meta_desc_length} words
+- H1: {heading_structure.get("h1", 0)} headings
+- H2: {heading_structure.get("h2", 0)} headings
+- H3: {heading_structure.get("h3", 0)} headings
+- H4: {heading_structure.get("h4", 0)} headings
+- H5: {heading_structure.get("h5", 0)} headings
+- H6: {heading_structure.get("h6", 0)} headings
+</length and heading targets>
 
-Format your response exactly like this:
-META TITLE: [Your meta title here]
-META DESCRIPTION: [Your meta description here]
-HEADING STRUCTURE:
-[You must always return a Complete markdown user journey friendly heading structure with # for H1, ## for H2, etc. Provided in order of the exact page layout eg.
-# Heading 1
-## Heading 2
-### Heading 3
-### Heading 3
-## Heading 2
-etc.]"""
+Follow step 1, step 2 and the response format from your instructions."""
     
     # Save the prompt to a file for reference
-    with open("heading_prompt.txt", "w", encoding="utf-8") as f:
-        f.write(user_prompt_heading)
+    if save_prompt:
+        with open("heading_prompt.txt", "w", encoding="utf-8") as f:
+            f.write(HEADING_INSTRUCTIONS + "\n" + user_prompt_heading)
+    return system_prompt, user_prompt_heading
+
+def generate_meta_and_headings(requirements, settings=None, business_data='', stream=False, stream_callback=None):
+    anthropic_api_key = _heading_api_key(settings)
+    system_prompt, user_prompt_heading = _prepare_heading_prompts(requirements, business_data)
+    
+    bypass_cache = (settings or {}).get('bypass_response_cache', False)
     
     # If streaming is enabled, return the streaming response directly
     if stream:
@@ -294,12 +431,16 @@ etc.]"""
             user_prompt_heading, 
             anthropic_api_key,
             stream=True,
-            stream_callback=stream_callback
+            stream_callback=stream_callback,
+            bypass_cache=bypass_cache
         )
     
     # Call API to get meta and headings
-    response = call_claude_api(system_prompt, user_prompt_heading, anthropic_api_key)
-    
+    response = call_claude_api(system_prompt, user_prompt_heading, anthropic_api_key, bypass_cache=bypass_cache)
+    return _parse_meta_and_headings(response)
+
+def _parse_meta_and_headings(response):
+    """Meta title, meta description and heading lines from a heading generation response."""
     # Parse the result to extract meta title, description, and headings
     meta_title = ""
     meta_description = ""
@@ -319,13 +460,8 @@ etc.]"""
         # Just split by lines and remove any completely blank lines
         heading_lines = [line for line in heading_structure.split('\n') if line.strip()]
         
-        # Only do minimal filtering to ensure we have actual headings
-        # This preserves the exact order and structure
-        filtered_heading_lines = []
-        for line in heading_lines:
-            # Keep only lines that look like headings (starting with # or H1:, etc.)
-            if line.strip().startswith('#') or re.match(r'^H[1-6]:', line.strip()):
-                filtered_heading_lines.append(line.strip())
+        # Keep only lines that look like headings (# or H1:, etc.), preserving order
+        filtered_heading_lines = [h.raw for h in scan_markdown(heading_structure, label_headings=True, outline=True).headings]
         
         # If we found valid headings, use those, otherwise fall back to the raw lines
         if filtered_heading_lines:
@@ -339,7 +475,15 @@ etc.]"""
         "token_usage": response.get('usage', {})
     }
 
-def generate_content_from_headings(requirements: SEORequirements | dict, meta_and_headings, settings, business_data='', stream=False, stream_callback=None):
+def _prepare_content_prompts(requirements: SEORequirements | dict, meta_and_headings, settings, business_data='',
+                             save_prompt=True):
+    """
+    Prompts for article generation from an approved heading structure.
+
+    Returns:
+        tuple: (system_prompt, user_prompt, primary_keyword); with *save_prompt* the
+        prompts are also saved to content_prompt.txt
+    """
     heading_lines = meta_and_headings.get("headings", [])
     if isinstance(heading_lines, list):
         heading_structure = "\n".join(heading_lines)
@@ -347,10 +491,6 @@ def generate_content_from_headings(requirements: SEORequirements | dict, meta_an
         heading_structure = meta_and_headings.get('heading_structure', '')
     expect(bool(heading_structure and heading_structure.strip()), "No valid heading structure provided", ValidationError)
 
-
-    """Generate content based on the provided heading structure."""
-    if settings is None:
-        settings = {}
     generate_images = settings.get('generate_images', False)
     generate_lists = settings.get('generate_lists', False)
     generate_tables = settings.get('generate_tables', False)
@@ -457,8 +597,6 @@ def generate_content_from_headings(requirements: SEORequirements | dict, meta_an
     if not heading_structure or not heading_structure.strip():
         heading_structure = "# " + primary_keyword
     
-    # Construct the system prompt
-    system_prompt = """You are an expert SEO content writer with deep knowledge about creating high-quality, engaging, and optimized content. You have a strong understanding of SEO best practices, entity based SEO and semantic SEO. You write content that ranks well in search engine results. You are also an expert in content writing and can write content that is engaging and informative. You understand the needs of the client and their desired token limit for word count requirements. If you are given a token limit, you will not use more than the token limit for that word count, you may use additional token lmits for thinking, but not the output word count. You will not deviate from the requirements. You will not add or remove any content from the headings structure. You are capable of following the requirements strictly. You are capable of detecting when content is locally based and will generate content to help in Local Search Rankings by seemlessly making accurate local references."""
     
     # Prepare enhancement instructions for the prompt
     enhancement_text = ""
@@ -526,34 +664,14 @@ Example:
             for keyword in lsi_keywords:
                 formatted_lsi += f"- {keyword}: use at least once\n"
     
+    # Static guidelines (and the enabled format rules) go in the cached system prefix
+    system_prompt = _system_blocks(CONTENT_SYSTEM_PROMPT, CONTENT_GUIDELINES + enhancement_text)
+
     # Construct the user prompt for content generation
     user_prompt = f"""
 # SEO Content Writing Task
 - Business Info to include (if applicable):<business info> {business_data if business_data else 'None provided'}<business info>
-Please write a comprehensive, SEO-optimized article about **{primary_keyword}** with these Constraints:
-Content Writing Guidelines:
-- 1. Draft the initial content: Use {word_token_limit} tokens to generate the Content, which should be around {word_count} words.
-- 1A. Perform word count using: text.split(/\s+/).filter(Boolean).length
-- 1B. If word count is less than {word_token_limit}, return the content with the word count adjusted to meet the requirement of {word_count} words.
-- 1C. Verify final count and confirm Draft and Word Count.
-- 2. H4, H5, H6 do not need a lot of content. H3s need minimal content, but enough to get the point across.
-- 3. Write in a clear, authoritative style suitable for an expert audience
-- 3. Make the content deeply informative and comprehensive
-- 4. Always write in active voice and maintain a conversational but professional tone
-- 5. Include only factually accurate information
-- 6. Ensure the content flows naturally between sections
-- 7. Include the primary keyword in the first 100 words of the content
-- 8. Variations, LSI keywords, and entities are used at least once when possible.
-- 9. Format the content using markdown
-- 10. DO NOT include any introductory notes, explanations, or meta-commentary about your process
-- 11. DO NOT use placeholder text or suggest that the client should add information
-- 12. DO NOT use the phrases "in conclusion" or "in summary" for the final section
-- 13. Use {word_token_limit} tokens to generate the Content, which should be around {word_count} words.
-- 14. Whole words only (no hyphens/subwords)
-- 15. There should never be big blocks of text. We do not want big content blocks. everything should be concise and to the point, reducing fluff.
-- 16. Paragraphs should not be more than 3 sentences unless absolutely necessary
-- 17. Do not use any EM Dashes "—" in the content.
-{enhancement_text}
+Please write a comprehensive, SEO-optimized article about **{primary_keyword}** following the Content Writing Guidelines from your instructions.
 
 Now Start Content Generation:
 
@@ -562,6 +680,7 @@ Now Start Content Generation:
 - Meta Description: {meta_description}
     
 2. Key Requirements:
+- Target: around {word_count} words ({word_token_limit} tokens).
 - Word Count: {word_token_limit} tokens (minimum). This word count is extremely strict. Must be no less than {word_token_limit} but no more than {word_token_limit + 100}. 
 - Your word count should only include raw text. Do not count Markdown syntax or provided images alt/filename (if applicable) in the word count.
 - Primary Keyword: {primary_keyword}
@@ -586,8 +705,20 @@ Now Start Content Generation:
 IMPORTANT: Return ONLY the pure markdown content without any explanations, introductions, or notes about your approach."""
 
     # Save the prompt to a file for reference
-    with open("content_prompt.txt", "w", encoding="utf-8") as f:
-        f.write(user_prompt)
+    if save_prompt:
+        with open("content_prompt.txt", "w", encoding="utf-8") as f:
+            f.write(CONTENT_GUIDELINES + enhancement_text + "\n" + user_prompt)
+    return system_prompt, user_prompt, primary_keyword
+
+def generate_content_from_headings(requirements: SEORequirements | dict, meta_and_headings, settings, business_data='', stream=False, stream_callback=None):
+    """Generate content based on the provided heading structure."""
+    if settings is None:
+        settings = {}
+    system_prompt, user_prompt, primary_keyword = _prepare_content_prompts(
+        requirements, meta_and_headings, settings, business_data
+    )
+    
+    bypass_cache = settings.get('bypass_response_cache', False)
     
     # If streaming is enabled, return the streaming response directly
     if stream:
@@ -597,18 +728,16 @@ IMPORTANT: Return ONLY the pure markdown content without any explanations, intro
             settings.get('anthropic_api_key'), 
             is_content_generation=True,
             stream=True,
-            stream_callback=stream_callback
+            stream_callback=stream_callback,
+            bypass_cache=bypass_cache
         )
     
     # Call the API based on the settings
     if settings.get('model', '').lower() == 'claude' and settings.get('anthropic_api_key'):
-        api_response = call_claude_api(system_prompt, user_prompt, settings.get('anthropic_api_key'), is_content_generation=True)
+        api_response = call_claude_api(system_prompt, user_prompt, settings.get('anthropic_api_key'), is_content_generation=True,
+                                       bypass_cache=bypass_cache)
         result = api_response.get("content", "")
-        token_usage = {
-            "input_tokens": api_response.get("input_tokens", 0),
-            "output_tokens": api_response.get("output_tokens", 0),
-            "total_tokens": api_response.get("total_tokens", 0)
-        }
+        token_usage = _token_usage(api_response)
 
     else:
         # Default to Claude if no valid settings are provided
@@ -616,27 +745,34 @@ IMPORTANT: Return ONLY the pure markdown content without any explanations, intro
             result, token_usage = call_claude_api(system_prompt, user_prompt, settings.get('anthropic_api_key'), is_content_generation=True)
         else:
             raise ValueError("No valid API key provided. Please provide an Anthropic API key.")
-    
-    # Debug: Print the raw response from the API
-    print("\n=== DEBUG: RAW API RESPONSE ===")
-    # The result from call_claude_api should be a dictionary with 'content' key
-    if isinstance(result, dict) and 'content' in result:
-        raw_content = result['content']
-        print(raw_content)
-    else:
-        print("Unexpected result format:", result)
-    print("=== END RAW API RESPONSE ===\n")
+    return _finish_content(result, primary_keyword, token_usage)
+
+def _token_usage(api_response):
+    """Input, output, prompt cache and total token counts of a call_claude_api response."""
+    usage = api_response.get("usage") or {}
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cache_creation = usage.get("cache_creation_input_tokens", 0)
+    cache_read = usage.get("cache_read_input_tokens", 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_creation_input_tokens": cache_creation,
+        "cache_read_input_tokens": cache_read,
+        "total_tokens": input_tokens + cache_creation + cache_read + output_tokens
+    }
+
+def _finish_content(result, primary_keyword, token_usage, save=True):
+    """Clean the generated article and render HTML; with *save*, also write it to seo_content_<keyword>.md."""
+    logger.debug(f"Raw API response ({len(result) if result else 0} chars):\n{result}")
     
     # Process the result to get clean markdown
     markdown_content = extract_markdown_content(result)
-
-    # Add this debugging/error handling
-    print(f"Raw content from API (first 100 chars): {result[:100] if result else 'Empty'}")
-    print(f"Extracted markdown (first 100 chars): {markdown_content[:100] if markdown_content else 'Empty'}")
+    logger.debug(f"Extracted markdown (first 100 chars): {markdown_content[:100] if markdown_content else 'Empty'}")
 
     # Ensure we have content with better fallback handling
     if not markdown_content or len(markdown_content.strip()) < 100:
-        print("Warning: Extracted markdown appears too short or empty. Using raw API response.")
+        logger.warning("Extracted markdown appears too short or empty. Using raw API response.")
         markdown_content = result.strip() if result else "Error: No content was generated."
 
     # The rest of your code remains the same...
@@ -644,10 +780,11 @@ IMPORTANT: Return ONLY the pure markdown content without any explanations, intro
     # Convert to HTML
     html_content = markdown_to_html(markdown_content)
     
-    # Save to a file
+    # Save to a file (callers running many jobs at once keep the markdown in memory instead)
     filename = f"seo_content_{primary_keyword.replace(' ', '_').lower()}.md"
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(markdown_content)
+    if save:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(markdown_content)
     
     # Return results as a dictionary with all necessary information
     return {
@@ -657,6 +794,210 @@ IMPORTANT: Return ONLY the pure markdown content without any explanations, intro
         'token_usage': token_usage
     }
 
+class ClaudeDelta(NamedTuple):
+    """One streamed increment: ``type`` is "thinking" or "text"."""
+
+    type: str
+    text: str
+
+
+class ClaudeStream:
+    """
+    Async iterator over the thinking and text deltas of one Claude call.
+
+    Iterate it once with ``async for``; afterwards `result` returns the
+    same ``{"content", "thinking", "usage"}`` dict as `call_claude_api`.
+    The client is leased from `async_client_registry` only while the
+    stream is being consumed.  With a *rate_limiter* the request first
+    waits for quota and settles it from the reported usage.  Response
+    cache hits are replayed as one thinking and one text delta without
+    touching the API or the rate limiter.
+    """
+
+    def __init__(self, system_prompt, user_prompt, api_key, is_content_generation=False,
+                 rate_limiter: Optional[RateLimiter] = None, bypass_cache: bool = False):
+        expect(bool(api_key), "API key is required", ValidationError)
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
+        self.api_key = api_key
+        self.is_content_generation = is_content_generation
+        self.rate_limiter = rate_limiter
+        self.bypass_cache = bypass_cache
+        self.content = ""
+        self.thinking = ""
+        self.usage: Dict[str, int] = {}
+        self.cached_usage: Optional[Dict[str, int]] = None
+        self.done = False
+        self._started = False
+
+    def __aiter__(self) -> AsyncIterator[ClaudeDelta]:
+        expect(not self._started, "A Claude stream can only be consumed once", GenerationError)
+        self._started = True
+        return self._deltas()
+
+    async def _deltas(self) -> AsyncIterator[ClaudeDelta]:
+        max_tokens, thinking_budget = _token_budgets(self.is_content_generation)
+        cache_key = response_cache.make_key(CLAUDE_MODEL, self.system_prompt, self.user_prompt, max_tokens, thinking_budget)
+        if not self.bypass_cache:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Claude response cache hit | content_len={len(cached['content'])}")
+                self.content, self.thinking, self.cached_usage = cached["content"], cached["thinking"], cached["usage"]
+                self.done = True
+                if self.thinking:
+                    yield ClaudeDelta("thinking", self.thinking)
+                if self.content:
+                    yield ClaudeDelta("text", self.content)
+                return
+        logger.debug(
+            f"Streaming Claude API (async) | mode={'content_generation' if self.is_content_generation else 'heading_generation'} | "
+            f"max_tokens={max_tokens} | prompt_len={len(self.user_prompt)}"
+        )
+        reservation = None
+        stop_reason = None
+        if self.rate_limiter is not None:
+            reservation = await self.rate_limiter.acquire(
+                estimate_tokens(_prompt_text(self.system_prompt), self.user_prompt), max_tokens
+            )
+        try:
+            async with async_client_registry.lease(self.api_key) as client:
+                params = _message_params(self.system_prompt, self.user_prompt, max_tokens, thinking_budget)
+                async with client.messages.stream(**params) as stream:
+                    async for event in stream:
+                        if event.type == "content_block_delta":
+                            if event.delta.type == "thinking_delta":
+                                self.thinking += event.delta.thinking
+                                yield ClaudeDelta("thinking", event.delta.thinking)
+                            elif event.delta.type == "text_delta":
+                                self.content += event.delta.text
+                                yield ClaudeDelta("text", event.delta.text)
+                        elif event.type == "message_delta" and event.delta.stop_reason:
+                            stop_reason = event.delta.stop_reason
+                            logger.debug(f"Stream stopped: {stop_reason}")
+                    self.usage = _usage_dict((await stream.get_final_message()).usage)
+        except GenerationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in async streaming response: {str(e)}")
+            raise GenerationError(f"Failed to stream Claude API response: {str(e)}")
+        finally:
+            if reservation is not None:
+                reservation.settle(self.usage)
+        self.done = True
+        response_cache.put(cache_key, {"content": self.content, "thinking": self.thinking, "usage": self.usage}, stop_reason)
+
+    def result(self) -> Dict[str, Any]:
+        expect(self.done, "Claude stream has not been consumed", GenerationError)
+        result = {"content": self.content, "thinking": self.thinking, "usage": self.usage}
+        if self.cached_usage is not None:
+            result.update(cache_hit=True, cached_usage=self.cached_usage)
+        return result
+
+
+def stream_claude_api(system_prompt, user_prompt, api_key, is_content_generation=False,
+                      rate_limiter: Optional[RateLimiter] = None, bypass_cache: bool = False) -> ClaudeStream:
+    """
+    Async streaming counterpart of `call_claude_api`.
+
+    Args:
+        system_prompt: System prompt
+        user_prompt: User prompt
+        api_key: Anthropic API key
+        is_content_generation: Use the article token budget instead of the heading one
+        rate_limiter: Optional RateLimiter shared by concurrent calls on this API key
+        bypass_cache: Skip the response cache lookup (the fresh response is still stored)
+
+    Returns:
+        ClaudeStream: ``async for delta in stream`` yields `ClaudeDelta` items
+    """
+    return ClaudeStream(system_prompt, user_prompt, api_key, is_content_generation, rate_limiter, bypass_cache)
+
+
+async def call_claude_api_async(
+    system_prompt,
+    user_prompt,
+    api_key,
+    is_content_generation=False,
+    stream_callback: Optional[Callable[..., Any]] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    bypass_cache: bool = False,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of `call_claude_api`.
+
+    The response is always streamed (long generations must be), so
+    *stream_callback* receives every delta exactly like the sync callback.
+
+    Returns:
+        dict: {"content", "thinking", "usage"}
+    """
+    stream = stream_claude_api(system_prompt, user_prompt, api_key, is_content_generation, rate_limiter, bypass_cache)
+    async for delta in stream:
+        if stream_callback is not None:
+            if delta.type == "thinking":
+                stream_callback(thinking_content=delta.text, content="")
+            else:
+                stream_callback(content=delta.text, thinking_content="")
+    result = stream.result()
+    logger.debug(f"Claude API response received (async) | content_len={len(result['content'])} | thinking_len={len(result['thinking'])}")
+    return result
+
+
+async def generate_meta_and_headings_async(requirements, settings=None, business_data='', stream=False, stream_callback=None,
+                                           rate_limiter: Optional[RateLimiter] = None):
+    """
+    Async counterpart of `generate_meta_and_headings`.
+
+    With ``stream=True`` the `ClaudeStream` is returned unconsumed, for the
+    caller to iterate; otherwise the parsed meta and heading dict, plus the
+    ``prompts`` sent.  Nothing is written to the working directory, so
+    concurrent jobs do not share files.
+    """
+    anthropic_api_key = _heading_api_key(settings)
+    system_prompt, user_prompt_heading = _prepare_heading_prompts(requirements, business_data, save_prompt=False)
+    bypass_cache = (settings or {}).get('bypass_response_cache', False)
+    if stream:
+        return stream_claude_api(system_prompt, user_prompt_heading, anthropic_api_key,
+                                 rate_limiter=rate_limiter, bypass_cache=bypass_cache)
+    response = await call_claude_api_async(
+        system_prompt, user_prompt_heading, anthropic_api_key,
+        stream_callback=stream_callback, rate_limiter=rate_limiter, bypass_cache=bypass_cache,
+    )
+    result = _parse_meta_and_headings(response)
+    result["prompts"] = {"system": _prompt_text(system_prompt), "user": user_prompt_heading}
+    return result
+
+
+async def generate_content_from_headings_async(requirements: SEORequirements | dict, meta_and_headings, settings, business_data='', stream=False, stream_callback=None,
+                                               rate_limiter: Optional[RateLimiter] = None):
+    """
+    Async counterpart of `generate_content_from_headings`.
+
+    With ``stream=True`` the `ClaudeStream` is returned unconsumed, for the
+    caller to iterate; otherwise the markdown/html/filename/token_usage dict,
+    plus the ``prompts`` sent.  Neither the prompts nor the article are
+    written to disk (``filename`` is only the suggested name).
+    """
+    if settings is None:
+        settings = {}
+    api_key = settings.get('anthropic_api_key')
+    if not api_key:
+        raise ValueError("No valid API key provided. Please provide an Anthropic API key.")
+    system_prompt, user_prompt, primary_keyword = _prepare_content_prompts(
+        requirements, meta_and_headings, settings, business_data, save_prompt=False
+    )
+    bypass_cache = settings.get('bypass_response_cache', False)
+    if stream:
+        return stream_claude_api(system_prompt, user_prompt, api_key, is_content_generation=True,
+                                 rate_limiter=rate_limiter, bypass_cache=bypass_cache)
+    api_response = await call_claude_api_async(
+        system_prompt, user_prompt, api_key, is_content_generation=True,
+        stream_callback=stream_callback, rate_limiter=rate_limiter, bypass_cache=bypass_cache,
+    )
+    result = _finish_content(api_response.get("content", ""), primary_keyword, _token_usage(api_response), save=False)
+    result["prompts"] = {"system": _prompt_text(system_prompt), "user": user_prompt}
+    return result
+
 def extract_markdown_content(response_text):
     """Improved extraction of markdown content from API responses"""
     if not response_text:
@@ -0,0 +1,282 @@
+"""Rule-based linting of generated articles against the writing guidelines.
+
+`generate_content_from_headings` asks the model for no em dashes, at most
+three sentences per paragraph, no "in conclusion"/"in summary", the
+primary keyword within the first 100 words and no big blocks of text.
+`ContentLinter` checks an article against those rules in one pass so a
+draft can be gated before paying for another regeneration:
+
+* every `PatternRule` is fused into a single compiled regex and the text
+  is scanned once for all of them;
+* the markdown is scanned once (`utils.markdown_scan`) and each
+  `ParagraphRule` looks at the resulting paragraph blocks;
+* document rules (`Rule.check`) read the same shared `LintContext`.
+
+Rules are plain objects, so a project can pass its own list:
+
+    linter = ContentLinter([*DEFAULT_RULES, PatternRule("no-click-here", r"(?i:\\bclick here\\b)", "...")])
+    violations = linter.lint(markdown, primary_keyword="roof repair")
+"""
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Union
+
+from analysis import compile_analysis_plan
+from models import SEORequirements
+from utils.logger import get_logger
+from utils.markdown_scan import Block, MarkdownStructure, scan_markdown
+
+logger = get_logger(__name__)
+
+_RAW_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# A sentence ends at . ! or ? (plus closing quotes/brackets) before whitespace
+# and a capital, digit or opening quote, or at the end of the paragraph
+_SENTENCE_END_RE = re.compile(r'[.!?]+["\'”’)\]]*(?:\s+(?=[A-Z0-9"“‘(\[*_])|\s*$)')
+_MARKUP_RE = re.compile(r'!\[[^\]]*\]\([^)]*\)|<[^>]+>|[*_`]')
+
+
+@dataclass(frozen=True)
+class Violation:
+    """One rule violation; ``line`` is 1-based, ``offset`` a 0-based character offset."""
+
+    rule: str
+    message: str
+    line: int
+    offset: int
+    severity: str = "error"
+    excerpt: str = ""
+
+
+class LintContext:
+    """Everything rules may read about one article, computed once per lint."""
+
+    def __init__(self, text: str, primary_keyword: str = ""):
+        self.text = text
+        self.primary_keyword = primary_keyword
+        self.structure: MarkdownStructure = scan_markdown(text)
+        self.line_starts = [0] + [match.end() for match in re.finditer('\n', text)]
+        self._code_lines = None
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def offset_of(self, line_no: int) -> int:
+        """Character offset where 0-based line *line_no* starts."""
+        return self.line_starts[min(line_no, len(self.line_starts) - 1)]
+
+    def in_code(self, line_no: int) -> bool:
+        """True when 0-based line *line_no* is inside a fenced code block."""
+        if self._code_lines is None:
+            self._code_lines = {
+                line for block in self.structure.code_blocks
+                for line in range(block.start_line, block.end_line + 1)
+            }
+        return line_no in self._code_lines
+
+    def violation(self, rule: "Rule", message: str, offset: int, excerpt: str = "") -> Violation:
+        return Violation(rule.id, message, self.line_of(offset), offset, rule.severity, excerpt)
+
+
+class Rule:
+    """Base rule.  Document-level rules override `check`."""
+
+    id = ""
+    severity = "error"
+
+    def check(self, context: LintContext) -> Iterable[Violation]:
+        return ()
+
+
+class PatternRule(Rule):
+    """Flag every match of *pattern* outside fenced code.
+
+    Use inline flags such as ``(?i:...)`` rather than compile flags, since
+    all pattern rules are compiled into one alternation; where two rules
+    match at the same position the earlier rule wins.
+    """
+
+    def __init__(self, id: str, pattern: str, message: str, severity: str = "error"):
+        self.id = id
+        self.pattern = pattern
+        self.message = message
+        self.severity = severity
+
+
+class ParagraphRule(Rule):
+    """Rule evaluated once per paragraph block."""
+
+    def check_paragraph(self, block: Block, context: LintContext) -> Iterable[Violation]:
+        return ()
+
+
+def _plain_text(block: Block) -> str:
+    return _MARKUP_RE.sub('', block.text.replace('\n', ' ')).strip()
+
+
+class SentenceLimitRule(ParagraphRule):
+    """Paragraphs of more than *max_sentences* sentences."""
+
+    id = "paragraph-sentences"
+    severity = "warning"
+
+    def __init__(self, max_sentences: int = 3):
+        self.max_sentences = max_sentences
+
+    def check_paragraph(self, block: Block, context: LintContext) -> Iterable[Violation]:
+        text = _plain_text(block)
+        if not text:
+            return ()
+        ends = [match.end() for match in _SENTENCE_END_RE.finditer(text)]
+        # A last sentence without closing punctuation still counts
+        sentences = len(ends) + (0 if ends and ends[-1] == len(text) else 1)
+        if sentences <= self.max_sentences:
+            return ()
+        message = f"Paragraph has {sentences} sentences (max {self.max_sentences})"
+        return (context.violation(self, message, context.offset_of(block.start_line), text[:80]),)
+
+
+class BlockSizeRule(ParagraphRule):
+    """Paragraphs longer than *max_words* words ("big blocks of text")."""
+
+    id = "big-block"
+    severity = "warning"
+
+    def __init__(self, max_words: int = 100):
+        self.max_words = max_words
+
+    def check_paragraph(self, block: Block, context: LintContext) -> Iterable[Violation]:
+        words = len(_plain_text(block).split())
+        if words <= self.max_words:
+            return ()
+        message = f"Paragraph of {words} words (max {self.max_words})"
+        return (context.violation(self, message, context.offset_of(block.start_line), block.text[:80]),)
+
+
+class KeywordEarlyRule(Rule):
+    """Primary keyword must start within the first *words* words of body text.
+
+    Heading lines are not counted, as in `SectionIndex.in_first_words`.
+    """
+
+    id = "primary-keyword-early"
+
+    def __init__(self, words: int = 100):
+        self.words = words
+
+    def check(self, context: LintContext) -> Iterable[Violation]:
+        keyword = _RAW_TOKEN_RE.findall(context.primary_keyword)
+        if not keyword:
+            return ()
+        heading_lines = {heading.line for heading in context.structure.headings}
+        needed = self.words + len(keyword) - 1
+        tokens: List[str] = []
+        first_body_line = None
+        for line_no, line in enumerate(context.text.split('\n')):
+            if line_no in heading_lines:
+                continue
+            line_tokens = _RAW_TOKEN_RE.findall(line.lower())
+            if line_tokens and first_body_line is None:
+                first_body_line = line_no
+            tokens.extend(line_tokens)
+            if len(tokens) >= needed:
+                break
+        size = len(keyword)
+        for start in range(min(self.words, len(tokens) - size + 1)):
+            if tokens[start:start + size] == keyword:
+                return ()
+        message = f'Primary keyword "{context.primary_keyword}" not in the first {self.words} words'
+        return (context.violation(self, message, context.offset_of(first_body_line or 0)),)
+
+
+DEFAULT_RULES: Sequence[Rule] = (
+    PatternRule("em-dash", r"—", "Em dash; use a comma, colon or separate sentence"),
+    PatternRule(
+        "banned-phrase", r"(?i:\b(?:in conclusion|in summary)\b)",
+        'Avoid "in conclusion" / "in summary"',
+    ),
+    SentenceLimitRule(3),
+    BlockSizeRule(100),
+    KeywordEarlyRule(100),
+)
+
+
+class ContentLinter:
+    """Precompiled set of rules; reuse one instance across articles."""
+
+    def __init__(self, rules: Optional[Sequence[Rule]] = None):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self._pattern_rules = [rule for rule in self.rules if isinstance(rule, PatternRule)]
+        self._paragraph_rules = [rule for rule in self.rules if isinstance(rule, ParagraphRule)]
+        self._document_rules = [
+            rule for rule in self.rules if not isinstance(rule, (PatternRule, ParagraphRule))
+        ]
+        # One alternation, one named group per pattern rule
+        self._pattern = re.compile('|'.join(
+            f'(?P<r{i}>{rule.pattern})' for i, rule in enumerate(self._pattern_rules)
+        )) if self._pattern_rules else None
+
+    def lint(self, markdown_content: str, primary_keyword: str = "") -> List[Violation]:
+        """
+        Check an article against every rule.
+
+        Args:
+            markdown_content: The markdown content to lint
+            primary_keyword: Primary keyword for keyword rules
+
+        Returns:
+            list: Violations ordered by position in the text
+        """
+        context = LintContext(markdown_content, primary_keyword.lower().strip())
+        violations: List[Violation] = []
+
+        if self._pattern is not None:
+            for match in self._pattern.finditer(markdown_content):
+                offset = match.start()
+                if context.in_code(context.line_of(offset) - 1):
+                    continue
+                rule = self._pattern_rules[int(match.lastgroup[1:])]
+                violations.append(context.violation(rule, rule.message, offset, match.group()))
+
+        if self._paragraph_rules:
+            for block in context.structure.paragraphs:
+                for rule in self._paragraph_rules:
+                    violations.extend(rule.check_paragraph(block, context))
+
+        for rule in self._document_rules:
+            violations.extend(rule.check(context))
+
+        violations.sort(key=lambda violation: violation.offset)
+        logger.debug(f"Lint found {len(violations)} violations")
+        return violations
+
+
+default_linter = ContentLinter()
+
+
+def lint_content(
+    markdown_content: str,
+    requirements: Union[SEORequirements, dict, None] = None,
+    linter: Optional[ContentLinter] = None,
+) -> List[Violation]:
+    """
+    Lint an article with the default rules (or *linter*).
+
+    Args:
+        markdown_content: The markdown content to lint
+        requirements: SEORequirements or requirements dictionary supplying the primary keyword
+        linter: ContentLinter to use instead of the default rules
+
+    Returns:
+        list: Violations ordered by position in the text
+    """
+    primary_keyword = compile_analysis_plan(requirements).primary_keyword_norm if requirements else ""
+    return (linter or default_linter).lint(markdown_content, primary_keyword)
+
+
+def has_errors(violations: Iterable[Violation]) -> bool:
+    """True when any violation has severity "error" (warnings do not gate output)."""
+    return any(violation.severity == "error" for violation in violations)
@@ -9,7 +9,7 @@ remaining mostly backwards‑compatible with existing dict‐style access
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from typing import Dict, List, Any
 
 
@@ -60,6 +60,8 @@ class SEORequirements:
     basic_tunings: Dict[str, Any] = field(default_factory=dict)
     custom_entities: List[str] = field(default_factory=list)
     roadmap_requirements: Dict[str, Any] = field(default_factory=dict)
+    # Every Roadmap phase in sheet order: {"phase": N, "title": ..., "requirements": {...}}
+    roadmap_phases: List[Dict[str, Any]] = field(default_factory=list)
     debug_info: Dict[str, Any] = field(default_factory=dict)
 
     # ------------------------------------------------------------------
@@ -73,8 +75,30 @@ class SEORequirements:
     def get(self, key: str, default=None):
         return self.__dict__.get(key, default)
 
+    def full_lsi_keywords(self) -> Dict[str, int]:
+        """Return every LSI keyword, even when parsing kept only the top few.
+
+        The parser attaches a loader when it was called with ``lsi_limit``;
+        the first call runs it and later calls reuse the result.  Without a
+        loader this is simply ``lsi_keywords``.
+        """
+        loader = self.__dict__.get("_lsi_loader")
+        if loader is None:
+            return self.lsi_keywords
+        if "_lsi_full" not in self.__dict__:
+            self._lsi_full = loader()
+        return self._lsi_full
+
     def to_dict(self) -> Dict[str, Any]:
         """Return a deep copy as a plain dict (for JSON serialisation)."""
         data = asdict(self)
         data["headings"] = self.headings.to_dict()
         return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SEORequirements":
+        """Rebuild an instance from `to_dict` output, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        kwargs = {key: value for key, value in data.items() if key in known}
+        kwargs["headings"] = HeadingTargets.from_dict(data.get("headings") or {})
+        return cls(**kwargs)
@@ -0,0 +1,249 @@
+"""Section-level positional index of requirement phrases in an article.
+
+`build_section_index` walks the markdown once, maps every normalised token
+to the heading section it falls in, and runs the analysis plan's phrase
+matcher over the same token stream `analyze_content` uses.  Each counted
+occurrence is attributed to the section where it starts, either to the
+heading line or to the body.  Afterwards every query — per-section counts,
+densities, coverage gaps, first positions such as "primary keyword in
+the first 100 words" — is a dictionary lookup; the text is never
+rescanned.
+
+Positions are body word offsets: heading lines are not counted as words,
+so position 0 is the first word of body text.
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from analysis import ANALYZER_VERSION, AnalysisPlan, compile_analysis_plan
+from models import SEORequirements
+from utils.cache import LRUCache
+from utils.logger import get_logger
+from utils.markdown_scan import scan_markdown
+from utils.text_utils import normalize_phrase
+
+logger = get_logger(__name__)
+
+_RAW_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Built indexes are read-only, so cached objects are shared between callers
+section_index_cache = LRUCache(maxsize=32)
+
+
+@dataclass
+class Section:
+    """One heading and the body text up to the next heading.
+
+    ``level`` is 0 for the preamble before the first heading.  ``counts``
+    and ``heading_counts`` map matcher phrase indices to occurrences in the
+    body and in the heading line respectively.
+    """
+
+    index: int
+    level: int
+    title: str
+    line: int
+    parent: Optional[int]
+    start: int
+    body_start: int
+    end: int = 0
+    word_offset: int = 0
+    counts: Dict[int, int] = field(default_factory=dict)
+    heading_counts: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def word_count(self) -> int:
+        return self.end - self.body_start
+
+
+class SectionIndex:
+    """Per-section phrase counts and first occurrences for one article.
+
+    Build it with `build_section_index`; phrases may be passed to the
+    query methods in any case or spacing accepted by `normalize_phrase`.
+    """
+
+    def __init__(self, plan: AnalysisPlan, sections: List[Section], first_positions: Dict[int, int]):
+        self.plan = plan
+        self.sections = sections
+        self.word_count = sum(section.word_count for section in sections)
+        self._first_positions = first_positions
+
+    def _slot(self, phrase: str) -> int:
+        return self.plan.matcher.index.get(normalize_phrase(phrase or ""), -1)
+
+    # -- document-wide ----------------------------------------------------
+
+    def first_position(self, phrase: str) -> Optional[int]:
+        """Body word offset of the phrase's first occurrence, or None."""
+        return self._first_positions.get(self._slot(phrase))
+
+    def in_first_words(self, phrase: str, words: int = 100) -> bool:
+        """True when the phrase starts within the first *words* body words."""
+        position = self.first_position(phrase)
+        return position is not None and position < words
+
+    def headings_containing(self, phrase: str, level: Optional[int] = None) -> List[Section]:
+        """Sections whose heading line contains the phrase (optionally at one level)."""
+        slot = self._slot(phrase)
+        return [
+            section for section in self.sections
+            if section.heading_counts.get(slot) and (level is None or section.level == level)
+        ]
+
+    # -- per section ------------------------------------------------------
+
+    def count(self, section: Section, phrase: str, include_heading: bool = False) -> int:
+        """Occurrences of the phrase in the section body (and heading line)."""
+        slot = self._slot(phrase)
+        count = section.counts.get(slot, 0)
+        if include_heading:
+            count += section.heading_counts.get(slot, 0)
+        return count
+
+    def density(self, section: Section, phrase: str) -> float:
+        """Body density of the phrase in percent, rounded like analyze_content."""
+        words = section.word_count
+        return round((self.count(section, phrase) / words) * 100, 2) if words > 0 else 0
+
+    def gaps(self, section: Section, group: str = "lsi_keywords", include_heading: bool = True) -> List[str]:
+        """
+        Requirement phrases the section never mentions.
+
+        Args:
+            section: Section to inspect
+            group: "variations", "lsi_keywords" or "entities"
+            include_heading: Count mentions in the heading line as coverage
+
+        Returns:
+            list: Display names of the missing phrases, in requirement order
+        """
+        entries = getattr(self.plan, group)
+        missing = []
+        for entry in entries:
+            slot = entry[1]
+            found = section.counts.get(slot, 0) or (include_heading and section.heading_counts.get(slot, 0))
+            if not found:
+                missing.append(entry[0])
+        return missing
+
+    def coverage(self, section: Section, group: str = "lsi_keywords") -> float:
+        """Share of the group's phrases mentioned in the section (1.0 when the group is empty)."""
+        entries = getattr(self.plan, group)
+        if not entries:
+            return 1.0
+        return 1 - len(self.gaps(section, group)) / len(entries)
+
+    def find(self, title: str) -> Optional[Section]:
+        """First section whose heading text matches *title* (case-insensitive)."""
+        wanted = title.strip().lower()
+        return next((s for s in self.sections if s.title.lower() == wanted), None)
+
+    def children(self, section: Section) -> List[Section]:
+        return [s for s in self.sections if s.parent == section.index]
+
+    def summary(self, level: Optional[int] = None) -> List[Dict[str, Any]]:
+        """One row per section (optionally one heading level) for tables and exports."""
+        primary = self.plan.primary_keyword_norm
+        rows = []
+        for section in self.sections:
+            if level is not None and section.level != level:
+                continue
+            if section.level == 0 and not section.word_count:
+                continue
+            rows.append({
+                "index": section.index,
+                "section": section.title or "(intro)",
+                "level": section.level,
+                "words": section.word_count,
+                "primary_keyword": self.count(section, primary, include_heading=True) if primary else 0,
+                "lsi_coverage": round(self.coverage(section, "lsi_keywords"), 2),
+                "entity_coverage": round(self.coverage(section, "entities"), 2),
+            })
+        return rows
+
+
+def build_section_index(markdown_content: str, requirements: Union[SEORequirements, dict]) -> SectionIndex:
+    """
+    Index where each requirement phrase occurs, section by section.
+
+    Phrase counts are the non-overlapping counts of `analyze_content`
+    (summed over all sections and heading lines they equal its totals);
+    a phrase spanning a section boundary belongs to the section it starts in.
+
+    Args:
+        markdown_content: The markdown content to index
+        requirements: SEORequirements or requirements dictionary
+
+    Returns:
+        SectionIndex: Queryable per-section index
+    """
+    plan = compile_analysis_plan(requirements)
+
+    # Heading tree from the structural scan, then the normalised token stream line by line
+    headings = {heading.line: heading for heading in scan_markdown(markdown_content).headings}
+    sections = [Section(index=0, level=0, title="", line=0, parent=None, start=0, body_start=0)]
+    tokens: List[str] = []
+    heading_words = 0
+    for line_no, line in enumerate(markdown_content.split('\n')):
+        line_tokens = _RAW_TOKEN_RE.findall(line.lower())
+        heading = headings.get(line_no)
+        if heading is not None:
+            sections[-1].end = len(tokens)
+            heading_words += len(line_tokens)
+            sections.append(Section(
+                index=len(sections), level=heading.level, title=heading.text, line=line_no,
+                # Section i + 1 belongs to heading i; section 0 is the preamble
+                parent=heading.parent + 1 if heading.parent is not None else 0,
+                start=len(tokens), body_start=len(tokens) + len(line_tokens),
+                word_offset=len(tokens) + len(line_tokens) - heading_words,
+            ))
+        tokens.extend(line_tokens)
+    sections[-1].end = len(tokens)
+
+    # Character offset of every token in the joined text the matcher scans
+    token_starts = []
+    pos = 0
+    for token in tokens:
+        token_starts.append(pos)
+        pos += len(token) + 1
+    section_starts = [section.start for section in sections]
+
+    phrases = len(plan.matcher.phrases)
+    last_end = [0] * phrases
+    first_positions: Dict[int, int] = {}
+    for start, end, slot in plan.matcher.iter_matches(' '.join(tokens)):
+        # Same non-overlapping rule as PhraseMatcher.count
+        if start < last_end[slot]:
+            continue
+        last_end[slot] = end
+        token = bisect.bisect_left(token_starts, start)
+        section = sections[bisect.bisect_right(section_starts, token) - 1]
+        # Empty headings share a start with the next section; the last one owns the tokens
+        if token < section.body_start:
+            section.heading_counts[slot] = section.heading_counts.get(slot, 0) + 1
+        else:
+            section.counts[slot] = section.counts.get(slot, 0) + 1
+            position = token - section.body_start + section.word_offset
+            if slot not in first_positions or position < first_positions[slot]:
+                first_positions[slot] = position
+
+    logger.debug(f"Indexed {len(tokens)} tokens into {len(sections)} sections")
+    return SectionIndex(plan, sections, first_positions)
+
+
+def build_section_index_cached(markdown_content: str, requirements: Union[SEORequirements, dict]) -> SectionIndex:
+    """`build_section_index` memoized like `analysis.analyze_content_cached` (shared, read-only result)."""
+    plan = compile_analysis_plan(requirements)
+    content_hash = hashlib.sha256(markdown_content.encode("utf-8")).hexdigest()
+    key = f"v{ANALYZER_VERSION}-{content_hash}-{plan.fingerprint}"
+    index = section_index_cache.get(key)
+    if index is None:
+        index = build_section_index(markdown_content, requirements)
+        section_index_cache.set(key, index)
+    return index
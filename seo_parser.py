@@ -1,9 +1,18 @@
+import functools
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import os
 import re
 import warnings
 import openpyxl
 from models import SEORequirements, HeadingTargets
+from utils.cache import DiskCache, LRUCache
 from utils.logger import get_logger
-from utils.errors import ParseError
+from utils.errors import ParseError, ValidationError, expect
+from xlsx_reader import XlsxReader
 import math
 
 
@@ -12,6 +21,63 @@ logger = get_logger(__name__)
 
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl.styles.stylesheet")
 
+# Bump whenever parse_cora_report output changes so cached results are not reused
+PARSER_VERSION = "3"
+
+# Bump when the stored parse cache record format changes (2: JSON instead of pickle)
+PARSE_CACHE_VERSION = "2"
+
+# Workbook readers selectable through parse_cora_report(engine=...)
+ENGINES = ("openpyxl", "xml")
+
+# Columns read anywhere in a CORA report: A, B, E and G
+PARSER_COLUMNS = (1, 2, 5, 7)
+
+# CORA "Basic Tunings" codes (column B) and where their column E value is stored:
+# (code, target section, field name, default). Add new tuning codes here.
+BASIC_TUNING_CODES = (
+    ("CP492", "basic_tunings", "Word Count", 1500),
+    ("CPXR004", "basic_tunings", "Number of H1 tags", 0),
+    ("CPXR005", "basic_tunings", "Number of H2 tags", 0),
+    ("CPXR006", "basic_tunings", "Number of H3 tags", 0),
+    ("CPXR007", "basic_tunings", "Number of H4 tags", 0),
+    ("CPXR008", "basic_tunings", "Number of H5 tags", 0),
+    ("CPXR009", "basic_tunings", "Number of H6 tags", 0),
+    ("CP426", "basic_tunings", "Number of Images", 0),
+    ("CPXR003", "basic_tunings", "Number of heading tags", 0),
+    ("CP480", "requirements", "Title Length", 60),
+    ("CP380", "requirements", "Description Length", 160),
+)
+
+def _coerce_count(value, default=0):
+    """Convert a tuning cell value to int, falling back to *default* when empty or non-numeric."""
+    if value:
+        if isinstance(value, (int, float)):
+            return int(value)
+        elif isinstance(value, str) and value.strip().isdigit():
+            return int(value.strip())
+    return default
+
+def build_code_index(rows, codes=None):
+    """
+    Index a "Basic Tunings" sheet in one pass.
+
+    Args:
+        rows: Values-only row tuples (columns A–E at least)
+        codes: Optional collection of codes to keep; all codes are indexed if omitted
+
+    Returns:
+        dict: code → raw column E value; the first row carrying a code wins
+    """
+    index = {}
+    for row in rows:
+        code = _cell(row, 2)
+        if code is None or code in index:
+            continue
+        if codes is None or code in codes:
+            index[code] = _cell(row, 5)
+    return index
+
 def extract_value(sheet, code, default=0):
     """
     Extract a value from a sheet based on a code.
@@ -24,25 +90,248 @@ def extract_value(sheet, code, default=0):
     Returns:
         int: The extracted value or default
     """
-    for row in range(1, sheet.max_row + 1):
-        if sheet.cell(row=row, column=2).value == code:
-            value = sheet.cell(row=row, column=5).value
-            if value:
-                if isinstance(value, (int, float)):
-                    return int(value)
-                elif isinstance(value, str) and value.strip().isdigit():
-                    return int(value.strip())
-            return default
-    return default
+    index = build_code_index(sheet.iter_rows(max_col=5, values_only=True), codes={code})
+    return _coerce_count(index.get(code), default)
+
+def _cell(row, column):
+    """
+    Return the value at a 1-based column of a values-only row tuple.
+
+    Rows streamed from read-only worksheets are not padded to a common
+    width, so a missing trailing cell is treated as empty.
+    """
+    return row[column - 1] if len(row) >= column else None
+
+def _iter_rows(wb, sheet_name, max_col, min_row=1):
+    """Stream the first *max_col* columns of a sheet as values-only tuples."""
+    return wb[sheet_name].iter_rows(min_row=min_row, max_col=max_col, values_only=True)
+
+# Any phase header in Roadmap column A ("Phase 1: Title & Headings", ...)
+_PHASE_RE = re.compile(r"Phase\s+(\d+)\b")
+
+# Requirement amount, by priority: "Add N more", then ":"/"=" N, then a trailing
+# number, then any number. Each branch is anchored with a lazy prefix, so a
+# single match() tries the rules in order rather than returning the leftmost hit.
+_AMOUNT_RE = re.compile(
+    r"(?:.*?Add\s+(\d+)\s+more)|(?:.*?[:=]\s*(\d+))|(?:.*?(\d+)\s*$)|(?:.*?(\d+))",
+    re.IGNORECASE | re.DOTALL,
+)
+
+def _parse_requirement_amount(req_amount_text):
+    """
+    Extract the numeric target from a Roadmap requirement cell.
+
+    Returns:
+        int | None: The amount, or None if the cell holds no number
+    """
+    req_amount_text_str = str(req_amount_text).strip()
+    match = _AMOUNT_RE.match(req_amount_text_str)
+    if match:
+        return int(match.group(match.lastindex))
+    logger.warning(f"No number found in: {req_amount_text_str}")
+    return None
 
-def parse_cora_report(file_path):
+def _parse_roadmap(rows):
+    """
+    Split streamed Roadmap rows into phases in a single pass.
+
+    Variations come from A2. Every row whose column A names a phase
+    ("Phase N ...") opens a new phase, and the following rows up to the next
+    phase header are its requirements. The last phase stops before the sheet's
+    last row, matching the original `range(start, max_row)` scan, so a row is
+    only committed once the following row is seen.
+
+    Returns:
+        tuple: (variations list, list of {"phase", "title", "requirements"} dicts)
+    """
+    variations = []
+    phases = []
+    current = None
+    pending = None
+
+    for row_number, row in enumerate(rows, start=1):
+        cell_a = _cell(row, 1)
+
+        # Variations from A2
+        if row_number == 2:
+            raw_variations = cell_a
+            variations = [v.strip(' "\'') for v in raw_variations.split(",") if v.strip()] if raw_variations else []
+
+        if pending is not None:
+            req_desc, req_amount_text = pending
+            pending = None
+            if req_desc and req_amount_text:
+                try:
+                    amount = _parse_requirement_amount(req_amount_text)
+                    if amount is not None:
+                        current["requirements"][req_desc] = amount
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Could not parse requirement amount: {req_amount_text}. Error: {str(e)}")
+
+        phase_match = _PHASE_RE.search(str(cell_a).strip()) if cell_a else None
+        if phase_match:
+            current = {"phase": int(phase_match.group(1)), "title": str(cell_a).strip(), "requirements": {}}
+            phases.append(current)
+        elif current is not None:
+            pending = (cell_a, _cell(row, 2))
+
+    return variations, phases
+
+def _parse_lsi_keywords(rows, limit=None):
+    """
+    Build the LSI keyword → target map from streamed rows (row 7 onwards).
+
+    Keywords are ordered by their raw column G value, highest first, and the
+    target is that value rounded up (minimum 1).
+
+    Args:
+        rows: Values-only row tuples
+        limit: Keep only the top *limit* keywords. A bounded min-heap is
+            maintained while streaming, so memory is O(limit) and cost is
+            O(rows · log limit) instead of a full sort. Ties keep sheet order,
+            as with the full sort. Repeated keywords each take a slot, so a
+            sheet with duplicates can yield fewer than *limit* entries.
+    """
+    lsi_keywords_data = []
+    for seq, row in enumerate(rows):
+        keyword = _cell(row, 1)
+        avg = _cell(row, 2)
+        g_value = _cell(row, 7)
+        if keyword and avg:
+            try:
+                avg_float = float(avg)
+                g_float = float(g_value) if g_value else 0
+                rounded_g = math.ceil(g_float) if g_float > 0 else 1
+            except ValueError:
+                continue
+            if limit is None:
+                lsi_keywords_data.append((keyword, rounded_g, g_float))
+            elif limit > 0:
+                # Heap root is the weakest entry: lowest G, latest row on ties
+                entry = (g_float, -seq, keyword, rounded_g)
+                if len(lsi_keywords_data) < limit:
+                    heapq.heappush(lsi_keywords_data, entry)
+                elif entry > lsi_keywords_data[0]:
+                    heapq.heapreplace(lsi_keywords_data, entry)
+    if limit is not None:
+        lsi_keywords_data = [(kw, rounded, g) for g, _, kw, rounded in sorted(lsi_keywords_data, reverse=True)]
+    else:
+        lsi_keywords_data.sort(key=lambda x: x[2], reverse=True)
+    return {item[0]: item[1] for item in lsi_keywords_data}
+
+def _find_lsi_sheet(sheetnames):
+    """Return the name of the "LSI Keywords" sheet, if any."""
+    return next((s for s in sheetnames if "LSI" in s and "Keywords" in s), None)
+
+def load_lsi_keywords(file_path, engine="openpyxl"):
+    """
+    Read the complete LSI keyword map from a report, without any cap.
+
+    Args:
+        file_path: Path or file-like object of the .xlsx report
+        engine: Workbook reader, as for `parse_cora_report`
+
+    Returns:
+        dict: LSI keyword → target, strongest first
+    """
+    if hasattr(file_path, "seek"):
+        file_path.seek(0)
+    wb = _open_workbook(file_path, True, engine)
+    try:
+        lsi_sheet_name = _find_lsi_sheet(wb.sheetnames)
+        if not lsi_sheet_name:
+            return {}
+        return _parse_lsi_keywords(_iter_rows(wb, lsi_sheet_name, max_col=7, min_row=7))
+    finally:
+        wb.close()
+
+def _attach_lsi_loader(seoreq, file_path, engine):
+    """Let `SEORequirements.full_lsi_keywords()` reload an LSI list that was capped at parse time."""
+    seoreq._lsi_loader = functools.partial(load_lsi_keywords, file_path, engine)
+
+def _parse_entity_column(rows):
+    """Collect the non-empty, stripped column A values from streamed rows."""
+    entities = []
+    for row in rows:
+        entity = _cell(row, 1)
+        if entity:
+            entities.append(str(entity).strip())
+    return entities
+
+def _required_sheets(sheetnames):
+    """Return the sheets parse_cora_report reads, in workbook order."""
+    lsi_sheet_name = _find_lsi_sheet(sheetnames)
+    wanted = {"Roadmap", "Basic Tunings", "Entities", "Custom Entities", lsi_sheet_name}
+    return [s for s in sheetnames if s in wanted]
+
+def _open_workbook(file_path, read_only, engine):
+    """Open *file_path* with the selected engine; both expose sheetnames, [name].iter_rows() and close()."""
+    if engine == "xml":
+        return XlsxReader(file_path, columns=PARSER_COLUMNS)
+    return openpyxl.load_workbook(file_path, read_only=read_only, data_only=True)
+
+def _open_required_sheets(file_path, read_only, engine):
+    """
+    Open a report so that only the sheets the parser needs are ever loaded.
+
+    The sheet list and part sizes are read from the zip directory and
+    workbook.xml before any worksheet XML is touched. The xml engine and
+    openpyxl's read-only mode only open the parts that are iterated. A full
+    openpyxl load is handed a copy of the archive with the other sheets
+    emptied.
+
+    Returns:
+        tuple: (workbook, skipped sheet names, uncompressed bytes skipped)
+    """
+    try:
+        layout = XlsxReader(file_path, columns=PARSER_COLUMNS)
+    except KeyError:
+        # Non-standard part layout: let openpyxl resolve it and load everything
+        expect(engine != "xml", "Workbook layout not supported by the xml engine", ParseError)
+        return _open_workbook(file_path, read_only, engine), [], 0
+
+    needed = _required_sheets(layout.sheetnames)
+    skipped = [s for s in layout.sheetnames if s not in needed]
+    skipped_bytes = sum(layout.sheet_size(s) for s in skipped)
+    if engine == "xml":
+        return layout, skipped, skipped_bytes
+
+    try:
+        source = layout.without_sheets(skipped) if skipped and not read_only else file_path
+    finally:
+        layout.close()
+    return _open_workbook(source, read_only, engine), skipped, skipped_bytes
+
+def parse_cora_report(file_path, read_only=True, engine="openpyxl", lsi_limit=None):
     """
     Parses a CORA Excel report and extracts SEO requirements.
     Restored to match the original extraction logic from backups/main.py, including custom entities and all original fields.
+
+    Args:
+        file_path: Path or file-like object of the .xlsx report
+        read_only: Stream rows with openpyxl's read-only mode (default). Cells
+            are never materialised as a full cell graph. Pass False to load
+            the workbook fully instead; both modes produce identical results.
+            With every engine, sheets the parser does not read are skipped at
+            the zip level and listed in debug_info["sheets_skipped"], together
+            with the uncompressed bytes avoided (debug_info["skipped_bytes"]).
+        engine: "openpyxl" (default) or "xml". The xml engine reads the sheet
+            XML straight from the zip archive and only decodes columns A, B, E
+            and G; read_only does not apply to it.
+        lsi_limit: Keep only the strongest *lsi_limit* LSI keywords (all by
+            default). The full list stays available through
+            `SEORequirements.full_lsi_keywords()`, which re-reads the LSI
+            sheet on first use.
+
+    Returns:
+        SEORequirements: The parsed requirements
     """
+    expect(engine in ENGINES, f"Unknown parser engine: {engine!r} (expected one of {', '.join(ENGINES)})", ValidationError)
+
+    wb = None
     try:
-        # Load the Excel workbook
-        wb = openpyxl.load_workbook(file_path, data_only=True)
+        # Load the Excel workbook (only the sheets parsed below)
+        wb, sheets_skipped, skipped_bytes = _open_required_sheets(file_path, read_only, engine)
         
         # Initialize default values
         primary_keyword = ""
@@ -50,172 +339,58 @@ def parse_cora_report(file_path):
         custom_entities = []
         variations = []
         lsi_keywords = {}
-        heading_structure = {}
         requirements = {}
+        roadmap_phases = []
         basic_tunings = {}
-        word_count = 1500  # Default
         
         # Debug info
         debug_info = {
             "sheets_found": wb.sheetnames,
+            "sheets_skipped": sheets_skipped,
+            "skipped_bytes": skipped_bytes,
             "lsi_start_row": None,
             "entities_start_row": None,
             "headings_section": None
         }
         
-        # Extract requirements from CORA report
-        requirements = {}
-        
         # Parse "Roadmap" sheet
         if "Roadmap" in wb.sheetnames:
-            roadmap_sheet = wb["Roadmap"]
-            
-            # Variations from A2
-            raw_variations = roadmap_sheet["A2"].value
-            variations = [v.strip(' "\'') for v in raw_variations.split(",") if v.strip()] if raw_variations else []
-            
-            # Extract requirements from "Phase 1: Title & Headings" using regex
-            marker_start_pattern = re.compile(r"Phase\s+1\b")
-            possible_end_patterns = [
-                re.compile(r"Phase\s+2\b"),
-                re.compile(r"Phase\s+3\b"),
-                re.compile(r"Phase\s+4\b"),
-                re.compile(r"Phase\s+6\b"),
-                re.compile(r"Phase\s+7\b"),
-                re.compile(r"Phase\s+8\b"),
-                re.compile(r"Phase\s+9\b"),
-                re.compile(r"Phase\s+10\b")
-            ]
-
-            # Find start row using regex
-            start_row = None
-            for row in range(1, roadmap_sheet.max_row + 1):
-                cell_a = roadmap_sheet.cell(row=row, column=1).value
-                if cell_a and marker_start_pattern.search(str(cell_a).strip()):
-                    start_row = row + 1
-                    break
-                    
-            if start_row:
-                # Find end row based on regex patterns
-                end_row = None
-                for row in range(start_row, roadmap_sheet.max_row + 1):
-                    cell_a = roadmap_sheet.cell(row=row, column=1).value
-                    if cell_a:
-                        cell_text = str(cell_a).strip()
-                        if any(pattern.search(cell_text) for pattern in possible_end_patterns):
-                            end_row = row
-                            break
-                
-                if not end_row:
-                    end_row = roadmap_sheet.max_row
-                
-                # Extract requirements
-                for row in range(start_row, end_row):
-                    req_desc = roadmap_sheet.cell(row=row, column=1).value
-                    req_amount_text = roadmap_sheet.cell(row=row, column=2).value
-                    if req_desc and req_amount_text:
-                        try:
-                            req_amount_text_str = str(req_amount_text).strip()
-                            add_more_match = re.search(r'Add\s+(\d+)\s+more', req_amount_text_str, re.IGNORECASE)
-                            colon_match = re.search(r'[:=]\s*(\d+)', req_amount_text_str)
-                            end_match = re.search(r'(\d+)\s*$', req_amount_text_str)
-                            any_match = re.search(r'(\d+)', req_amount_text_str)
-                            if add_more_match:
-                                amount = int(add_more_match.group(1))
-                            elif colon_match:
-                                amount = int(colon_match.group(1))
-                            elif end_match:
-                                amount = int(end_match.group(1))
-                            elif any_match:
-                                amount = int(any_match.group(1))
-                            else:
-                                logger.warning(f"No number found in: {req_amount_text_str}")
-                                continue
-                            requirements[req_desc] = amount
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"Could not parse requirement amount: {req_amount_text}. Error: {str(e)}")
-                            continue
+            variations, roadmap_phases = _parse_roadmap(_iter_rows(wb, "Roadmap", max_col=2))
+            # Phase 1 (Title & Headings) drives generation
+            phase_one = next((p for p in roadmap_phases if p["phase"] == 1), None)
+            if phase_one:
+                requirements = dict(phase_one["requirements"])
         
         # Process "Basic Tunings" sheet in a single pass
         if "Basic Tunings" in wb.sheetnames:
-            sheet = wb["Basic Tunings"]
-            codes = {
-                "CP492": "Word Count",
-                "CPXR004": "Number of H1 tags",
-                "CPXR005": "Number of H2 tags",
-                "CPXR006": "Number of H3 tags",
-                "CPXR007": "Number of H4 tags",
-                "CPXR008": "Number of H5 tags",
-                "CPXR009": "Number of H6 tags",
-                "CP426": "Number of Images",
-                "CPXR003": "Number of heading tags",
-                "CP480": "Title Length",
-                "CP380": "Description Length"
-            }
-            primary_keyword = sheet["B1"].value.strip() if sheet["B1"].value else ""
+            rows = _iter_rows(wb, "Basic Tunings", max_col=5)
+            first_row = next(rows, ())
+            b1 = _cell(first_row, 2)
+            primary_keyword = b1.strip() if b1 else ""
             basic_tunings["primary_keyword"] = primary_keyword
-            basic_tunings["Word Count"] = extract_value(sheet, "CP492", 1500)
-            basic_tunings["Number of H1 tags"] = extract_value(sheet, "CPXR004")
-            basic_tunings["Number of H2 tags"] = extract_value(sheet, "CPXR005")
-            basic_tunings["Number of H3 tags"] = extract_value(sheet, "CPXR006")
-            basic_tunings["Number of H4 tags"] = extract_value(sheet, "CPXR007")
-            basic_tunings["Number of H5 tags"] = extract_value(sheet, "CPXR008")
-            basic_tunings["Number of H6 tags"] = extract_value(sheet, "CPXR009")
-            basic_tunings["Number of Images"] = extract_value(sheet, "CP426")
-            basic_tunings["Number of heading tags"] = extract_value(sheet, "CPXR003")
-            requirements["Title Length"] = extract_value(sheet, "CP480", 60)
-            requirements["Description Length"] = extract_value(sheet, "CP380", 160)
+
+            wanted_codes = {code for code, _, _, _ in BASIC_TUNING_CODES}
+            code_index = build_code_index(itertools.chain([first_row], rows), wanted_codes)
+            targets = {"basic_tunings": basic_tunings, "requirements": requirements}
+            for code, section, name, default in BASIC_TUNING_CODES:
+                targets[section][name] = _coerce_count(code_index.get(code), default)
         
         # Set defaults for any missing values
-        basic_tunings.setdefault("Word Count", 1500)
-        basic_tunings.setdefault("Number of H1 tags", 0)
-        basic_tunings.setdefault("Number of H2 tags", 0)
-        basic_tunings.setdefault("Number of H3 tags", 0)
-        basic_tunings.setdefault("Number of H4 tags", 0)
-        basic_tunings.setdefault("Number of H5 tags", 0)
-        basic_tunings.setdefault("Number of H6 tags", 0)
-        basic_tunings.setdefault("Number of Images", 0)
-        basic_tunings.setdefault("Number of heading tags", 0)
-        requirements.setdefault("Title Length", 60)
-        requirements.setdefault("Description Length", 160)
+        for _, section, name, default in BASIC_TUNING_CODES:
+            (basic_tunings if section == "basic_tunings" else requirements).setdefault(name, default)
         
         # Parse "LSI Keywords" sheet
-        lsi_sheet_name = next((s for s in wb.sheetnames if "LSI" in s and "Keywords" in s), None)
-        lsi_keywords = {}
+        lsi_sheet_name = _find_lsi_sheet(wb.sheetnames)
         if lsi_sheet_name:
-            lsi_sheet = wb[lsi_sheet_name]
-            lsi_keywords_data = []
-            for row in range(7, lsi_sheet.max_row + 1):
-                keyword = lsi_sheet.cell(row=row, column=1).value
-                avg = lsi_sheet.cell(row=row, column=2).value
-                g_value = lsi_sheet.cell(row=row, column=7).value
-                if keyword and avg:
-                    try:
-                        avg_float = float(avg)
-                        g_float = float(g_value) if g_value else 0
-                        rounded_g = math.ceil(g_float) if g_float > 0 else 1
-                        lsi_keywords_data.append((keyword, rounded_g, g_float))
-                    except ValueError:
-                        continue
-            lsi_keywords_data.sort(key=lambda x: x[2], reverse=True)
-            lsi_keywords = {item[0]: item[1] for item in lsi_keywords_data}
+            lsi_keywords = _parse_lsi_keywords(_iter_rows(wb, lsi_sheet_name, max_col=7, min_row=7), lsi_limit)
         
         # Parse "Entities" sheet
         if "Entities" in wb.sheetnames:
-            entities_sheet = wb["Entities"]
-            for row in range(4, entities_sheet.max_row + 1):
-                entity = entities_sheet.cell(row=row, column=1).value
-                if entity:
-                    entities.append(str(entity).strip())
+            entities = _parse_entity_column(_iter_rows(wb, "Entities", max_col=1, min_row=4))
         
         # Custom Entities (from user or other logic)
-        custom_entities = []
         if "Custom Entities" in wb.sheetnames:
-            custom_entities_sheet = wb["Custom Entities"]
-            for row in range(2, custom_entities_sheet.max_row + 1):
-                entity = custom_entities_sheet.cell(row=row, column=1).value
-                if entity:
-                    custom_entities.append(str(entity).strip())
+            custom_entities = _parse_entity_column(_iter_rows(wb, "Custom Entities", max_col=1, min_row=2))
         
         # Build typed dataclass
         heading_targets = HeadingTargets.from_dict(basic_tunings)
@@ -230,8 +405,11 @@ def parse_cora_report(file_path):
             images=basic_tunings.get("Number of Images", 0),
             basic_tunings=basic_tunings,
             roadmap_requirements=requirements,
+            roadmap_phases=roadmap_phases,
             debug_info=debug_info,
         )
+        if lsi_limit is not None and lsi_sheet_name:
+            _attach_lsi_loader(seoreq, file_path, engine)
 
         logger.info("Successfully parsed CORA report for '%s'", primary_keyword)
         return seoreq
@@ -239,3 +417,118 @@ def parse_cora_report(file_path):
     except Exception as e:
         logger.error("Error parsing CORA report: %s", str(e))
         raise ParseError(f"Failed to parse CORA report: {str(e)}") from e
+    finally:
+        # Streaming readers keep the archive open until closed
+        if wb is not None:
+            wb.close()
+
+
+# Options that change how a report is read but never what it parses to
+_OUTPUT_NEUTRAL_OPTIONS = {"read_only", "engine"}
+
+
+class ParseCache:
+    """
+    Two-tier cache of parsed CORA reports.
+
+    Entries are keyed by the SHA-256 of the workbook bytes, PARSER_VERSION,
+    PARSE_CACHE_VERSION and any output-affecting parse options. Each entry
+    holds `SEORequirements.to_dict()` as UTF-8 JSON, so a tampered cache
+    file can at worst yield wrong requirements, never run code. Decoding
+    gives every caller its own mutable copy. The in-memory LRU tier answers repeat uploads within a
+    process. The on-disk tier survives restarts and is trimmed by total size.
+    Only point the disk tier at a directory this application owns.
+    """
+
+    def __init__(self, directory=None, max_entries=64, max_bytes=256 * 1024 * 1024):
+        directory = directory or os.environ.get("SEO_PARSE_CACHE_DIR", os.path.join(".cache", "cora_reports"))
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskCache(directory, max_bytes)
+
+    @staticmethod
+    def make_key(data, **options):
+        """Build the cache key for workbook *data* parsed with *options*."""
+        digest = hashlib.sha256(data).hexdigest()
+        relevant = sorted((k, v) for k, v in options.items() if k not in _OUTPUT_NEUTRAL_OPTIONS)
+        if relevant:
+            digest += "-" + hashlib.sha256(repr(relevant).encode("utf-8")).hexdigest()[:16]
+        return f"p{PARSE_CACHE_VERSION}-v{PARSER_VERSION}-{digest}"
+
+    def get(self, key):
+        """Return a fresh SEORequirements for *key*, or None on a miss."""
+        payload = self.memory.get(key)
+        if payload is None:
+            payload = self.disk.get(key)
+            if payload is None:
+                return None
+            try:
+                record = json.loads(payload)
+            except ValueError:
+                logger.warning("Discarding unreadable parse cache entry %s", key)
+                return None
+            self.memory.set(key, payload)
+        else:
+            record = json.loads(payload)
+        return SEORequirements.from_dict(record)
+
+    def put(self, key, seoreq):
+        payload = json.dumps(seoreq.to_dict(), ensure_ascii=False).encode("utf-8")
+        self.memory.set(key, payload)
+        try:
+            self.disk.set(key, payload)
+        except OSError as e:
+            logger.warning("Could not write parse cache entry %s: %s", key, str(e))
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self):
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+
+parse_cache = ParseCache()
+
+
+def _read_source_bytes(file_path):
+    """Return the raw bytes of a path or file-like upload (rewound afterwards)."""
+    if hasattr(file_path, "read"):
+        if hasattr(file_path, "seek"):
+            file_path.seek(0)
+        data = file_path.read()
+        if hasattr(file_path, "seek"):
+            file_path.seek(0)
+        return data
+    with open(file_path, "rb") as fh:
+        return fh.read()
+
+
+def parse_cora_report_cached(file_path, cache=None, **options):
+    """
+    Cached front end for `parse_cora_report`.
+
+    Args:
+        file_path: Path or file-like object of the .xlsx report
+        cache: ParseCache to use (defaults to the module-level `parse_cache`)
+        **options: Passed through to `parse_cora_report`
+
+    Returns:
+        SEORequirements: The parsed requirements (a fresh copy on every call)
+    """
+    cache = cache or parse_cache
+    try:
+        data = _read_source_bytes(file_path)
+    except OSError as e:
+        raise ParseError(f"Failed to read CORA report: {str(e)}") from e
+
+    key = cache.make_key(data, **options)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info("Parse cache hit for '%s'", cached.primary_keyword)
+        if options.get("lsi_limit") is not None:
+            _attach_lsi_loader(cached, io.BytesIO(data), options.get("engine", "openpyxl"))
+        return cached
+
+    seoreq = parse_cora_report(io.BytesIO(data), **options)
+    cache.put(key, seoreq)
+    return seoreq
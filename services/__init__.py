@@ -10,13 +10,22 @@ from services.content_service import (
     generate_content_from_headings,
     markdown_to_html,
     call_claude_api,
+    stream_claude_api,
+    call_claude_api_async,
+    generate_meta_and_headings_async,
+    generate_content_from_headings_async,
 )
-from services.analysis_service import analyze_content
+from services.analysis_service import analyze_content, IncrementalAnalyzer
 
 __all__ = [
     "generate_meta_and_headings",
     "generate_content_from_headings",
     "markdown_to_html",
     "call_claude_api",
+    "stream_claude_api",
+    "call_claude_api_async",
+    "generate_meta_and_headings_async",
+    "generate_content_from_headings_async",
     "analyze_content",
+    "IncrementalAnalyzer",
 ]
@@ -1,5 +1,43 @@
-"""Facade for analysis functions to allow future expansion (e.g., linting)."""
+"""Facade for analysis, section indexing and content linting functions."""
 
-from analysis import analyze_content  # noqa: F401 re-export
+from analysis import (  # noqa: F401 re-export
+    IncrementalAnalyzer,
+    analysis_cache,
+    analyze_content,
+    analyze_content_cached,
+    analyze_stream,
+    compile_analysis_plan,
+    requirements_fingerprint,
+)
+from content_linter import (  # noqa: F401 re-export
+    DEFAULT_RULES,
+    ContentLinter,
+    PatternRule,
+    ParagraphRule,
+    Rule,
+    Violation,
+    has_errors,
+    lint_content,
+)
+from section_index import SectionIndex, build_section_index, build_section_index_cached  # noqa: F401 re-export
 
-__all__ = ["analyze_content"]
+__all__ = [
+    "IncrementalAnalyzer",
+    "analysis_cache",
+    "analyze_content",
+    "analyze_content_cached",
+    "analyze_stream",
+    "compile_analysis_plan",
+    "requirements_fingerprint",
+    "SectionIndex",
+    "build_section_index",
+    "build_section_index_cached",
+    "DEFAULT_RULES",
+    "ContentLinter",
+    "PatternRule",
+    "ParagraphRule",
+    "Rule",
+    "Violation",
+    "has_errors",
+    "lint_content",
+]
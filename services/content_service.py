@@ -8,6 +8,12 @@ from content_generator import (
     call_claude_api,  # noqa: F401 re-export
     generate_meta_and_headings,  # noqa: F401 re-export
     generate_content_from_headings,  # noqa: F401 re-export
+    ClaudeDelta,  # noqa: F401 re-export
+    ClaudeStream,  # noqa: F401 re-export
+    stream_claude_api,  # noqa: F401 re-export
+    call_claude_api_async,  # noqa: F401 re-export
+    generate_meta_and_headings_async,  # noqa: F401 re-export
+    generate_content_from_headings_async,  # noqa: F401 re-export
     markdown_to_html,  # noqa: F401 re-export
 )
 
@@ -15,5 +21,11 @@ __all__: list[str] = [
     "call_claude_api",
     "generate_meta_and_headings",
     "generate_content_from_headings",
+    "ClaudeDelta",
+    "ClaudeStream",
+    "stream_claude_api",
+    "call_claude_api_async",
+    "generate_meta_and_headings_async",
+    "generate_content_from_headings_async",
     "markdown_to_html",
 ]
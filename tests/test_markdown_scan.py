@@ -0,0 +1,35 @@
+"""Heading outline extraction with `scan_markdown(..., outline=True)`."""
+from content_generator import _parse_meta_and_headings
+from utils.markdown_scan import outline_item, scan_markdown
+
+
+def _headings(text):
+    return [h.raw for h in scan_markdown(text, label_headings=True, outline=True).headings]
+
+
+def test_fenced_and_indented_outline_headings_are_kept():
+    assert _headings("```markdown\n# Roof Repair\n## Costs\n```\n") == ["# Roof Repair", "## Costs"]
+    assert _headings("    # Roof Repair\n      ## Costs\n") == ["# Roof Repair", "## Costs"]
+
+
+def test_colon_labels_are_headings():
+    assert _headings("H1: Roof Repair\nH2:Costs\n  H3: Labour\n") == ["H1: Roof Repair", "H2:Costs", "H3: Labour"]
+
+
+def test_prose_starting_with_a_level_is_not_a_heading():
+    text = "H1: Roof Repair\nH2 Is the most important level for SEO.\nH2 - Costs\nH2: Materials\n"
+    assert _headings(text) == ["H1: Roof Repair", "H2: Materials"]
+
+
+def test_prose_does_not_reach_the_parsed_outline():
+    response = {
+        "content": "META TITLE: Roof Repair\nMETA DESCRIPTION: Fix it.\nHEADING STRUCTURE:\n"
+                   "H1: Roof Repair\nH2 Is the most important level for SEO.\nH2: Costs\n",
+    }
+    assert _parse_meta_and_headings(response)["headings"] == ["H1: Roof Repair", "H2: Costs"]
+
+
+def test_outline_item_keeps_loose_labels():
+    assert outline_item("H2 - Costs") == {"level": 2, "text": "Costs"}
+    assert outline_item("H3 Labour") == {"level": 3, "text": "Labour"}
+    assert outline_item("Just text") == {"level": 2, "text": "Just text"}
@@ -0,0 +1,27 @@
+"""Only complete Claude responses are stored in the response cache."""
+import pytest
+
+from utils.response_cache import ResponseCache
+
+RESPONSE = {"content": "# Roof Repair\n\nFull article.", "thinking": "", "usage": {"output_tokens": 12}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(directory=str(tmp_path), enabled=True)
+
+
+def test_end_turn_response_is_stored(cache):
+    cache.put("k", RESPONSE, "end_turn")
+    assert cache.get("k")["content"] == RESPONSE["content"]
+
+
+@pytest.mark.parametrize("stop_reason", ["max_tokens", "refusal", None])
+def test_incomplete_response_is_not_stored(cache, stop_reason):
+    cache.put("k", RESPONSE, stop_reason)
+    assert cache.get("k") is None
+
+
+def test_empty_response_is_not_stored(cache):
+    cache.put("k", dict(RESPONSE, content="  \n"), "end_turn")
+    assert cache.get("k") is None
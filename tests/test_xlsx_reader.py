@@ -0,0 +1,29 @@
+"""The xml engine must parse CORA reports exactly like openpyxl."""
+import pytest
+
+from benchmarks.synthetic_cora import SCALES, write_synthetic_report
+from seo_parser import parse_cora_report
+
+
+@pytest.fixture(scope="module", params=range(4))
+def report(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp("cora") / f"report_{request.param}.xlsx"
+    return str(write_synthetic_report(str(path), SCALES["small"], seed=request.param))
+
+
+def test_xml_engine_matches_openpyxl(report):
+    expected = parse_cora_report(report, engine="openpyxl").to_dict()
+    assert parse_cora_report(report, engine="xml").to_dict() == expected
+
+
+def test_xml_engine_matches_openpyxl_with_lsi_limit(report):
+    expected = parse_cora_report(report, engine="openpyxl", lsi_limit=25)
+    actual = parse_cora_report(report, engine="xml", lsi_limit=25)
+    assert actual.to_dict() == expected.to_dict()
+    assert actual.full_lsi_keywords() == expected.full_lsi_keywords()
+
+
+def test_xml_engine_reads_file_objects(report):
+    with open(report, "rb") as f:
+        actual = parse_cora_report(f, engine="xml").to_dict()
+    assert actual == parse_cora_report(report, engine="openpyxl").to_dict()
@@ -3,7 +3,7 @@ import pandas as pd
 import io
 import zipfile
 import json
-from services.analysis_service import analyze_content
+from services.analysis_service import analyze_content_cached, build_section_index_cached, lint_content
 from models import SEORequirements
 from utils.logger import get_logger
 
@@ -24,11 +24,18 @@ def display_token_usage(usage_type, token_usage, sidebar=True):
     """
     input_tokens = token_usage.get('input_tokens', 0)
     output_tokens = token_usage.get('output_tokens', 0)
-    total_tokens = token_usage.get('total_tokens', 0) or (input_tokens + output_tokens)
+    # Prompt caching: writes cost 1.25x the input rate, reads 0.1x
+    cache_write_tokens = token_usage.get('cache_creation_input_tokens', 0)
+    cache_read_tokens = token_usage.get('cache_read_input_tokens', 0)
+    total_tokens = token_usage.get('total_tokens', 0) or (
+        input_tokens + cache_write_tokens + cache_read_tokens + output_tokens
+    )
     
     input_cost = (input_tokens / 1000000) * 3
     output_cost = (output_tokens / 1000000) * 15
-    total_cost = input_cost + output_cost
+    cache_write_cost = (cache_write_tokens / 1000000) * 3.75
+    cache_read_cost = (cache_read_tokens / 1000000) * 0.30
+    total_cost = input_cost + output_cost + cache_write_cost + cache_read_cost
     
     container = st.sidebar if sidebar else st
     container.markdown(f"### {usage_type} Token Usage")
@@ -36,6 +43,10 @@ def display_token_usage(usage_type, token_usage, sidebar=True):
     col1.metric("Input Tokens", input_tokens, delta=f"${input_cost:.4f}", delta_color="off")
     col2.metric("Output Tokens", output_tokens, delta=f"${output_cost:.4f}", delta_color="off")
     col3.metric("Total Tokens", total_tokens, delta=f"${total_cost:.4f}", delta_color="off")
+    if cache_write_tokens or cache_read_tokens:
+        col4, col5 = container.columns(2)
+        col4.metric("Cache Write Tokens", cache_write_tokens, delta=f"${cache_write_cost:.4f}", delta_color="off")
+        col5.metric("Cache Read Tokens", cache_read_tokens, delta=f"${cache_read_cost:.4f}", delta_color="off")
     return total_cost
 
 def render_extracted_data():
@@ -151,7 +162,8 @@ def display_content_analysis():
     markdown_content = st.session_state.generated_markdown
     requirements = st.session_state.requirements
     
-    analysis = analyze_content(markdown_content, requirements)
+    # Memoized: reruns of an unchanged article reuse the same analysis
+    analysis = analyze_content_cached(markdown_content, requirements, attribution=True)
     
     st.subheader("Content Analysis")
     
@@ -306,6 +318,49 @@ def display_content_analysis():
         if not missing_headings.empty:
             st.warning(f"**{len(missing_headings)} heading types don't meet requirements.** Please check the table above.")
     
+    # Writing-guideline checks (em dashes, paragraph length, banned phrases, ...)
+    violations = lint_content(markdown_content, requirements)
+    with st.expander(f"Content Rules ({len(violations)} issues)", expanded=False):
+        if not violations:
+            st.success("No content rule violations found.")
+        else:
+            df_rules = pd.DataFrame([{
+                "Line": v.line,
+                "Rule": v.rule,
+                "Severity": v.severity,
+                "Issue": v.message,
+                "Excerpt": v.excerpt,
+            } for v in violations])
+            st.dataframe(df_rules, use_container_width=True, hide_index=True, key="content_rules_df")
+
+    # Per-section coverage from the positional index (no rescans per query)
+    with st.expander("Section Coverage", expanded=False):
+        section_index = build_section_index_cached(markdown_content, requirements)
+        primary_keyword = analysis['primary_keyword']
+        if primary_keyword:
+            in_intro = section_index.in_first_words(primary_keyword, 100)
+            in_h2 = bool(section_index.headings_containing(primary_keyword, level=2))
+            st.markdown(f"{'✅' if in_intro else '❌'} Primary keyword in the first 100 words")
+            st.markdown(f"{'✅' if in_h2 else '❌'} Primary keyword in at least one H2 heading")
+
+        section_rows = section_index.summary()
+        if section_rows:
+            df_sections = pd.DataFrame([{
+                "Section": ("  " * max(row["level"] - 1, 0)) + row["section"],
+                "Words": row["words"],
+                "Primary Keyword": row["primary_keyword"],
+                "LSI Coverage": f"{row['lsi_coverage']:.0%}",
+                "Entity Coverage": f"{row['entity_coverage']:.0%}",
+            } for row in section_rows])
+            st.dataframe(df_sections, use_container_width=True, hide_index=True, key="section_analysis_df")
+
+            # Point at the H2 sections that cover the fewest LSI keywords
+            starving = sorted((r for r in section_rows if r["level"] == 2), key=lambda r: r["lsi_coverage"])[:3]
+            for row in starving:
+                missing = section_index.gaps(section_index.sections[row["index"]], "lsi_keywords")[:8]
+                if missing:
+                    st.markdown(f"**{row['section']}** is missing LSI keywords such as: {', '.join(missing)}")
+
     # Variations in expander
     if analysis['variations']:
         with st.expander("Keyword Variations", expanded=False):
@@ -351,6 +406,9 @@ def display_content_analysis():
             total_lsi_density = analysis.get('total_lsi_density', 0)
             
             st.markdown(f"**Total LSI Keywords**: {total_lsi_count} occurrences ({total_lsi_density:.2f}% density)")
+            if 'total_lsi_attributed_count' in analysis:
+                st.markdown(f"**Without overlaps**: {analysis['total_lsi_attributed_count']} occurrences "
+                            f"({analysis['total_lsi_attributed_density']:.2f}% density), crediting each span to its longest keyword")
             st.markdown("---")
             
             lsi_data = []
@@ -364,6 +422,7 @@ def display_content_analysis():
                     "Keyword": keyword,
                     "Required": target,
                     "Actual": count,
+                    "Attributed": info.get('attributed_count', count),
                     "Density (%)": f"{density:.2f}%" if density else "N/A",
                     "Status": "✅" if met else "❌"
                 })
@@ -384,6 +443,9 @@ def display_content_analysis():
             total_entity_density = analysis.get('total_entity_density', 0)
             
             st.markdown(f"**Total Entities**: {total_entity_count} occurrences ({total_entity_density:.2f}% density)")
+            if 'total_entity_attributed_count' in analysis:
+                st.markdown(f"**Without overlaps**: {analysis['total_entity_attributed_count']} occurrences "
+                            f"({analysis['total_entity_attributed_density']:.2f}% density)")
             st.markdown("---")
             
             entity_data = []
@@ -392,15 +454,18 @@ def display_content_analysis():
                     count = info.get('count', 0)
                     met = info.get('met', count > 0)
                     density = info.get('density', 0)
+                    attributed = info.get('attributed_count', count)
                 else:
                     # Handle old format where info is just the count
                     count = info
                     met = count > 0
                     density = 0
+                    attributed = count
                 
                 entity_data.append({
                     "Entity": entity,
                     "Occurrences": count,
+                    "Attributed": attributed,
                     "Density (%)": f"{density:.2f}%" if density else "N/A",
                     "Status": "✅" if met else "❌"
                 })
@@ -567,7 +632,7 @@ def create_download_zip():
     md_content = st.session_state.get("generated_markdown", "")
     html_content = st.session_state.get("generated_html", "")
     requirements = st.session_state.get("requirements", {})
-    analysis = analyze_content(md_content, requirements)
+    analysis = analyze_content_cached(md_content, requirements, attribution=True)
     
     extracted_data = f"Primary Keyword: {requirements.get('primary_keyword', 'Not found')}\n"
     extracted_data += f"Word Count Target: {requirements.get('word_count', 'N/A')} words\n"
@@ -0,0 +1,199 @@
+"""Small, dependency‑free caching primitives.
+
+`LRUCache` is a thread‑safe in‑memory tier with bounded entry count, an
+optional byte budget for ``bytes`` payloads, and hit/miss counters.  `DiskCache` persists byte payloads under a directory,
+optionally expires them *ttl* seconds after they were written, and evicts
+the least recently used files once a total size budget is exceeded.  Callers choose the key scheme (typically a content hash).
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry.
+
+    With *max_bytes* set, values must be ``bytes`` (or anything with a
+    ``len``) and entries are also evicted until their total length fits.
+    """
+
+    def __init__(self, maxsize: int = 128, max_bytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _size(self, value: Any) -> int:
+        return len(value) if self.max_bytes is not None else 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            old = self._data.pop(key, _MISSING)
+            if old is not _MISSING:
+                self._bytes -= self._size(old)
+            self._data[key] = value
+            self._bytes += self._size(value)
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and self._data
+            ):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= self._size(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            **({"bytes": self._bytes, "max_bytes": self.max_bytes} if self.max_bytes is not None else {}),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class DiskCache:
+    """Directory of ``<key>.bin`` files capped at *max_bytes* in total.
+
+    A file's modification time is its write time and its access time is
+    refreshed on every read, so eviction removes the least recently used
+    entries first and, with *ttl* set, entries older than *ttl* seconds are
+    treated as misses and purged.  Writes are atomic (temp file + rename),
+    so concurrent processes never observe a partially written payload.
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _expired(self, written: float, now: float) -> bool:
+        return self.ttl is not None and now - written > self.ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        now = time.time()
+        try:
+            written = os.stat(path).st_mtime
+            if self._expired(written, now):
+                os.remove(path)
+                raise FileNotFoundError(path)
+            with open(path, "rb") as fh:
+                payload = fh.read()
+            os.utime(path, (now, written))
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def set(self, key: str, payload: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_atime, st.st_size, name, st.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """Drop expired files, then least recently used ones until the size budget is met."""
+        with self._lock:
+            entries = self._entries()
+            if self.ttl is not None:
+                now = time.time()
+                for entry in [entry for entry in entries if self._expired(entry[3], now)]:
+                    try:
+                        os.remove(os.path.join(self.directory, entry[2]))
+                    except OSError:
+                        pass
+                    entries.remove(entry)
+            total = sum(size for _, size, _, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for _, size, name, _ in sorted(entries):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self) -> None:
+        for _, _, name, _ in self._entries():
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _, _ in entries),
+            "max_bytes": self.max_bytes,
+            **({"ttl": self.ttl} if self.ttl is not None else {}),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,311 @@
+"""Long‑lived Anthropic clients shared across calls, threads and sessions.
+
+Building ``anthropic.Anthropic`` per request pays client construction and
+a fresh TCP/TLS handshake every time.  `ClientRegistry` keeps one client
+per API key, each with its own HTTP connection pool (bounded connection
+count, keep‑alive for idle connections, explicit timeouts), so repeated
+heading and content generations reuse warm connections.
+
+Clients are leased rather than handed out: a client that is idle longer
+than *idle_timeout* (no lease open) is closed and dropped, as are the
+least recently used idle clients beyond *max_clients*; a client streaming
+a long generation is never closed underneath its caller.
+
+`AsyncClientRegistry` does the same for ``anthropic.AsyncAnthropic`` with
+coroutine ``acquire``/``lease``/``close_all``; both share their lease
+bookkeeping through `_RegistryBase`.
+Async connections belong to the event loop that opened them, so its
+clients are kept per (API key, running loop) and dropped once their loop
+is closed.
+
+Usage:
+    with client_registry.lease(api_key) as client:
+        client.messages.create(...)
+
+    async with async_client_registry.lease(api_key) as client:
+        await client.messages.create(...)
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import hashlib
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import anthropic
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Entry:
+    client: Any
+    last_used: float
+    leases: int = 0
+
+
+class _RegistryBase(abc.ABC):
+    """Leases, eviction and stats shared by `ClientRegistry` and `AsyncClientRegistry`.
+
+    Subclasses build the client (`_build`) and close evicted ones; the
+    bookkeeping here never awaits, so both use the same thread lock.
+
+    Args:
+        idle_timeout: Seconds without a lease after which a client is closed
+        max_clients: Idle clients kept at most (least recently used go first)
+        max_connections: Connection pool size per client
+        max_keepalive_connections: Idle connections kept open per client
+        keepalive_expiry: Seconds an idle connection stays open for reuse
+        timeout: Request timeout (``anthropic.DEFAULT_TIMEOUT`` when omitted)
+        client_options: Extra client arguments (e.g. ``base_url``)
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = 900.0,
+        max_clients: int = 64,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 120.0,
+        timeout: Any = None,
+        **client_options: Any,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_clients = max_clients
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = anthropic.DEFAULT_TIMEOUT if timeout is None else timeout
+        self.client_options = client_options
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _key(api_key: str) -> str:
+        # Keys are hashed so raw API keys never sit in logs or stats
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def _entry_key(self, api_key: str) -> Hashable:
+        return self._key(api_key)
+
+    def _limits(self) -> Any:
+        # Limits comes from the HTTP library the SDK itself is built on
+        return type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @abc.abstractmethod
+    def _build(self, api_key: str) -> Any:
+        """Construct the client for *api_key* (called without the lock held)."""
+
+    def _expired(self, key: Hashable, entry: _Entry, now: float) -> bool:
+        return now - entry.last_used > self.idle_timeout
+
+    def _collect_evictions(self, now: float) -> List[Tuple[Hashable, Any]]:
+        """Remove expired and surplus idle entries (lock held); return them as (key, client)."""
+        idle = sorted(
+            ((entry.last_used, key) for key, entry in self._entries.items() if not entry.leases),
+            key=lambda item: item[0],
+        )
+        surplus = len(idle) - self.max_clients
+        closing = []
+        for position, (_, key) in enumerate(idle):
+            if position < surplus or self._expired(key, self._entries[key], now):
+                closing.append((key, self._entries.pop(key).client))
+        self.evicted += len(closing)
+        return closing
+
+    def _usable(self, key: Hashable, entry: Optional[_Entry], now: float) -> bool:
+        return entry is not None and (entry.leases > 0 or not self._expired(key, entry, now))
+
+    def _lease_entry(self, entry: _Entry, now: float) -> List[Tuple[Hashable, Any]]:
+        """Lease *entry* (lock held), then evict; a leased entry is never evicted."""
+        entry.leases += 1
+        entry.last_used = now
+        return self._collect_evictions(now)
+
+    def _checkout(self, api_key: str) -> Tuple[Any, List[Tuple[Hashable, Any]]]:
+        """Take a lease on the client for *api_key*; also return the entries to close.
+
+        A missing client is built without the lock held, so a cold build
+        does not block other callers; if another caller inserted one in the
+        meantime, that one is leased and the spare is returned for closing.
+        """
+        key = self._entry_key(api_key)
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if self._usable(key, entry, now):
+                self.reused += 1
+                return entry.client, self._lease_entry(entry, now)
+
+        client = self._build(api_key)
+
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if self._usable(key, entry, now):
+                self.reused += 1
+                return entry.client, [(key, client)] + self._lease_entry(entry, now)
+            closing = []
+            if entry is not None:
+                # Expired and idle: replace it
+                closing.append((key, entry.client))
+                self.evicted += 1
+            entry = self._entries[key] = _Entry(client, now)
+            self.created += 1
+            logger.debug(f"Created pooled {type(client).__name__} client ({len(self._entries)} clients)")
+            return client, closing + self._lease_entry(entry, now)
+
+    def _evict_now(self) -> List[Tuple[Hashable, Any]]:
+        with self._lock:
+            return self._collect_evictions(time.monotonic())
+
+    def _drop_idle(self) -> List[Tuple[Hashable, Any]]:
+        """Remove every entry without a lease; return them as (key, client)."""
+        with self._lock:
+            closing = [(key, entry.client) for key, entry in self._entries.items() if not entry.leases]
+            self._entries = {key: entry for key, entry in self._entries.items() if entry.leases}
+        return closing
+
+    def release(self, api_key: str) -> None:
+        """End a lease taken with `acquire`."""
+        with self._lock:
+            entry = self._entries.get(self._entry_key(api_key))
+            if entry is not None and entry.leases:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            leased = sum(1 for entry in self._entries.values() if entry.leases)
+            return {
+                "clients": len(self._entries),
+                "leased": leased,
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
+
+
+class ClientRegistry(_RegistryBase):
+    """Thread‑safe registry of pooled ``anthropic.Anthropic`` clients keyed by API key.
+
+    Takes the `_RegistryBase` arguments; *client_options* go to
+    ``anthropic.Anthropic``.
+    """
+
+    def _build(self, api_key: str) -> anthropic.Anthropic:
+        http_client = anthropic.DefaultHttpxClient(limits=self._limits(), timeout=self.timeout)
+        return anthropic.Anthropic(
+            api_key=api_key, http_client=http_client, timeout=self.timeout, **self.client_options
+        )
+
+    @staticmethod
+    def _close(closing: List[Tuple[Hashable, Any]]) -> None:
+        for _, client in closing:
+            try:
+                client.close()
+            except Exception as e:  # pragma: no cover - best effort
+                logger.debug(f"Error closing idle Anthropic client: {e}")
+
+    def acquire(self, api_key: str) -> anthropic.Anthropic:
+        """Lease the client for *api_key*, creating it on first use.  Pair with `release`."""
+        client, closing = self._checkout(api_key)
+        self._close(closing)
+        return client
+
+    @contextmanager
+    def lease(self, api_key: str) -> Iterator[anthropic.Anthropic]:
+        """Context manager form of `acquire`/`release`."""
+        client = self.acquire(api_key)
+        try:
+            yield client
+        finally:
+            self.release(api_key)
+
+    def evict_idle(self) -> int:
+        """Close idle clients past *idle_timeout* now; return how many were closed."""
+        closing = self._evict_now()
+        self._close(closing)
+        return len(closing)
+
+    def close_all(self) -> None:
+        """Close every client that is not leased."""
+        self._close(self._drop_idle())
+
+
+class AsyncClientRegistry(_RegistryBase):
+    """Registry of pooled ``anthropic.AsyncAnthropic`` clients, one per API key and event loop.
+
+    Takes the `_RegistryBase` arguments.  `acquire`, `lease`, `evict_idle`
+    and `close_all` are coroutines and must run on an event loop; clients
+    of other (or closed) loops are dropped without awaiting their shutdown.
+    """
+
+    def _entry_key(self, api_key: str) -> Hashable:
+        return self._key(api_key), asyncio.get_running_loop()
+
+    def _build(self, api_key: str) -> anthropic.AsyncAnthropic:
+        http_client = anthropic.DefaultAsyncHttpxClient(limits=self._limits(), timeout=self.timeout)
+        return anthropic.AsyncAnthropic(
+            api_key=api_key, http_client=http_client, timeout=self.timeout, **self.client_options
+        )
+
+    def _expired(self, key: Hashable, entry: _Entry, now: float) -> bool:
+        return key[1].is_closed() or super()._expired(key, entry, now)
+
+    @staticmethod
+    async def _aclose(closing: List[Tuple[Hashable, Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        for (_, client_loop), client in closing:
+            if client_loop is not loop:
+                continue  # its connections can only be closed on their own loop
+            try:
+                await client.close()
+            except Exception as e:  # pragma: no cover - best effort
+                logger.debug(f"Error closing idle AsyncAnthropic client: {e}")
+
+    async def acquire(self, api_key: str) -> anthropic.AsyncAnthropic:
+        """Lease the client for *api_key* on the running loop.  Pair with `release`."""
+        client, closing = self._checkout(api_key)
+        await self._aclose(closing)
+        return client
+
+    @asynccontextmanager
+    async def lease(self, api_key: str) -> AsyncIterator[anthropic.AsyncAnthropic]:
+        """Async context manager form of `acquire`/`release`."""
+        client = await self.acquire(api_key)
+        try:
+            yield client
+        finally:
+            self.release(api_key)
+
+    async def evict_idle(self) -> int:
+        """Close idle clients past *idle_timeout* now; return how many were dropped."""
+        closing = self._evict_now()
+        await self._aclose(closing)
+        return len(closing)
+
+    async def close_all(self) -> None:
+        """Close every client of the running loop that is not leased; drop the rest."""
+        await self._aclose(self._drop_idle())
+
+
+# Shared by every call in the process (all Streamlit sessions)
+client_registry = ClientRegistry()
+async_client_registry = AsyncClientRegistry()
@@ -0,0 +1,291 @@
+"""Single‑pass structural scanner for generated markdown.
+
+`scan_markdown` walks the text line by line once and records everything
+the app asks about a document's structure:
+
+* headings – ATX headings (``## Title``, up to three spaces of indent) and,
+  when ``label_headings=True``, outline labels such as ``H2: Title``; each
+  with its level, text, line number and parent in the heading tree
+* image references (``![alt](src)``)
+* block boundaries – paragraphs, lists, tables and fenced code
+
+Nothing inside a fenced code block counts as a heading, image or list.
+Heading outlines returned by the model are not documents, though: they
+often come wrapped in a ```` ```markdown ```` fence or indented, so
+``outline=True`` ignores fences and indentation and takes every line that
+reads as a heading once stripped.
+`MarkdownScanner` exposes the same pass incrementally (one line at a
+time) for streaming callers; with ``keep_structure=False`` it only keeps
+running heading and image counts, so memory stays constant however long
+the stream.  `parse_heading_line` and `outline_item` classify a single
+outline line for the heading editor.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+_ATX_RE = re.compile(r' {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+# Scans only accept "H2: Title"; prose such as "H2 is the key level" is not a heading
+_LABEL_RE = re.compile(r'\s*H([1-6]):\s*(.*?)\s*$')
+# Lines already taken as outline entries may also read "H2 Title" or "H2 - Title"
+_LOOSE_LABEL_RE = re.compile(r'\s*H([1-6])(?:\s*[:.\-]\s*|\s+)(.*?)\s*$')
+_IMAGE_RE = re.compile(r'!\[(.*?)\]\((.*?)\)')
+_FENCE_RE = re.compile(r' {0,3}(`{3,}|~{3,})')
+_LIST_ITEM_RE = re.compile(r' {0,3}(?:[-*+]|\d{1,9}[.)])(?:[ \t]|$)')
+
+HEADING_TYPES = ("H1", "H2", "H3", "H4", "H5", "H6")
+
+
+@dataclass
+class Heading:
+    """One heading line; ``style`` is ``"atx"`` (``## x``) or ``"label"`` (``H2: x``).
+
+    ``parent`` is the index in `MarkdownStructure.headings` of the nearest
+    preceding heading with a lower level.
+    """
+
+    level: int
+    text: str
+    line: int
+    raw: str
+    style: str = "atx"
+    parent: Optional[int] = None
+
+
+@dataclass
+class ImageRef:
+    alt: str
+    src: str
+    line: int
+
+
+@dataclass
+class Block:
+    """A run of lines: ``kind`` is paragraph, list, table or code.
+
+    ``items`` counts list items, table rows, paragraph lines or code lines;
+    ``end_line`` is inclusive.  Paragraphs keep their ``text``.
+    """
+
+    kind: str
+    start_line: int
+    end_line: int
+    items: int = 1
+    text: str = ""
+
+
+@dataclass
+class MarkdownStructure:
+    """Result of one scan."""
+
+    headings: List[Heading] = field(default_factory=list)
+    images: List[ImageRef] = field(default_factory=list)
+    blocks: List[Block] = field(default_factory=list)
+    line_count: int = 0
+
+    def _blocks(self, kind: str) -> List[Block]:
+        return [block for block in self.blocks if block.kind == kind]
+
+    @property
+    def paragraphs(self) -> List[Block]:
+        return self._blocks("paragraph")
+
+    @property
+    def lists(self) -> List[Block]:
+        return self._blocks("list")
+
+    @property
+    def tables(self) -> List[Block]:
+        return self._blocks("table")
+
+    @property
+    def code_blocks(self) -> List[Block]:
+        return self._blocks("code")
+
+    def heading_counts(self) -> Dict[str, int]:
+        """Markdown (ATX) headings per level, keyed "H1".."H6"."""
+        counts = dict.fromkeys(HEADING_TYPES, 0)
+        for heading in self.headings:
+            if heading.style == "atx":
+                counts[HEADING_TYPES[heading.level - 1]] += 1
+        return counts
+
+    def heading_lines(self) -> List[str]:
+        """Heading lines as written, preferring markdown headings over ``Hn:`` labels."""
+        atx = [h.raw for h in self.headings if h.style == "atx"]
+        return atx or [h.raw for h in self.headings if h.style == "label"]
+
+
+def parse_heading_line(line: str, label_headings: bool = True, line_no: int = 0,
+                       loose_labels: bool = True) -> Optional[Heading]:
+    """Return the `Heading` on *line*, or None when it is not a heading line.
+
+    With *loose_labels* false, ``Hn`` labels need a colon (``H2: Title``).
+    """
+    match = _ATX_RE.match(line)
+    if match:
+        level = len(match.group(1))
+        return Heading(level=level, text=(match.group(2) or "").strip(), line=line_no, raw=line.strip())
+    if label_headings:
+        match = (_LOOSE_LABEL_RE if loose_labels else _LABEL_RE).match(line)
+        if match:
+            return Heading(level=int(match.group(1)), text=match.group(2), line=line_no, raw=line.strip(), style="label")
+    return None
+
+
+def outline_item(line: str) -> Dict[str, object]:
+    """Heading editor entry for an outline line; plain text becomes an H2."""
+    heading = parse_heading_line(line.strip())
+    if heading is None:
+        return {"level": 2, "text": line.strip()}
+    # Outlines sometimes write "## : Title" or "H2 - Title"
+    return {"level": heading.level, "text": heading.text.lstrip(":.-").strip()}
+
+
+class MarkdownScanner:
+    """Incremental form of `scan_markdown`: feed complete lines, then `finish`.
+
+    ``heading_counts`` (markdown headings per level) and ``image_count`` are
+    kept up to date either way; ``structure`` only fills in when
+    ``keep_structure`` is true.  With ``outline`` true, code fences and
+    indentation are ignored (see the module docstring).
+    """
+
+    def __init__(self, label_headings: bool = False, keep_structure: bool = True, outline: bool = False):
+        self.label_headings = label_headings
+        self.keep_structure = keep_structure
+        self.outline = outline
+        self.structure = MarkdownStructure()
+        self.heading_counts = dict.fromkeys(HEADING_TYPES, 0)
+        self.image_count = 0
+        self._block: Optional[Block] = None
+        self._blank_before = False
+        self._fence: Optional[str] = None
+        self._stack: List[int] = []
+
+    def copy(self) -> "MarkdownScanner":
+        """Independent scanner in the same state (for provisional results)."""
+        clone = MarkdownScanner(self.label_headings, self.keep_structure, self.outline)
+        structure = self.structure
+        clone.structure = MarkdownStructure(list(structure.headings), list(structure.images),
+                                            list(structure.blocks), structure.line_count)
+        clone.heading_counts = dict(self.heading_counts)
+        clone.image_count = self.image_count
+        if self._block is not None:
+            clone._block = Block(**vars(self._block))
+            if self.keep_structure:
+                clone.structure.blocks[-1] = clone._block
+        clone._blank_before = self._blank_before
+        clone._fence = self._fence
+        clone._stack = list(self._stack)
+        return clone
+
+    def _open(self, kind: str, line_no: int, text: str = "") -> None:
+        self._block = Block(kind=kind, start_line=line_no, end_line=line_no, text=text)
+        if self.keep_structure:
+            self.structure.blocks.append(self._block)
+
+    def _extend(self, line_no: int, text: Optional[str] = None) -> None:
+        block = self._block
+        block.end_line = line_no
+        block.items += 1
+        if text is not None and self.keep_structure:
+            block.text += "\n" + text
+
+    def feed_line(self, line: str) -> None:
+        structure = self.structure
+        line_no = structure.line_count
+        structure.line_count += 1
+        line = line.rstrip('\r')
+
+        # Fenced code: only the closing fence matters until it arrives
+        if self._fence is not None:
+            self._extend(line_no)
+            if line.strip().startswith(self._fence):
+                self._fence = None
+                self._block = None
+            return
+        fence = None if self.outline else _FENCE_RE.match(line)
+        if fence:
+            self._fence = fence.group(1)[0] * 3
+            self._open("code", line_no)
+            return
+
+        stripped = line.strip()
+        if not stripped:
+            if self._block is not None and self._block.kind != "list":
+                self._block = None
+            self._blank_before = True
+            return
+
+        if '![' in line:
+            images = [ImageRef(alt=m.group(1), src=m.group(2), line=line_no) for m in _IMAGE_RE.finditer(line)]
+            self.image_count += len(images)
+            if self.keep_structure:
+                structure.images.extend(images)
+
+        heading = parse_heading_line(stripped if self.outline else line, self.label_headings, line_no,
+                                     loose_labels=False)
+        if heading is not None:
+            if heading.style == "atx":
+                self.heading_counts[HEADING_TYPES[heading.level - 1]] += 1
+            if self.keep_structure:
+                headings = structure.headings
+                while self._stack and headings[self._stack[-1]].level >= heading.level:
+                    self._stack.pop()
+                heading.parent = self._stack[-1] if self._stack else None
+                self._stack.append(len(headings))
+                headings.append(heading)
+            self._block = None
+        elif _LIST_ITEM_RE.match(line):
+            # Items separated by blank lines still belong to one (loose) list
+            if self._block is not None and self._block.kind == "list":
+                self._extend(line_no)
+            else:
+                self._open("list", line_no)
+        elif stripped.startswith('|'):
+            if self._block is not None and self._block.kind == "table":
+                self._extend(line_no)
+            else:
+                self._open("table", line_no)
+        elif self._block is not None and self._block.kind == "list" and not self._blank_before and line[:1] in " \t":
+            # Indented continuation of the current list item
+            self._block.end_line = line_no
+        elif self._block is not None and self._block.kind == "paragraph":
+            self._extend(line_no, stripped)
+        else:
+            self._open("paragraph", line_no, stripped)
+        self._blank_before = False
+
+    def feed(self, text: str) -> None:
+        """Feed every line of *text* (a trailing newline ends the last line)."""
+        lines = text.split('\n')
+        if text.endswith('\n'):
+            lines.pop()
+        for line in lines:
+            self.feed_line(line)
+
+    def finish(self) -> MarkdownStructure:
+        self._block = None
+        return self.structure
+
+
+def scan_markdown(text: str, label_headings: bool = False, outline: bool = False) -> MarkdownStructure:
+    """
+    Scan *text* once and return its structure.
+
+    Parameters
+    ----------
+    text: str
+        Markdown document or heading outline.
+    label_headings: bool
+        Also accept ``H1:``‑style outline labels as headings.
+    outline: bool
+        Heading outline rather than a document: ignore code fences and
+        indentation when looking for headings.
+    """
+    scanner = MarkdownScanner(label_headings, outline=outline)
+    scanner.feed(text)
+    return scanner.finish()
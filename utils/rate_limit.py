@@ -0,0 +1,161 @@
+"""Token-bucket rate limiting for concurrent Anthropic API calls.
+
+The Messages API enforces three per-minute quotas: requests (RPM), input
+tokens (ITPM) and output tokens (OTPM).  `RateLimiter` keeps one
+`TokenBucket` per quota, each refilled continuously at ``limit / 60`` per
+second, so a batch of asyncio tasks starts calls as fast as the quota
+allows instead of bursting into 429 responses.
+
+Output tokens are only known once a call finishes, so, like the API's own
+accounting, a call reserves its ``max_tokens`` up front; `Reservation.settle`
+then refunds what was not used (or charges the overrun) from the reported
+usage.  Input tokens are reserved from a character-based estimate and
+settled the same way.
+
+Usage:
+    limiter = RateLimiter(requests_per_minute=50, input_tokens_per_minute=40_000)
+    reservation = await limiter.acquire(input_tokens=1200, output_tokens=2000)
+    ...
+    reservation.settle(result["usage"])
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough prompt size in tokens (about four characters per token)."""
+    return sum(len(text) for text in texts if text) // 4 + 1
+
+
+class TokenBucket:
+    """Bucket of *per_minute* tokens refilled continuously.
+
+    The level may go negative when a settled call used more than it
+    reserved; later callers then wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until *amount* can be taken (requests larger than the bucket wait for a full one)."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        """Return unused tokens (negative *amount* charges an overrun)."""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass
+class Reservation:
+    """Tokens taken for one call; `settle` it with the reported usage."""
+
+    limiter: "RateLimiter"
+    input_tokens: int
+    output_tokens: int
+    waited: float = 0.0
+    settled: bool = False
+
+    def settle(self, usage: Optional[Mapping[str, int]] = None) -> None:
+        """Correct the reservation to the actual usage; without usage, keep it as charged."""
+        if self.settled:
+            return
+        self.settled = True
+        if not usage:
+            return
+        # Cache reads do not count towards the input-token quota; cache writes do
+        used_input = usage.get("input_tokens", 0) + usage.get("cache_creation_input_tokens", 0)
+        used_output = usage.get("output_tokens", 0)
+        self.limiter._give(self.input_tokens - used_input, self.output_tokens - used_output)
+
+
+class RateLimiter:
+    """Requests, input-token and output-token per-minute limits for one API key.
+
+    A limit of ``None`` is not enforced.  Callers are served first come,
+    first served, so one large request is not starved by many small ones.
+
+    Args:
+        requests_per_minute: RPM quota
+        input_tokens_per_minute: ITPM quota
+        output_tokens_per_minute: OTPM quota
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = 50,
+        input_tokens_per_minute: Optional[float] = None,
+        output_tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock) if requests_per_minute else None
+        self.input_tokens = TokenBucket(input_tokens_per_minute, clock) if input_tokens_per_minute else None
+        self.output_tokens = TokenBucket(output_tokens_per_minute, clock) if output_tokens_per_minute else None
+        self._lock: Optional[asyncio.Lock] = None
+        self.waited = 0.0
+
+    def _buckets(self, input_tokens: int, output_tokens: int):
+        return [
+            (bucket, amount)
+            for bucket, amount in ((self.requests, 1), (self.input_tokens, input_tokens), (self.output_tokens, output_tokens))
+            if bucket is not None
+        ]
+
+    def _give(self, input_tokens: int, output_tokens: int) -> None:
+        if self.input_tokens is not None:
+            self.input_tokens.give(input_tokens)
+        if self.output_tokens is not None:
+            self.output_tokens.give(output_tokens)
+
+    async def acquire(self, input_tokens: int = 0, output_tokens: int = 0) -> Reservation:
+        """Wait until one request of this size fits every quota, then take it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        start = time.monotonic()
+        # Holding the lock while sleeping keeps waiters in arrival order
+        async with self._lock:
+            buckets = self._buckets(input_tokens, output_tokens)
+            while True:
+                delay = max((bucket.wait_time(amount) for bucket, amount in buckets), default=0.0)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            for bucket, amount in buckets:
+                bucket.take(amount)
+        waited = time.monotonic() - start
+        self.waited += waited
+        if waited > 1:
+            logger.debug(f"Rate limiter delayed a request by {waited:.1f}s")
+        return Reservation(self, input_tokens, output_tokens, waited)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests_available": self.requests.level if self.requests else float("inf"),
+            "input_tokens_available": self.input_tokens.level if self.input_tokens else float("inf"),
+            "output_tokens_available": self.output_tokens.level if self.output_tokens else float("inf"),
+            "waited_seconds": round(self.waited, 3),
+        }
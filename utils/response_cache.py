@@ -0,0 +1,96 @@
+"""Content-addressed cache of Claude responses.
+
+Generation is the expensive step, and development loops and batch re-runs
+repeat identical calls.  `ResponseCache` stores the content, thinking and
+usage of a finished call on disk under the SHA-256 of everything that
+determines the request (model, system prompt, user prompt, max_tokens and
+thinking budget), so an identical call is answered locally.
+
+Entries expire *ttl* seconds after they were written and the directory is
+trimmed to *max_bytes* by least recent use.  Set ``SEO_RESPONSE_CACHE=0``
+to disable the cache for a process; callers bypass it for one call (for
+example "regenerate") with ``bypass_cache=True``, which still stores the
+fresh response.  Only complete answers are stored: a response cut off at
+``max_tokens`` (or stopped for any reason but ``end_turn``) or one with no
+content is returned to its caller but never replayed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from utils.cache import DiskCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the stored record format changes
+RESPONSE_CACHE_VERSION = "1"
+
+
+class ResponseCache:
+    """On-disk cache of ``{"content", "thinking", "usage"}`` responses keyed by request hash."""
+
+    def __init__(self, directory=None, ttl=7 * 24 * 3600, max_bytes=128 * 1024 * 1024, enabled=None):
+        directory = directory or os.environ.get("SEO_RESPONSE_CACHE_DIR", os.path.join(".cache", "claude_responses"))
+        if enabled is None:
+            enabled = os.environ.get("SEO_RESPONSE_CACHE", "1").lower() not in ("0", "false", "off", "no")
+        self.enabled = enabled
+        self.disk = DiskCache(directory, max_bytes, ttl=ttl)
+
+    @staticmethod
+    def make_key(model, system_prompt, user_prompt, max_tokens, thinking_budget):
+        """Cache key for one request; any change to its inputs gives a new key."""
+        request = json.dumps(
+            [model, system_prompt, user_prompt, max_tokens, thinking_budget], ensure_ascii=False
+        )
+        return f"r{RESPONSE_CACHE_VERSION}-{hashlib.sha256(request.encode('utf-8')).hexdigest()}"
+
+    def get(self, key) -> Optional[Dict[str, Any]]:
+        """Return the stored response for *key*, or None on a miss (or when disabled)."""
+        if not self.enabled:
+            return None
+        payload = self.disk.get(key)
+        if payload is None:
+            return None
+        try:
+            record = json.loads(payload)
+        except ValueError:
+            logger.warning("Discarding unreadable response cache entry %s", key)
+            return None
+        return {
+            "content": record.get("content", ""),
+            "thinking": record.get("thinking", ""),
+            "usage": record.get("usage", {}),
+            "created_at": record.get("created_at"),
+        }
+
+    def put(self, key, response: Dict[str, Any], stop_reason: Optional[str]) -> None:
+        """Store *response* under *key* if it finished with ``end_turn`` and has content."""
+        if not self.enabled:
+            return
+        if stop_reason != "end_turn" or not response.get("content", "").strip():
+            logger.debug(f"Not caching response {key} (stop_reason={stop_reason}, content_len={len(response.get('content', ''))})")
+            return
+        record = {
+            "content": response.get("content", ""),
+            "thinking": response.get("thinking", ""),
+            "usage": response.get("usage", {}),
+            "created_at": time.time(),
+        }
+        try:
+            self.disk.set(key, json.dumps(record, ensure_ascii=False).encode("utf-8"))
+        except OSError as e:
+            logger.warning("Could not write response cache entry %s: %s", key, str(e))
+
+    def clear(self):
+        self.disk.clear()
+
+    def stats(self):
+        return {"enabled": self.enabled, **self.disk.stats()}
+
+
+response_cache = ResponseCache()
@@ -1,60 +1,237 @@
 """Utility helpers for high‑performance text processing.
 
-The key feature is `multi_phrase_count` which counts occurrences of a
-list of phrases in *O(N + M)* time using the Aho‑Corasick automaton when
-`pyahocorasick` is available.  If the optional dependency is missing the
-function gracefully falls back to a simple but slower `str.count`
-implementation.
+The key feature is `PhraseMatcher`, which finds every occurrence of a set
+of phrases in *O(N + M)* time with an Aho‑Corasick automaton.  Matching is
+done on whole words: the searched text is expected to be normalised to
+lower‑case tokens separated by single spaces (as produced by
+`analysis.analyze_content`), and a phrase only matches a complete run of
+tokens.  When the optional `pyahocorasick` dependency is installed its C
+automaton is used; otherwise a pure‑Python automaton over tokens gives the
+same results.
+
+`multi_phrase_count` is the convenience wrapper returning per‑phrase
+counts.
 """
 from __future__ import annotations
 
+from collections import Counter, deque
 from functools import lru_cache
-from typing import Dict, Iterable, List
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
 
-@lru_cache(maxsize=128)
-def _build_automaton(phrases: tuple[str, ...]):  # type: ignore[name-defined]
-    """Build and cache an Aho‑Corasick automaton for the given phrases."""
-    try:
-        import ahocorasick  # type: ignore
-    except ImportError:
-        return None  # Will trigger fallback path
 
-    A = ahocorasick.Automaton()
-    for phrase in phrases:
-        # Use lowercase tokenisation to make search case‑insensitive
-        A.add_word(phrase, phrase)
-    A.make_automaton()
-    return A
+def normalize_phrase(phrase: str) -> str:
+    """Lower‑case and strip a phrase the way requirement phrases are compared."""
+    return phrase.lower().strip()
+
+
+def _self_overlaps(tokens: List[str]) -> bool:
+    """True when a proper token prefix of the phrase is also its suffix."""
+    return any(tokens[:k] == tokens[-k:] for k in range(1, len(tokens)))
+
+
+class _TokenAutomaton:
+    """Pure‑Python Aho‑Corasick automaton whose alphabet is whole tokens."""
+
+    def __init__(self, phrase_tokens: List[List[str]]):
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        out: List[Tuple[int, ...]] = [()]
+        for idx, tokens in enumerate(phrase_tokens):
+            state = 0
+            for token in tokens:
+                nxt = goto[state].get(token)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                    goto[state][token] = nxt
+                state = nxt
+            out[state] += (idx,)
+
+        # Breadth‑first construction of failure links and merged outputs
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(token, 0)
+                out[nxt] += out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def iter(self, tokens: Iterable[str]) -> Iterator[Tuple[int, int]]:
+        """Yield ``(end_token_index, phrase_index)`` for every occurrence."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for idx in out[state]:
+                yield i, idx
+
+
+class PhraseMatcher:
+    """Whole‑word multi‑phrase matcher over normalised text.
+
+    Args:
+        phrases: Phrases to find.  They are normalised with
+            `normalize_phrase` and de‑duplicated; `phrases` keeps the
+            resulting order and match indices refer to it.
+        backend: ``"pyahocorasick"``, ``"python"`` or ``None`` (use the C
+            automaton when it is installed).
+    """
+
+    def __init__(self, phrases: Iterable[str], backend: Optional[str] = None):
+        unique: Dict[str, None] = {}
+        for phrase in phrases:
+            if phrase:
+                unique.setdefault(normalize_phrase(phrase), None)
+        # Empty phrases can never match a token run
+        self.phrases: Tuple[str, ...] = tuple(p for p in unique if p)
+        self.index: Dict[str, int] = {p: i for i, p in enumerate(self.phrases)}
+        self._lengths = [len(p) for p in self.phrases]
+        self._token_lengths = [p.count(" ") + 1 for p in self.phrases]
+        self.max_tokens = max(self._token_lengths, default=0)
+        # A phrase whose token prefix equals its suffix ("a b a") can overlap
+        # itself; only those need the non-overlapping bookkeeping in `count`
+        self._self_overlapping = any(_self_overlaps(p.split(" ")) for p in self.phrases)
+
+        if backend is None:
+            backend = "pyahocorasick" if ahocorasick is not None else "python"
+        self.backend = backend
+        if backend == "pyahocorasick":
+            if ahocorasick is None:
+                raise ImportError("pyahocorasick is not installed")
+            automaton = ahocorasick.Automaton()
+            for idx, phrase in enumerate(self.phrases):
+                # Surrounding spaces enforce word boundaries on both sides
+                automaton.add_word(f" {phrase} ", idx)
+            if self.phrases:
+                automaton.make_automaton()
+            self._automaton = automaton
+        elif backend == "python":
+            # split(" ") keeps empty tokens for doubled spaces, which never match
+            self._automaton = _TokenAutomaton([p.split(" ") for p in self.phrases])
+        else:
+            raise ValueError(f"Unknown phrase matcher backend: {backend!r}")
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield ``(start, end, phrase_index)`` for every occurrence in *text*.
+
+        Offsets are character positions in *text* (end exclusive).  Matches
+        are produced in order of their end position and may overlap.
+        """
+        if not self.phrases or not text:
+            return
+        if self.backend == "pyahocorasick":
+            lengths = self._lengths
+            for end, idx in self._automaton.iter(f" {text} "):
+                # `end` indexes the trailing space in the padded text
+                yield end - lengths[idx] - 1, end - 1, idx
+            return
+
+        starts: List[int] = []
+        token_lengths = self._token_lengths
+        tokens = text.split(" ")
+        pos = 0
+        for token in tokens:
+            starts.append(pos)
+            pos += len(token) + 1
+        for i, idx in self._automaton.iter(tokens):
+            yield starts[i - token_lengths[idx] + 1], starts[i] + len(tokens[i]), idx
+
+    def count(self, text: str) -> List[int]:
+        """Return non‑overlapping occurrence counts per phrase index.
+
+        Each phrase is counted like ``len(re.findall(r"\\b<phrase>\\b", text))``:
+        scanning left to right, an occurrence overlapping the previous
+        counted occurrence of the same phrase is ignored.
+        """
+        if not self._self_overlapping:
+            # Every occurrence counts: tally phrase indices at C speed
+            if self.backend == "pyahocorasick":
+                matches = self._automaton.iter(f" {text} ") if self.phrases and text else ()
+            else:
+                matches = self._automaton.iter(text.split(" ")) if text else ()
+            tally = Counter(map(itemgetter(1), matches))
+            return [tally[idx] for idx in range(len(self.phrases))]
+
+        counts = [0] * len(self.phrases)
+        last_end = [0] * len(self.phrases)
+        for start, end, idx in self.iter_matches(text):
+            if start >= last_end[idx]:
+                counts[idx] += 1
+                last_end[idx] = end
+        return counts
+
+    def count_attributed(self, text: str) -> Tuple[List[int], List[int]]:
+        """Return raw and attributed counts per phrase index from one pass.
+
+        Raw counts are those of `count`.  Attributed counts credit each
+        token span to a single phrase, leftmost‑longest: scanning left to
+        right, the longest phrase starting at the first uncovered position
+        wins and matches inside it are not credited.  In "roof replacement
+        garden grove" only the longest phrase is credited, not "roof" or
+        "roof replacement".
+        """
+        counts = [0] * len(self.phrases)
+        last_end = [0] * len(self.phrases)
+        longest: Dict[int, Tuple[int, int]] = {}
+        for start, end, idx in self.iter_matches(text):
+            if start >= last_end[idx]:
+                counts[idx] += 1
+                last_end[idx] = end
+            best = longest.get(start)
+            if best is None or end > best[0]:
+                longest[start] = (end, idx)
+
+        attributed = [0] * len(self.phrases)
+        covered = 0
+        # Matches arrive in end order, so starts are nearly sorted already
+        for start in sorted(longest):
+            if start >= covered:
+                end, idx = longest[start]
+                attributed[idx] += 1
+                covered = end
+        return counts, attributed
+
+    def count_dict(self, text: str) -> Dict[str, int]:
+        """Like `count` but keyed by normalised phrase."""
+        return dict(zip(self.phrases, self.count(text)))
+
+
+@lru_cache(maxsize=128)
+def _build_matcher(phrases: Tuple[str, ...]) -> PhraseMatcher:
+    """Build and cache a matcher for the given phrase tuple."""
+    return PhraseMatcher(phrases)
 
 
 def multi_phrase_count(text: str, phrases: Iterable[str]) -> Dict[str, int]:
-    """Return occurrence counts for each phrase inside *text*.
+    """Return whole‑word occurrence counts for each phrase inside *text*.
 
     Parameters
     ----------
     text: str
-        Body of text to search (should already be lower‑cased for
-        case‑insensitive matching).
+        Normalised body of text: lower‑case tokens separated by single
+        spaces.
     phrases: Iterable[str]
         List, tuple or set of phrases.  Matching is done against the exact
-        sequence of characters – implement your own stemming if required.
+        sequence of tokens – implement your own stemming if required.
     """
-    phrases_list: List[str] = [p.lower().strip() for p in phrases if p]
-    if not phrases_list:
+    phrases_tuple = tuple(p for p in phrases if p)
+    if not phrases_tuple:
         return {}
-
-    # Try high‑performance Aho‑Corasick implementation first
-    automaton = _build_automaton(tuple(phrases_list))
-    if automaton is not None:
-        counts = {p: 0 for p in phrases_list}
-        for _, found in automaton.iter(text.lower()):
-            counts[found] += 1
-        return counts
-
-    # Fallback: naive counting using str.count (still O(N·M))
-    counts = {}
-    padded_text = f" {text.lower()} "
-    for p in phrases_list:
-        counts[p] = padded_text.count(f" {p} ")
-    return counts
+    return _build_matcher(phrases_tuple).count_dict(text)
@@ -0,0 +1,266 @@
+"""Minimal streaming reader for .xlsx workbooks without openpyxl.
+
+`XlsxReader` opens the zip archive directly, maps sheet names to their
+worksheet parts and streams ``<row>`` elements with
+`xml.etree.ElementTree.iterparse`.  Only the requested columns are
+resolved; every other cell is skipped without touching its value or the
+shared‑string table.  The worksheet API mirrors the subset of openpyxl
+used by `seo_parser` (``sheetnames``, ``reader[name].iter_rows(...)``,
+``close()``) so it can be swapped in as a parser engine.
+
+Values follow openpyxl's ``data_only=True`` semantics: cached formula
+results, shared/inline strings, booleans, and numbers cast to int unless
+they carry a decimal point or exponent.  Number formats are not
+interpreted, so date cells come back as their serial number.
+"""
+from __future__ import annotations
+
+import io
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Smallest valid worksheet part; stands in for sheets dropped by `without_sheets`
+_EMPTY_SHEET_XML = b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData/></worksheet>'
+
+
+def _local(tag: str) -> str:
+    """Strip the ``{namespace}`` prefix from an element tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _column_index(ref: str) -> int:
+    """Return the 1‑based column of a cell reference such as ``"AB12"``."""
+    index = 0
+    for ch in ref:
+        if "A" <= ch <= "Z":
+            index = index * 26 + (ord(ch) - 64)
+        else:
+            break
+    return index
+
+
+def _cast_number(value: str):
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _rich_text(elem) -> str:
+    """Concatenate the text runs of an ``<si>``/``<is>`` element, skipping phonetic runs."""
+    parts = []
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            for run_child in child:
+                if _local(run_child.tag) == "t":
+                    parts.append(run_child.text or "")
+    return "".join(parts)
+
+
+class XlsxSheet:
+    """Row iterator over one worksheet part."""
+
+    def __init__(self, reader: "XlsxReader", name: str, part: str):
+        self._reader = reader
+        self.title = name
+        self._part = part
+
+    def iter_rows(
+        self,
+        min_row: int = 1,
+        max_row: Optional[int] = None,
+        max_col: Optional[int] = None,
+        values_only: bool = True,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Yield value tuples for rows ``min_row``..``max_row``.
+
+        Rows missing from the XML are yielded as empty tuples so positions
+        line up with spreadsheet row numbers.  Tuples are padded to
+        *max_col* when given.
+        """
+        if not values_only:
+            raise ValueError("XlsxSheet only supports values_only=True")
+        reader = self._reader
+        wanted = reader.columns
+        width = max_col
+        empty = (None,) * width if width else ()
+
+        next_row = min_row
+        with reader._archive.open(self._part) as fh:
+            sheet_data = None
+            row_tag = sheet_data_tag = None
+            row_number = 0
+            for event, elem in ET.iterparse(fh, events=("start", "end")):
+                if row_tag is None:
+                    # First event is the <worksheet> root; reuse its namespace
+                    ns = elem.tag[: elem.tag.index("}") + 1] if elem.tag.startswith("{") else ""
+                    row_tag, sheet_data_tag = ns + "row", ns + "sheetData"
+                if event == "start":
+                    if sheet_data is None and elem.tag == sheet_data_tag:
+                        sheet_data = elem
+                    continue
+                if elem.tag != row_tag:
+                    continue
+
+                row_attr = elem.get("r")
+                row_number = int(row_attr) if row_attr else row_number + 1
+                if row_number < min_row:
+                    sheet_data.clear()
+                    continue
+                if max_row is not None and row_number > max_row:
+                    break
+                while next_row < row_number:
+                    yield empty
+                    next_row += 1
+
+                values: Dict[int, Any] = {}
+                last_col = 0
+                for cell in elem:
+                    ref = cell.get("r")
+                    column = _column_index(ref) if ref else last_col + 1
+                    last_col = column
+                    if width and column > width:
+                        continue
+                    if wanted is not None and column not in wanted:
+                        continue
+                    values[column] = reader._cell_value(cell)
+
+                row_width = width or max(values, default=0)
+                yield tuple(values.get(col) for col in range(1, row_width + 1))
+                next_row = row_number + 1
+                # Drop processed rows so memory stays flat on long sheets
+                sheet_data.clear()
+
+
+class XlsxReader:
+    """Direct zip/XML access to an .xlsx workbook.
+
+    Args:
+        source: Path or binary file-like object of the workbook
+        columns: Optional 1‑based column numbers to resolve; other cells are
+            returned as ``None`` without being decoded
+    """
+
+    def __init__(self, source, columns: Optional[Iterable[int]] = None):
+        self._archive = zipfile.ZipFile(source)
+        self.columns = frozenset(columns) if columns is not None else None
+        self._shared_strings: Optional[List[str]] = None
+        self._sheet_parts: Dict[str, str] = {}
+        self._shared_strings_part: Optional[str] = None
+        self._read_workbook()
+
+    # ------------------------------------------------------------------
+    # Workbook structure
+    # ------------------------------------------------------------------
+
+    def _read_workbook(self) -> None:
+        targets: Dict[str, str] = {}
+        rels = ET.fromstring(self._archive.read("xl/_rels/workbook.xml.rels"))
+        for rel in rels.iter(f"{_PKG_REL_NS}Relationship"):
+            target = rel.get("Target", "")
+            part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            targets[rel.get("Id")] = part
+            if rel.get("Type", "").endswith("/sharedStrings"):
+                self._shared_strings_part = part
+
+        workbook = ET.fromstring(self._archive.read("xl/workbook.xml"))
+        for sheet in workbook.iter():
+            if _local(sheet.tag) != "sheet":
+                continue
+            rel_id = sheet.get(f"{_REL_NS}id")
+            part = targets.get(rel_id)
+            if part:
+                self._sheet_parts[sheet.get("name")] = part
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return list(self._sheet_parts)
+
+    def sheet_part(self, name: str) -> str:
+        """Return the archive path of the worksheet called *name*."""
+        return self._sheet_parts[name]
+
+    def sheet_size(self, name: str) -> int:
+        """Return the uncompressed size in bytes of the worksheet called *name*."""
+        return self._archive.getinfo(self._sheet_parts[name]).file_size
+
+    def without_sheets(self, names: Iterable[str]) -> io.BytesIO:
+        """Return an in‑memory copy of the workbook with the named sheets emptied.
+
+        The sheets stay listed in the workbook (so relationships remain
+        valid) but their XML is replaced by an empty worksheet, so readers
+        that load every sheet skip the cost of parsing them.  Entries are
+        stored uncompressed to keep the copy cheap.
+        """
+        dropped = {self._sheet_parts[name] for name in names}
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as out:
+            for info in self._archive.infolist():
+                data = _EMPTY_SHEET_XML if info.filename in dropped else self._archive.read(info)
+                out.writestr(info.filename, data)
+        buffer.seek(0)
+        return buffer
+
+    def __getitem__(self, name: str) -> XlsxSheet:
+        if name not in self._sheet_parts:
+            raise KeyError(f"Worksheet {name} does not exist.")
+        return XlsxSheet(self, name, self._sheet_parts[name])
+
+    # ------------------------------------------------------------------
+    # Cell values
+    # ------------------------------------------------------------------
+
+    @property
+    def shared_strings(self) -> List[str]:
+        """Shared‑string table, loaded on first use."""
+        if self._shared_strings is None:
+            strings: List[str] = []
+            part = self._shared_strings_part
+            if part and part in self._archive.NameToInfo:
+                with self._archive.open(part) as fh:
+                    for _, elem in ET.iterparse(fh):
+                        if _local(elem.tag) == "si":
+                            strings.append(_rich_text(elem))
+                            elem.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    def _cell_value(self, cell) -> Any:
+        cell_type = cell.get("t", "n")
+        if cell_type == "inlineStr":
+            for child in cell:
+                if _local(child.tag) == "is":
+                    return _rich_text(child)
+            return None
+
+        raw = None
+        for child in cell:
+            if _local(child.tag) == "v":
+                raw = child.text
+                break
+        if raw is None:
+            return None
+        if cell_type == "s":
+            return self.shared_strings[int(raw)]
+        if cell_type == "n":
+            return _cast_number(raw)
+        if cell_type == "b":
+            return bool(int(raw))
+        # "str" (formula string), "e" (error) and anything unknown stay text
+        return raw
+
+    def close(self) -> None:
+        self._archive.close()
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()